@@ -0,0 +1,168 @@
+"""
+Compares one WSGI worker with one ASGI process under concurrent reads.
+
+Each deployment runs in its own process, since the views are made async
+when they are imported:
+
+- wsgi: course_portal.wsgi, serving one request at a time like a sync
+  gunicorn worker;
+- asgi: course_portal.asgi with COURSES_ASYNC_READS, keeping
+  --concurrency requests in flight;
+- asgi-sync: course_portal.asgi with sync views, for reference.
+
+Requests are fed to the applications in-process, without sockets or an
+HTTP server. --latency-ms adds a sleep to every query to stand in for the
+network round trip to PostgreSQL, which an in-memory database lacks.
+
+Usage: python3 -m benchmarks.asgi [--requests 1000] [--concurrency 50]
+                                  [--latency-ms 2]
+"""
+
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import subprocess
+import sys
+import time
+
+from .common import (populate, run_wsgi, setup, test_database,
+                     without_throttling)
+
+
+MODES = ('wsgi', 'asgi', 'asgi-sync')
+
+STUDENTS = 1000
+COURSES = 200
+
+
+def _get_paths(count):
+    # Single objects, a page of a collection and a roster, in turn.
+    paths = []
+    for i in range(count):
+        pk = i % COURSES + 1
+        paths.append(('/api/v1/students/%d' % pk,
+                      '/api/v1/courses/?page_size=20',
+                      '/api/v1/students/:course_id/%d' % pk)[i % 3])
+
+    return paths
+
+def _add_latency(latency):
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    def sleep_wrapper(execute, sql, params, many, context):
+        time.sleep(latency)
+
+        return execute(sql, params, many, context)
+
+    def add_wrapper(sender, connection, **kwargs):
+        connection.execute_wrappers.append(sleep_wrapper)
+
+    # The current thread's connection is already open; pool threads open
+    # their own.
+    connection.execute_wrappers.append(sleep_wrapper)
+    connection_created.connect(add_wrapper, weak=False)
+
+def _run_asgi(paths, concurrency):
+    from courses.async_views import get_asgi_application
+
+    application = get_asgi_application()
+    statuses = []
+
+    async def request(path):
+        path, _, query_string = path.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query_string.encode(),
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+            'client': ('127.0.0.1', 40000),
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        await application(scope, receive, send)
+
+    async def run():
+        # One pool thread, and database connection, per request in flight.
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(concurrency))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(path):
+            async with semaphore:
+                await request(path)
+
+        await asyncio.gather(*[limited(path) for path in paths])
+
+    asyncio.run(run())
+
+    return statuses
+
+def _run_mode(args):
+    if args.mode == 'asgi':
+        os.environ['COURSES_ASYNC_READS'] = '1'
+    setup()
+    with without_throttling(), test_database():
+        populate(students=STUDENTS,
+                 teachers=COURSES,
+                 courses=COURSES,
+                 enrollments=STUDENTS)
+        _add_latency(args.latency_ms / 1000)
+        paths = _get_paths(args.requests)
+        started_at = time.perf_counter()
+        if args.mode == 'wsgi':
+            statuses = run_wsgi(paths)
+        else:
+            statuses = _run_asgi(paths, args.concurrency)
+        elapsed = time.perf_counter() - started_at
+
+    errors = sum(1 for status in statuses if not str(status).startswith('2'))
+    print('%-10s %10d %10.2f %12.0f %8d' % (args.mode,
+                                            len(statuses),
+                                            elapsed,
+                                            len(statuses) / elapsed,
+                                            errors))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=2.0)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        return _run_mode(args)
+
+    print('%d requests, %d in flight, %.1f ms per query' % (
+        args.requests,
+        args.concurrency,
+        args.latency_ms,
+    ))
+    print('%-10s %10s %10s %12s %8s' % ('mode', 'requests', 'seconds',
+                                        'requests/s', 'errors'))
+    sys.stdout.flush()
+    for mode in MODES:
+        subprocess.run([sys.executable, '-m', 'benchmarks.asgi',
+                        '--mode', mode,
+                        '--requests', str(args.requests),
+                        '--concurrency', str(args.concurrency),
+                        '--latency-ms', str(args.latency_ms)],
+                       check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Measures the per-request cost of authenticating with a password (basic
+authentication) and with a token.
+
+Each authentication class authenticates the same request, carrying the
+credentials of a user created with the configured PASSWORD_HASHERS, over
+and over; the best time per call of --repeat runs is kept. Basic
+authentication runs the password hasher on every call, TokenAuthentication
+looks the token up with a query, and CachedTokenAuthentication finds it in
+the cache after the first call. Then whole requests for the pool
+statistics, a view that runs no query, are sent with a password and with
+a token, which the views check with CachedTokenAuthentication.
+
+Usage: python3 -m benchmarks.authentication [--number 20] [--repeat 5]
+"""
+
+import argparse
+import base64
+
+from .common import best_time, setup, test_database, without_throttling
+
+
+USERNAME = 'benchmark'
+PASSWORD = 'benchmark-password'
+
+
+def _get_schemes():
+    """
+    Returns (name, authentication class, Authorization header, calls per
+    run relative to --number) for each scheme, the last one being the
+    token authentication of the views.
+    """
+    from django.contrib.auth.models import User
+    from rest_framework.authentication import BasicAuthentication
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from courses.authentication import CachedTokenAuthentication
+
+    user = User.objects.create_user(USERNAME, password=PASSWORD)
+    token = Token.objects.create(user=user)
+    basic = 'Basic %s' % base64.b64encode(
+        ('%s:%s' % (USERNAME, PASSWORD)).encode()
+    ).decode()
+
+    return (
+        ('basic', BasicAuthentication, basic, 1),
+        ('token', TokenAuthentication, 'Token %s' % token.key, 100),
+        ('cached token', CachedTokenAuthentication, 'Token %s' % token.key,
+         100),
+    )
+
+def _time_authentication(authentication_class, authorization, number,
+                         repeat):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    request = Request(factory.get('/api/v1/:db-pool',
+                                  HTTP_AUTHORIZATION=authorization))
+    authentication = authentication_class()
+    assert authentication.authenticate(request) is not None
+
+    def run():
+        for _ in range(number):
+            authentication.authenticate(request)
+
+    return best_time(run, repeat) / number
+
+def _time_request(authorization, number, repeat):
+    from django.test import Client
+
+    client = Client()
+    response = client.get('/api/v1/:db-pool',
+                          HTTP_AUTHORIZATION=authorization)
+    assert response.status_code == 200, response.status_code
+
+    def run():
+        for _ in range(number):
+            client.get('/api/v1/:db-pool', HTTP_AUTHORIZATION=authorization)
+
+    return best_time(run, repeat) / number
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    with without_throttling(), test_database():
+        schemes = _get_schemes()
+        authentications = [
+            (name, _time_authentication(authentication_class,
+                                        authorization,
+                                        args.number * scale,
+                                        args.repeat))
+            for name, authentication_class, authorization, scale in schemes
+        ]
+        requests = [
+            (name, _time_request(authorization,
+                                 args.number * scale,
+                                 args.repeat))
+            for name, authentication_class, authorization, scale
+            in (schemes[0], schemes[-1])
+        ]
+
+    print('best of %d, us per call' % args.repeat)
+    for name, seconds in authentications:
+        print('%-38s %12.1f' % ('authenticate() with %s' % name,
+                                seconds * 1e6))
+    for name, seconds in requests:
+        print('%-38s %12.1f' % ('GET /api/v1/:db-pool with %s' % name,
+                                seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Helpers shared by the benchmarks.
+
+Benchmarks run against a throwaway test database created from
+``DATABASES['default']`` (the same way ``manage.py test`` does), so they
+never touch real data. Run them from the portal directory, e.g.
+``python3 -m benchmarks.serializers``.
+"""
+
+from contextlib import contextmanager
+from datetime import date, timedelta
+import io
+import os
+import time
+
+import django
+
+
+def setup():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'course_portal.settings')
+    django.setup()
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+
+    setup_test_environment(debug=False)
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+@contextmanager
+def without_throttling():
+    """
+    Turns the rate limits off. Enter it before the views are imported.
+    """
+    from django.conf import settings
+    from django.test import override_settings
+
+    rest_framework = dict(settings.REST_FRAMEWORK,
+                          DEFAULT_THROTTLE_CLASSES=())
+    with override_settings(REST_FRAMEWORK=rest_framework):
+        yield
+
+def populate(students, teachers, courses, enrollments, batch_size=5000):
+    """
+    Inserts the given numbers of rows with ``bulk_create``.
+
+    Every enrollment pairs a distinct (course, student) combination, so
+    ``enrollments`` must not exceed ``courses * students``.
+    """
+    from courses.models import Course, Enrollment, Student, Teacher
+
+    Student.objects.bulk_create(
+        (Student(first_name='First%d' % i,
+                 last_name='Last%d' % i,
+                 email_address='student%d@example.com' % i)
+         for i in range(students)),
+        batch_size=batch_size
+    )
+    Teacher.objects.bulk_create(
+        (Teacher(first_name='First%d' % i,
+                 last_name='Last%d' % i,
+                 email_address='teacher%d@example.com' % i)
+         for i in range(teachers)),
+        batch_size=batch_size
+    )
+    teacher_pks = list(Teacher.objects.values_list('pk', flat=True))
+    Course.objects.bulk_create(
+        (Course(title='Course %d' % i,
+                teacher_id=teacher_pks[i % len(teacher_pks)],
+                start_date=date(2018, 9, 1) + timedelta(days=i % 365))
+         for i in range(courses)),
+        batch_size=batch_size
+    )
+    student_pks = list(Student.objects.values_list('pk', flat=True))
+    course_pks = list(Course.objects.values_list('pk', flat=True))
+    Enrollment.objects.bulk_create(
+        (Enrollment(course_id=course_pks[i % len(course_pks)],
+                    student_id=student_pks[i // len(course_pks)],
+                    grade='A')
+         for i in range(enrollments)),
+        batch_size=batch_size
+    )
+
+def best_time(func, repeat=3):
+    """
+    Returns the best wall-clock time of ``repeat`` calls, in seconds.
+    """
+    best = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started_at
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def run_wsgi(paths):
+    """
+    Sends a GET request for each path to the WSGI application, one after
+    the other like a sync worker, and returns the response statuses.
+    """
+    from django.core.wsgi import get_wsgi_application
+    from wsgiref.util import setup_testing_defaults
+
+    application = get_wsgi_application()
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append(status)
+
+    for path in paths:
+        environ = {'PATH_INFO': path.split('?')[0],
+                   'QUERY_STRING': path.partition('?')[2],
+                   'HTTP_HOST': 'testserver',
+                   'wsgi.input': io.BytesIO()}
+        setup_testing_defaults(environ)
+        response = application(environ, start_response)
+        b''.join(response)
+        # Fires request_finished, as WSGI servers do.
+        response.close()
+
+    return statuses
@@ -0,0 +1,113 @@
+"""
+Measures the per-request cost of opening database connections.
+
+The same detail requests are sent to the WSGI application, one after the
+other, with a new connection per request (``CONN_MAX_AGE`` 0, Django's
+default), persistent connections with and without health checks, and a
+connection pool. Needs PostgreSQL and the ``courses.db.postgresql``
+backend: SQLite connections are nearly free, and an in-memory test
+database is never closed.
+
+Usage: python3 -m benchmarks.connections [--requests 1000]
+"""
+
+import argparse
+import sys
+import time
+
+from .common import populate, run_wsgi, setup, test_database
+from .common import without_throttling
+
+
+MODES = (
+    ('new connection per request', {'CONN_MAX_AGE': 0}, None),
+    ('persistent', {'CONN_MAX_AGE': 60}, None),
+    ('persistent, health checks',
+     {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True}, None),
+    ('pool', {'CONN_MAX_AGE': 0}, {'max_size': 4}),
+    ('pool, health checks',
+     {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': True}, {'max_size': 4}),
+)
+
+
+def _configure(connection, settings, pool):
+    connection.close_pool()
+    connection.settings_dict.update(CONN_HEALTH_CHECKS=False, **settings)
+    connection.settings_dict['OPTIONS'] = dict(
+        connection.settings_dict['OPTIONS'],
+        pool=pool,
+    )
+    connection.health_check_enabled = \
+        connection.settings_dict['CONN_HEALTH_CHECKS']
+
+def _run(paths):
+    from django.db.backends.signals import connection_created
+    from courses.db.pool import get_pool_stats
+
+    connects = []
+
+    def count_connect(sender, connection, **kwargs):
+        connects.append(connection)
+
+    connection_created.connect(count_connect)
+    try:
+        started_at = time.perf_counter()
+        statuses = run_wsgi(paths)
+        elapsed = time.perf_counter() - started_at
+    finally:
+        connection_created.disconnect(count_connect)
+    assert all(status.startswith('200') for status in statuses), statuses
+
+    # Pooled connections are "created" for Django each time they are
+    # taken from the pool.
+    stats = get_pool_stats().get('default')
+    if stats is not None:
+        return elapsed, stats['connections_created']
+
+    return elapsed, len(connects)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+
+    from django.db import connection
+
+    if not hasattr(connection, 'close_pool'):
+        sys.exit("DATABASES['default']['ENGINE'] must be "
+                 "'courses.db.postgresql'.")
+
+    with without_throttling(), test_database():
+        populate(students=100, teachers=10, courses=100, enrollments=100)
+        paths = ['/api/v1/students/%d' % (i % 100 + 1)
+                 for i in range(args.requests)]
+        # Warm up the URL resolver and the serializers.
+        run_wsgi(paths[:10])
+
+        results = []
+        for name, settings, pool in MODES:
+            _configure(connection, settings, pool)
+            results.append((name,) + _run(paths))
+        _configure(connection, {'CONN_MAX_AGE': 0}, None)
+
+    baseline = dict((name, elapsed) for name, elapsed, _ in results)
+    baseline_per_request = baseline['persistent'] / args.requests
+    print('%d requests' % args.requests)
+    print('%-28s %12s %12s %12s %12s' % ('mode', 'requests/s',
+                                         'ms/request', 'connections',
+                                         'overhead ms'))
+    for name, elapsed, connects in results:
+        per_request = elapsed / args.requests
+        print('%-28s %12.0f %12.3f %12d %12.3f' % (
+            name,
+            1 / per_request,
+            per_request * 1000,
+            connects,
+            (per_request - baseline_per_request) * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,407 @@
+"""
+Drives every route of courses/urls.py with concurrent requests and reports
+the latency percentiles, throughput, query counts and statuses of each.
+
+By default a throwaway test database is filled by generate_portal_data
+with --students/--teachers/--courses/--enrollments rows. With --existing,
+the requests run against DATABASES as configured instead, e.g. a copy of
+production or a database filled by a full-size
+``python3 manage.py generate_portal_data``.
+
+Requests are built up front from a sample of the rows, with --seed, and
+fed to the WSGI application in-process by --concurrency threads, each
+with its own database connection, without sockets or an HTTP server.
+Queries are counted around each request. Rate limits are turned off.
+
+Reads are sent anonymously. The routes that need a user (the pool
+statistics, and with --writes the bulk enrollment POST, the upsert PUT and
+the token POST) send --user/--password with basic authentication, or with
+--auth token the token of that user, created if needed; in the test
+database that user is created, with a fast password hasher so that the
+hasher does not make up the latency of those routes. SQLite locks the tables of its
+shared in-memory test database while a write runs, failing concurrent
+requests with 500s, so run --writes on PostgreSQL or with --concurrency 1.
+
+Usage: python3 -m benchmarks.loadtest [--requests 5000] [--concurrency 8]
+                                      [--writes] [--existing]
+                                      [--user admin --password admin]
+                                      [--auth token]
+"""
+
+import argparse
+import base64
+from contextlib import contextmanager
+from datetime import timedelta
+import io
+import json
+import math
+import random
+import sys
+import threading
+import time
+
+from .common import setup, test_database, without_throttling
+
+
+SAMPLE_SIZE = 1000
+
+FAST_PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def _get_student(data, rng):
+    return 'GET', '/api/v1/students/%d' % rng.choice(data['students'])[0]
+
+def _get_students(data, rng):
+    return 'GET', '/api/v1/students/?page_size=100'
+
+def _get_students_in_course(data, rng):
+    return ('GET',
+            '/api/v1/students/:course_id/%d' % rng.choice(data['courses'])[0])
+
+def _get_students_by_name(data, rng):
+    name = rng.choice(data['students'])[1]
+
+    return 'GET', '/api/v1/students/:name/%s?limit=100' % name[:4]
+
+def _get_teacher(data, rng):
+    return 'GET', '/api/v1/teachers/%d' % rng.choice(data['teachers'])
+
+def _get_teachers(data, rng):
+    return 'GET', '/api/v1/teachers/?page_size=100'
+
+def _get_course(data, rng):
+    return 'GET', '/api/v1/courses/%d' % rng.choice(data['courses'])[0]
+
+def _get_courses(data, rng):
+    return 'GET', '/api/v1/courses/?page_size=100'
+
+def _get_courses_taken_by_student(data, rng):
+    return ('GET',
+            '/api/v1/courses/:student_id/%d' % rng.choice(data['students'])[0])
+
+def _get_courses_by_title(data, rng):
+    # A word of the title, as the route only takes word characters.
+    word = rng.choice(rng.choice(data['courses'])[1].split())
+
+    return 'GET', '/api/v1/courses/:title/%s?limit=100' % word
+
+def _get_courses_by_start_date(data, rng):
+    start_date = rng.choice(data['courses'])[2]
+
+    return 'GET', '/api/v1/courses/:start-date/%s' % start_date.isoformat()
+
+def _get_courses_by_start_date_range(data, rng):
+    start_date = rng.choice(data['courses'])[2]
+
+    return 'GET', '/api/v1/courses/:start-date/?from=%s&to=%s' % (
+        start_date.isoformat(),
+        (start_date + timedelta(days=30)).isoformat(),
+    )
+
+def _get_enrollment(data, rng):
+    return ('GET',
+            '/api/v1/enrollments/%d' % rng.choice(data['enrollments'])[0])
+
+def _get_enrollments(data, rng):
+    return 'GET', '/api/v1/enrollments/?page_size=100'
+
+def _get_upsert_enrollment(data, rng):
+    pk, course, student = rng.choice(data['enrollments'])
+    path = '/api/v1/enrollments/:course_id/%d/:student_id/%d' % (course,
+                                                                 student)
+    if not data['writes']:
+        return 'GET', path
+
+    return 'PUT', path, {'grade': rng.choice('ABCDF')}
+
+def _post_bulk_enrollments(data, rng):
+    # Random pairs; those enrolled already are reported and skipped.
+    body = [{'course': rng.choice(data['courses'])[0],
+             'student': rng.choice(data['students'])[0],
+             'grade': rng.choice('ABCDF')}
+            for _ in range(10)]
+
+    return 'POST', '/api/v1/enrollments/:bulk', body
+
+def _get_db_pool_stats(data, rng):
+    return 'GET', '/api/v1/:db-pool'
+
+def _post_token(data, rng):
+    return ('POST', '/api/v1/:token', {'username': data['user'],
+                                       'password': data['password']})
+
+def _get_metrics(data, rng):
+    return 'GET', '/metrics'
+
+
+# Request builders by URL name: (builder, needs a user, writes).
+ROUTES = {
+    'get_delete_update_student': (_get_student, False, False),
+    'get_post_students': (_get_students, False, False),
+    'get_students_in_course': (_get_students_in_course, False, False),
+    'get_students_by_name': (_get_students_by_name, False, False),
+    'get_delete_update_teacher': (_get_teacher, False, False),
+    'get_post_teachers': (_get_teachers, False, False),
+    'get_delete_update_course': (_get_course, False, False),
+    'get_post_courses': (_get_courses, False, False),
+    'get_courses_taken_by_student': (_get_courses_taken_by_student,
+                                     False,
+                                     False),
+    'get_courses_by_title': (_get_courses_by_title, False, False),
+    'get_courses_by_start_date': (_get_courses_by_start_date, False, False),
+    'get_courses_by_start_date_range': (_get_courses_by_start_date_range,
+                                        False,
+                                        False),
+    'get_delete_update_enrollment': (_get_enrollment, False, False),
+    'get_post_enrollments': (_get_enrollments, False, False),
+    'get_upsert_enrollment': (_get_upsert_enrollment, False, False),
+    'post_bulk_enrollments': (_post_bulk_enrollments, True, True),
+    'get_db_pool_stats': (_get_db_pool_stats, True, False),
+    'post_delete_token': (_post_token, False, True),
+    'get_metrics': (_get_metrics, False, False),
+}
+
+
+def _check_routes():
+    from courses.urls import urlpatterns
+
+    missing = {pattern.name for pattern in urlpatterns} - set(ROUTES)
+    if missing:
+        sys.exit('No load-test requests for: %s' % ', '.join(sorted(missing)))
+
+def _sample(writes):
+    from courses.models import Course, Enrollment, Student, Teacher
+
+    def sample(queryset):
+        return list(queryset.order_by('?')[:SAMPLE_SIZE])
+
+    data = {
+        'students': sample(Student.objects.values_list('pk', 'first_name')),
+        'teachers': sample(Teacher.objects.values_list('pk', flat=True)),
+        'courses': sample(Course.objects.values_list('pk',
+                                                     'title',
+                                                     'start_date')),
+        'enrollments': sample(Enrollment.objects.values_list('pk',
+                                                             'course_id',
+                                                             'student_id')),
+        'writes': writes,
+    }
+    empty = [name for name, rows in data.items() if rows == []]
+    if empty:
+        sys.exit('The database has no %s.' % ', '.join(empty))
+
+    return data
+
+def _build_requests(data, count, seed, authorization):
+    """
+    Returns ``count`` requests as (URL name, method, path, body, headers),
+    taking the routes in turn.
+    """
+    rng = random.Random(seed)
+    routes = [(name, builder, needs_user)
+              for name, (builder, needs_user, writes) in ROUTES.items()
+              if data['writes'] or not writes]
+    requests = []
+    for i in range(count):
+        name, builder, needs_user = routes[i % len(routes)]
+        method, path, *body = builder(data, rng)
+        headers = {}
+        if needs_user or method not in ('GET', 'HEAD'):
+            headers['HTTP_AUTHORIZATION'] = authorization
+        requests.append((name, method, path, body[0] if body else None,
+                         headers))
+
+    return requests
+
+def _send(application, method, path, body, headers):
+    from wsgiref.util import setup_testing_defaults
+
+    content = b'' if body is None else json.dumps(body).encode()
+    environ = {'REQUEST_METHOD': method,
+               'PATH_INFO': path.split('?')[0],
+               'QUERY_STRING': path.partition('?')[2],
+               'HTTP_HOST': 'testserver',
+               'CONTENT_TYPE': 'application/json',
+               'CONTENT_LENGTH': str(len(content)),
+               'wsgi.input': io.BytesIO(content)}
+    environ.update(headers)
+    setup_testing_defaults(environ)
+    statuses = []
+
+    def start_response(status, headers):
+        statuses.append(int(status.split()[0]))
+
+    response = application(environ, start_response)
+    b''.join(response)
+    # Fires request_finished, as WSGI servers do.
+    response.close()
+
+    return statuses[0]
+
+def _run(requests, concurrency):
+    """
+    Sends the requests from ``concurrency`` threads and returns the
+    wall-clock time, and (URL name, method, status, seconds, queries) for
+    each request.
+    """
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection, connections
+
+    application = get_wsgi_application()
+    pending = iter(requests)
+    lock = threading.Lock()
+    results = []
+
+    def work():
+        queries = 0
+
+        def count_query(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+
+            return execute(sql, params, many, context)
+
+        try:
+            while True:
+                with lock:
+                    request = next(pending, None)
+                if request is None:
+                    break
+                name, method, path, body, headers = request
+                queries = 0
+                started_at = time.perf_counter()
+                with connection.execute_wrapper(count_query):
+                    status = _send(application, method, path, body, headers)
+                elapsed = time.perf_counter() - started_at
+                results.append((name, method, status, elapsed, queries))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=work) for _ in range(concurrency)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - started_at, results
+
+def _percentile(values, percent):
+    # Nearest rank of sorted values.
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+def _report(wall_time, results):
+    by_route = {}
+    for name, method, status, elapsed, queries in results:
+        by_route.setdefault((name, method), []).append((elapsed,
+                                                        queries,
+                                                        status))
+
+    print('%-34s %6s %6s %8s %8s %8s %8s  %s' % (
+        'route', 'method', 'count', 'p50 ms', 'p95 ms', 'p99 ms',
+        'queries', 'statuses'
+    ))
+    for (name, method), rows in sorted(by_route.items()):
+        latencies = sorted(row[0] for row in rows)
+        statuses = {}
+        for row in rows:
+            statuses[row[2]] = statuses.get(row[2], 0) + 1
+        print('%-34s %6s %6d %8.2f %8.2f %8.2f %8.1f  %s' % (
+            name,
+            method,
+            len(rows),
+            _percentile(latencies, 50) * 1e3,
+            _percentile(latencies, 95) * 1e3,
+            _percentile(latencies, 99) * 1e3,
+            sum(row[1] for row in rows) / len(rows),
+            ' '.join('%d:%d' % item for item in sorted(statuses.items())),
+        ))
+
+    latencies = sorted(result[3] for result in results)
+    print('%d requests in %.2fs: %.1f requests/s, p50 %.2f ms, '
+          'p95 %.2f ms, p99 %.2f ms, %.1f queries/request' % (
+              len(results),
+              wall_time,
+              len(results) / wall_time,
+              _percentile(latencies, 50) * 1e3,
+              _percentile(latencies, 95) * 1e3,
+              _percentile(latencies, 99) * 1e3,
+              sum(result[4] for result in results) / len(results),
+          ))
+
+def _get_token(username):
+    from django.contrib.auth.models import User
+    from rest_framework.authtoken.models import Token
+
+    token, created = Token.objects.get_or_create(
+        user=User.objects.get(username=username)
+    )
+
+    return token.key
+
+@contextmanager
+def _generated_database(args):
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    with test_database(), \
+            override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS):
+        call_command('generate_portal_data',
+                     students=args.students,
+                     teachers=args.teachers,
+                     courses=args.courses,
+                     enrollments=args.enrollments,
+                     seed=args.seed)
+        User.objects.create_superuser(args.user, '', args.password)
+        yield
+
+@contextmanager
+def _existing_database(args):
+    from django.test import override_settings
+
+    with override_settings(DEBUG=False, ALLOWED_HOSTS=['testserver']):
+        yield
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--writes', action='store_true')
+    parser.add_argument('--existing', action='store_true')
+    parser.add_argument('--user', default='loadtest')
+    parser.add_argument('--password', default='loadtest')
+    parser.add_argument('--auth', choices=('basic', 'token'),
+                        default='basic')
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--teachers', type=int, default=500)
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--enrollments', type=int, default=200000)
+    args = parser.parse_args()
+
+    setup()
+    database = _existing_database if args.existing else _generated_database
+    with without_throttling(), database(args):
+        _check_routes()
+        if args.auth == 'token':
+            authorization = 'Token %s' % _get_token(args.user)
+        else:
+            authorization = 'Basic %s' % base64.b64encode(
+                ('%s:%s' % (args.user, args.password)).encode()
+            ).decode()
+        data = _sample(args.writes)
+        data.update(user=args.user, password=args.password)
+        requests = _build_requests(data, args.requests, args.seed,
+                                   authorization)
+        wall_time, results = _run(requests, args.concurrency)
+
+    print('%d requests, %d threads' % (args.requests, args.concurrency))
+    _report(wall_time, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Measures the per-request overhead of the request metrics.
+
+The same mix of detail and collection requests is sent to the WSGI
+application with MetricsMiddleware and the query recorder removed, and
+with both in place, alternating between the two. The best time of each is
+kept. As that difference is within the noise of a full request, the cost
+of the middleware around a trivial view, on its sync (WSGI) and async
+(ASGI) paths, and of the query recorder around a no-op query are measured
+on their own as well.
+
+Usage: python3 -m benchmarks.metrics [--requests 2000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+from contextlib import contextmanager
+import time
+import timeit
+
+from .common import best_time, populate, run_wsgi, setup, test_database
+from .common import without_throttling
+
+
+@contextmanager
+def _without_metrics():
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+    from courses.metrics import _record_query
+
+    middleware = [name for name in settings.MIDDLEWARE
+                  if name != 'courses.metrics.MetricsMiddleware']
+    connection.execute_wrappers.remove(_record_query)
+    try:
+        with override_settings(MIDDLEWARE=middleware):
+            yield
+    finally:
+        connection.execute_wrappers.insert(0, _record_query)
+
+def _time_per_call(func, number=100000):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+def _time_middleware():
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from courses.metrics import MetricsMiddleware, metrics
+
+    request = RequestFactory().get('/api/v1/students/1')
+    request.resolver_match = resolve('/api/v1/students/1')
+    response = HttpResponse(b'{}' * 500)
+
+    def get_response(request):
+        return response
+
+    middleware = MetricsMiddleware(get_response)
+    overhead = (_time_per_call(lambda: middleware(request)) -
+                _time_per_call(lambda: get_response(request)))
+    metrics.reset()
+
+    return overhead
+
+def _time_async_middleware(number=100000):
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.urls import resolve
+    from courses.metrics import MetricsMiddleware, metrics
+
+    request = RequestFactory().get('/api/v1/students/1')
+    request.resolver_match = resolve('/api/v1/students/1')
+    response = HttpResponse(b'{}' * 500)
+
+    async def get_response(request):
+        return response
+
+    middleware = MetricsMiddleware(get_response)
+
+    async def time_per_call(func):
+        best = float('inf')
+        for _ in range(5):
+            started_at = time.perf_counter()
+            for _ in range(number):
+                await func(request)
+            best = min(best, time.perf_counter() - started_at)
+
+        return best / number
+
+    async def run():
+        return (await time_per_call(middleware) -
+                await time_per_call(get_response))
+
+    overhead = asyncio.run(run())
+    metrics.reset()
+
+    return overhead
+
+def _time_query_recorder():
+    from courses.metrics import _RequestStats, _record_query, _request_stats
+
+    def execute(sql, params, many, context):
+        pass
+
+    token = _request_stats.set(_RequestStats())
+    try:
+        recorded = _time_per_call(
+            lambda: _record_query(execute, '', None, False, None)
+        )
+    finally:
+        _request_stats.reset(token)
+
+    return recorded - _time_per_call(lambda: execute('', None, False, None))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    with without_throttling(), test_database():
+        populate(students=1000, teachers=100, courses=100, enrollments=1000)
+        paths = [('/api/v1/students/%d' % (i % 100 + 1),
+                  '/api/v1/courses/?page_size=10')[i % 2]
+                 for i in range(args.requests)]
+        run_wsgi(paths[:10])
+
+        without = with_metrics = float('inf')
+        for _ in range(args.repeat):
+            with_metrics = min(with_metrics,
+                               best_time(lambda: run_wsgi(paths), 1))
+            with _without_metrics():
+                without = min(without, best_time(lambda: run_wsgi(paths), 1))
+
+    overhead = (with_metrics - without) / args.requests
+    print('%d requests, best of %d' % (args.requests, args.repeat))
+    print('%-16s %12s %12s' % ('', 'seconds', 'us/request'))
+    print('%-16s %12.3f %12.1f' % ('without metrics',
+                                   without,
+                                   without / args.requests * 1e6))
+    print('%-16s %12.3f %12.1f' % ('with metrics',
+                                   with_metrics,
+                                   with_metrics / args.requests * 1e6))
+    print('overhead: %.1f us/request (%.1f%%)' % (
+        overhead * 1e6,
+        overhead / (without / args.requests) * 100,
+    ))
+    print('middleware: %.2f us/request (sync), %.2f us/request (async)' % (
+        _time_middleware() * 1e6,
+        _time_async_middleware() * 1e6,
+    ))
+    print('query recorder: %.2f us/query' % (_time_query_recorder() * 1e6))
+
+
+if __name__ == '__main__':
+    main()
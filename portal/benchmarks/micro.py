@@ -0,0 +1,396 @@
+"""
+Times serializers, views and URL resolution in-process, to catch
+regressions between commits.
+
+- serializers.*: StudentSerializer, CourseSerializer and
+  EnrollmentSerializer serializing 100 instances, and validating a
+  payload;
+- views.*: every view of courses/urls.py called with a request from
+  APIRequestFactory, response rendering included. Writes run in a
+  transaction that is rolled back, so every call sees the same data;
+- urls.*: reverse() of every URL name and resolve() of every path.
+
+Each benchmark is timed --samples times, each sample running it in a loop
+for at least --sample-time seconds, and the time per call of the samples
+is kept. The benchmarks take turns, one sample at a time.
+
+--save writes the samples to a JSON file. --compare reads such a file and
+flags the benchmarks whose samples are slower than the baseline's
+according to a one-sided Mann-Whitney U test at --alpha, by at least
+--min-change of the baseline median, and exits with status 1 if any is.
+Compare runs of the same machine: a baseline from another machine flags
+everything or nothing.
+
+Usage: python3 -m benchmarks.micro [--save baseline.json]
+                                   [--compare baseline.json]
+                                   [--filter views.] [--samples 20]
+"""
+
+import argparse
+from datetime import datetime, timezone
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+
+from .common import populate, setup, test_database, without_throttling
+
+
+SERIALIZED_INSTANCES = 100
+
+
+def _time_loop(func, number):
+    started_at = time.perf_counter()
+    for _ in range(number):
+        func()
+
+    return time.perf_counter() - started_at
+
+def _get_loop_count(func, sample_time):
+    func()
+    # Like timeit's autorange(): doubled until a sample lasts long enough.
+    number = 1
+    while _time_loop(func, number) < sample_time:
+        number *= 2
+
+    return number
+
+def _run_benchmarks(benchmarks, samples, sample_time):
+    """
+    Returns the times per call of ``samples`` samples of each benchmark.
+
+    The benchmarks take turns, sample by sample, so a burst of load on the
+    machine slows a few samples of every benchmark down rather than all
+    the samples of one.
+    """
+    loop_counts = {name: _get_loop_count(func, sample_time)
+                   for name, func in benchmarks.items()}
+    times = {name: [] for name in benchmarks}
+    for _ in range(samples):
+        for name, func in benchmarks.items():
+            number = loop_counts[name]
+            times[name].append(_time_loop(func, number) / number)
+
+    return times
+
+def _rank(values):
+    # Ranks starting at 1, ties sharing their average rank.
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        value = values[order[i]]
+        while j + 1 < len(order) and values[order[j + 1]] == value:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+
+    return ranks
+
+def mann_whitney_p_value(baseline, current):
+    """
+    Returns the one-sided p-value of the current samples being larger
+    than the baseline samples, with the normal approximation of the
+    Mann-Whitney U statistic.
+    """
+    n1, n2 = len(baseline), len(current)
+    ranks = _rank(list(baseline) + list(current))
+    u = sum(ranks[n1:]) - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    deviation = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    if deviation == 0:
+        return 1.0
+
+    return 1 - statistics.NormalDist().cdf((u - mean) / deviation)
+
+def _get_serializer_benchmarks(data):
+    from courses.models import Course, Enrollment, Student
+    from courses.serializers import (CourseSerializer, EnrollmentSerializer,
+                                     StudentSerializer)
+
+    benchmarks = {}
+    cases = (
+        (StudentSerializer,
+         list(Student.objects.order_by('pk')[:SERIALIZED_INSTANCES]),
+         {'first_name': 'First',
+          'last_name': 'Last',
+          'email_address': 'student@example.com'}),
+        (CourseSerializer,
+         list(Course.objects.order_by('pk')[:SERIALIZED_INSTANCES]),
+         {'title': 'Course',
+          'teacher': data['teacher'],
+          'start_date': '2018-09-01'}),
+        (EnrollmentSerializer,
+         list(Enrollment.objects.order_by('pk')[:SERIALIZED_INSTANCES]),
+         {'course': data['unenrolled'][0],
+          'student': data['unenrolled'][1],
+          'grade': 'A'}),
+    )
+    for serializer_class, instances, payload in cases:
+        name = 'serializers.%s' % serializer_class.__name__
+
+        def serialize(serializer_class=serializer_class,
+                      instances=instances):
+            return serializer_class(instances, many=True).data
+
+        def validate(serializer_class=serializer_class, payload=payload):
+            serializer_class(data=payload).is_valid(raise_exception=True)
+
+        benchmarks['%s.serialize' % name] = serialize
+        benchmarks['%s.validate' % name] = validate
+
+    return benchmarks
+
+def _get_view_cases(data):
+    """
+    Returns (URL name, method, URL kwargs, query string, body) for the
+    requests sent to the views.
+    """
+    student, course, enrollment = (data['student'],
+                                   data['course'],
+                                   data['enrollment'])
+    unenrolled = {'course': data['unenrolled'][0],
+                  'student': data['unenrolled'][1]}
+
+    return (
+        ('get_delete_update_student', 'GET', {'pk': student}, '', None),
+        ('get_delete_update_student', 'PUT', {'pk': student}, '',
+         {'first_name': 'First',
+          'last_name': 'Last',
+          'email_address': 'student@example.com'}),
+        ('get_post_students', 'GET', {}, '', None),
+        ('get_post_students', 'POST', {}, '',
+         {'first_name': 'First',
+          'last_name': 'Last',
+          'email_address': 'student@example.com'}),
+        ('get_students_in_course', 'GET', {'pk': course}, '', None),
+        ('get_students_by_name', 'GET', {'name': 'First1'}, '', None),
+        ('get_delete_update_teacher', 'GET', {'pk': data['teacher']}, '',
+         None),
+        ('get_post_teachers', 'GET', {}, '', None),
+        ('get_delete_update_course', 'GET', {'pk': course}, '', None),
+        ('get_post_courses', 'GET', {}, '', None),
+        ('get_post_courses', 'GET', {}, 'expand=teacher', None),
+        ('get_courses_taken_by_student', 'GET', {'pk': student}, '', None),
+        ('get_courses_by_title', 'GET', {'title': 'Course'}, '', None),
+        ('get_courses_by_start_date', 'GET', {'date': '2018-09-01'}, '',
+         None),
+        ('get_courses_by_start_date_range', 'GET', {},
+         'from=2018-09-01&to=2018-12-31', None),
+        ('get_delete_update_enrollment', 'GET', {'pk': enrollment}, '',
+         None),
+        ('get_post_enrollments', 'GET', {}, '', None),
+        ('get_post_enrollments', 'POST', {}, '', dict(unenrolled,
+                                                      grade='A')),
+        ('get_upsert_enrollment', 'GET', data['enrolled'], '', None),
+        ('get_upsert_enrollment', 'PUT', data['enrolled'], '',
+         {'grade': 'B'}),
+        ('post_bulk_enrollments', 'POST', {}, '',
+         [dict(unenrolled, grade='A')]),
+        ('get_db_pool_stats', 'GET', {}, '', None),
+        ('post_delete_token', 'DELETE', {}, '', None),
+        ('get_metrics', 'GET', {}, '', None),
+    )
+
+def _get_view_benchmarks(data):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from django.urls import resolve, reverse
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from courses.urls import urlpatterns
+
+    factory = APIRequestFactory()
+    user = User.objects.create_user('benchmark')
+    benchmarks = {}
+    cases = _get_view_cases(data)
+    missing = ({pattern.name for pattern in urlpatterns} -
+               {case[0] for case in cases})
+    if missing:
+        sys.exit('No benchmark requests for: %s' % ', '.join(sorted(missing)))
+
+    for name, method, kwargs, query_string, body in cases:
+        path = reverse(name, kwargs=kwargs)
+        view = resolve(path).func
+
+        def call(method=method, path=path, view=view, kwargs=kwargs,
+                 query_string=query_string, body=body):
+            request = getattr(factory, method.lower())(
+                path + ('?' + query_string if query_string else ''),
+                body,
+                format='json'
+            )
+            force_authenticate(request, user=user)
+            response = view(request, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+
+            return response
+
+        def call_rolled_back(call=call):
+            with transaction.atomic():
+                response = call()
+                transaction.set_rollback(True)
+
+            return response
+
+        func = call if method == 'GET' else call_rolled_back
+        status_code = func().status_code
+        if status_code >= 400:
+            sys.exit('%s %s answered %d' % (method, path, status_code))
+        key = 'views.%s.%s' % (name, method)
+        if key in benchmarks:
+            key += '?' + query_string
+        benchmarks[key] = func
+
+    return benchmarks
+
+def _get_url_benchmarks(data):
+    from django.urls import resolve, reverse
+
+    reversals = [(case[0], case[2]) for case in _get_view_cases(data)]
+    paths = [reverse(name, kwargs=kwargs) for name, kwargs in reversals]
+
+    def reverse_all():
+        for name, kwargs in reversals:
+            reverse(name, kwargs=kwargs)
+
+    def resolve_all():
+        for path in paths:
+            resolve(path)
+
+    return {'urls.reverse': reverse_all, 'urls.resolve': resolve_all}
+
+def _get_data():
+    from courses.models import Enrollment, Student
+
+    populate(students=1000, teachers=50, courses=200, enrollments=5000)
+    enrollment = Enrollment.objects.order_by('pk').first()
+    unenrolled_student = Student.objects.exclude(
+        pk__in=Enrollment.objects.values('student')
+    ).order_by('pk').first()
+
+    return {
+        'student': enrollment.student_id,
+        'teacher': enrollment.course.teacher_id,
+        'course': enrollment.course_id,
+        'enrollment': enrollment.pk,
+        'enrolled': {'course': enrollment.course_id,
+                     'student': enrollment.student_id},
+        'unenrolled': (enrollment.course_id, unenrolled_student.pk),
+    }
+
+def _summarize(samples):
+    return {
+        'samples': samples,
+        'median': statistics.median(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+def _compare(baseline, results, alpha, min_change):
+    """
+    Prints the changes from the baseline and returns the names of the
+    benchmarks that got slower.
+    """
+    slower = []
+    print('%-44s %10s %10s %8s %8s' % ('benchmark', 'base (us)',
+                                       'now (us)', 'change', 'p'))
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            print('%-44s %10s %10.1f' % (name, '-', result['median'] * 1e6))
+            continue
+        base = baseline[name]
+        change = result['median'] / base['median'] - 1
+        p_value = mann_whitney_p_value(base['samples'], result['samples'])
+        flag = ''
+        if p_value < alpha and change >= min_change:
+            flag = 'SLOWER'
+            slower.append(name)
+        elif (mann_whitney_p_value(result['samples'], base['samples']) <
+              alpha and -change >= min_change):
+            flag = 'faster'
+        print('%-44s %10.1f %10.1f %+7.1f%% %8.4f  %s' % (
+            name,
+            base['median'] * 1e6,
+            result['median'] * 1e6,
+            change * 100,
+            p_value,
+            flag,
+        ))
+
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--save', metavar='FILE')
+    parser.add_argument('--compare', metavar='FILE')
+    parser.add_argument('--filter',
+                        nargs='+',
+                        default=[],
+                        help='Only run the benchmarks whose name contains '
+                             'one of these strings.')
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--sample-time', type=float, default=0.02)
+    parser.add_argument('--alpha', type=float, default=0.01)
+    parser.add_argument('--min-change', type=float, default=0.1)
+    args = parser.parse_args()
+    if args.samples < 2:
+        parser.error('--samples must be at least 2.')
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['benchmarks']
+
+    setup()
+    with without_throttling(), test_database():
+        data = _get_data()
+        benchmarks = {}
+        for get_benchmarks in (_get_serializer_benchmarks,
+                               _get_view_benchmarks,
+                               _get_url_benchmarks):
+            benchmarks.update(get_benchmarks(data))
+
+        selected = {name: func
+                    for name, func in sorted(benchmarks.items())
+                    if not args.filter or any(part in name
+                                              for part in args.filter)}
+        results = {name: _summarize(times)
+                   for name, times in _run_benchmarks(selected,
+                                                      args.samples,
+                                                      args.sample_time)
+                                                     .items()}
+
+    if baseline is None:
+        for name, result in results.items():
+            print('%-44s %10.1f us' % (name, result['median'] * 1e6))
+
+    if args.save:
+        import django
+
+        with open(args.save, 'w') as output:
+            json.dump({
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'machine': platform.node(),
+                'benchmarks': results,
+            }, output, indent=2, sort_keys=True)
+            output.write('\n')
+
+    if baseline is not None:
+        slower = _compare(baseline, results, args.alpha, args.min_change)
+        if slower:
+            sys.exit('%d benchmark(s) slower than %s.' % (len(slower),
+                                                          args.compare))
+
+
+if __name__ == '__main__':
+    main()
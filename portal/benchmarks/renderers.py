@@ -0,0 +1,63 @@
+"""
+Compares the render time of DRF's JSONRenderer and FastJSONRenderer over
+the list representations of the four models.
+
+Usage: python3 -m benchmarks.renderers [--sizes 1000 10000 100000]
+"""
+
+import argparse
+
+from .common import best_time, populate, setup, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    setup()
+    from rest_framework.renderers import JSONRenderer
+    from courses import renderers, serializers
+
+    if renderers.orjson is None:
+        print('orjson is not installed; FastJSONRenderer falls back to '
+              'JSONRenderer.')
+    serializer_classes = (
+        serializers.StudentValuesSerializer,
+        serializers.TeacherValuesSerializer,
+        serializers.CourseValuesSerializer,
+        serializers.EnrollmentValuesSerializer,
+    )
+    largest = max(args.sizes)
+    with test_database():
+        populate(students=largest,
+                 teachers=largest,
+                 courses=largest,
+                 enrollments=largest)
+
+        print('%-12s %8s %12s %12s %8s' % ('model', 'rows',
+                                           'json (ms)', 'fast (ms)',
+                                           'speedup'))
+        for serializer_class in serializer_classes:
+            model = serializer_class.model_serializer_class.Meta.model
+            for size in args.sizes:
+                queryset = model.objects.order_by('id')[:size]
+                data = serializer_class(queryset, many=True).data
+                json_time = best_time(lambda: JSONRenderer().render(data))
+                fast_time = best_time(
+                    lambda: renderers.FastJSONRenderer().render(data)
+                )
+                print('%-12s %8d %12.1f %12.1f %7.1fx' % (
+                    model.__name__,
+                    size,
+                    json_time * 1000,
+                    fast_time * 1000,
+                    json_time / fast_time,
+                ))
+
+
+if __name__ == '__main__':
+    main()
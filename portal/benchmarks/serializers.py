@@ -0,0 +1,66 @@
+"""
+Compares the model and values() serializers of the list endpoints.
+
+Usage: python3 -m benchmarks.serializers [--sizes 1000 10000 100000]
+"""
+
+import argparse
+
+from .common import best_time, populate, setup, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes',
+                        type=int,
+                        nargs='+',
+                        default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    setup()
+    from courses.models import Course, Enrollment, Student, Teacher
+    from courses import serializers
+
+    pairs = (
+        (Student, serializers.StudentSerializer,
+         serializers.StudentValuesSerializer),
+        (Teacher, serializers.TeacherSerializer,
+         serializers.TeacherValuesSerializer),
+        (Course, serializers.CourseSerializer,
+         serializers.CourseValuesSerializer),
+        (Enrollment, serializers.EnrollmentSerializer,
+         serializers.EnrollmentValuesSerializer),
+    )
+    largest = max(args.sizes)
+    with test_database():
+        populate(students=max(largest // 100, 1000),
+                 teachers=largest,
+                 courses=largest,
+                 enrollments=largest)
+        # Make the student table as large as the others.
+        populate(students=largest, teachers=0, courses=0, enrollments=0)
+
+        print('%-12s %8s %12s %12s %8s' % ('serializer', 'rows',
+                                           'model (ms)', 'values (ms)',
+                                           'speedup'))
+        for model, serializer_class, values_serializer_class in pairs:
+            for size in args.sizes:
+                queryset = model.objects.order_by('id')[:size]
+                model_time = best_time(
+                    lambda: serializer_class(queryset.all(), many=True).data
+                )
+                values_time = best_time(
+                    lambda: values_serializer_class(queryset.all(),
+                                                    many=True).data
+                )
+                print('%-12s %8d %12.1f %12.1f %7.1fx' % (
+                    model.__name__,
+                    size,
+                    model_time * 1000,
+                    values_time * 1000,
+                    model_time / values_time,
+                ))
+
+
+if __name__ == '__main__':
+    main()
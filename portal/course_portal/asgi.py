@@ -0,0 +1,20 @@
+"""
+ASGI config for course_portal project.
+
+It exposes the ASGI callable as a module-level variable named ``application``
+and turns on ``COURSES_ASYNC_READS``, so the read endpoints run as
+coroutines, with the handler of ``courses.async_views``, which streams
+responses from a thread.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
+"""
+
+import os
+
+from courses.async_views import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'course_portal.settings')
+os.environ.setdefault('COURSES_ASYNC_READS', '1')
+
+application = get_asgi_application()
@@ -0,0 +1,31 @@
+"""
+Settings for trying the read replicas locally, with two SQLite files
+standing in for the primary and a replica:
+
+    export DJANGO_SETTINGS_MODULE=course_portal.replica_settings
+    python3 manage.py migrate
+    cp primary.sqlite3 replica.sqlite3
+    python3 manage.py runserver
+
+Writes only reach primary.sqlite3, so GET requests show what was copied
+last, except for clients pinned to the primary by a recent write. Copy
+the file again to "replicate".
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, os
+
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'primary.sqlite3'),
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'replica.sqlite3'),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+COURSES_READ_REPLICAS = ['replica']
@@ -37,12 +37,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    'courses',
+    'courses.apps.CoursesConfig',
     'rest_framework',
+    'rest_framework.authtoken',
 ]
 
 MIDDLEWARE = [
+    'courses.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'courses.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -77,15 +80,29 @@ WSGI_APPLICATION = 'course_portal.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'courses.db.postgresql',
         'NAME': 'course_portal_db',
         'USER': 'course_portal_db_user',
         'PASSWORD': 'mypassword',
         'HOST': 'localhost',
         'PORT': '',
+        # Keep connections open for up to a minute, checking them before
+        # they are reused (see courses/db/postgresql/base.py). To share a
+        # pool of connections between the threads of a process instead,
+        # e.g. under ASGI, set CONN_MAX_AGE to 0 and OPTIONS to
+        # {'pool': {'max_size': 10, 'timeout': 30}}.
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# A read replica of 'default' for COURSES_READ_REPLICAS: set its HOST to that
+# of a streaming replica. Tests use it as a mirror of 'default'.
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+
+# Send the reads of GET requests to COURSES_READ_REPLICAS.
+DATABASE_ROUTERS = ['courses.replicas.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.1/ref/settings/#auth-password-validators
@@ -125,10 +142,113 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+
+# Tests
+# https://docs.djangoproject.com/en/2.1/topics/testing/advanced/#defining-a-test-runner
+
+TEST_RUNNER = 'courses.tests.runner.PortalTestRunner'
+
+
+# Caches
+# https://docs.djangoproject.com/en/2.1/topics/cache/
+
+# LocMemCache keeps a separate cache in each process. With several worker
+# processes, set COURSES_MEMCACHED_LOCATION (e.g. 127.0.0.1:11211) to share
+# the throttle counters, verified tokens and cached responses in memcached,
+# which needs pymemcache (pip install pymemcache). The courses.W001 system
+# check warns about process-local caches that should be shared.
+if os.environ.get('COURSES_MEMCACHED_LOCATION'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['COURSES_MEMCACHED_LOCATION'],
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
+
+# Course portal
+
+# Rows serialized per chunk by ?stream=1 exports of the collection endpoints.
+COURSES_STREAM_CHUNK_SIZE = 2000
+
+# Rows per INSERT statement of the bulk enrollment endpoint.
+COURSES_BULK_BATCH_SIZE = 500
+
+# Cache of GET responses, invalidated by model signals (see courses/cache.py).
+# With several worker processes, COURSES_RESPONSE_CACHE_ALIAS must name a
+# cache shared by all of them (e.g. memcached); a per-process LocMemCache
+# would miss invalidations made by the other workers.
+COURSES_RESPONSE_CACHE_ENABLED = False
+COURSES_RESPONSE_CACHE_ALIAS = 'default'
+COURSES_RESPONSE_CACHE_TIMEOUT = 300
+
+# Run the read endpoints as coroutines whose GET requests use a thread pool
+# (see courses/async_views.py). Set by course_portal/asgi.py; leave it off
+# under WSGI, where async views only add overhead.
+COURSES_ASYNC_READS = os.environ.get('COURSES_ASYNC_READS') == '1'
+
+# Aliases of DATABASES entries that GET requests read from (see
+# courses/replicas.py), e.g. ['replica'] once its HOST is set, or other copies
+# of 'default' with the HOST of a streaming replica and 'TEST': {'MIRROR':
+# 'default'}. Clients that wrote read from the primary for
+# COURSES_REPLICA_PIN_SECONDS afterwards, which should exceed the replication
+# lag. course_portal/replica_settings.py sets up two SQLite files.
+COURSES_READ_REPLICAS = []
+COURSES_REPLICA_PIN_SECONDS = 5
+
+# Record the latency, database queries and response size of each request
+# by view and method (see courses/metrics.py), exposed at /metrics in the
+# Prometheus text format. Restrict /metrics to the scraper at the proxy.
+COURSES_METRICS_ENABLED = True
+
+# Requests allowed by the throttles of REST_FRAMEWORK are counted in the
+# cache named by COURSES_THROTTLE_CACHE_ALIAS (see courses/throttling.py),
+# which must be shared by all worker processes (e.g. memcached) for the
+# rates to hold across them. Requests to the URL names listed in
+# COURSES_THROTTLE_COSTS count as that many requests; others count as one.
+COURSES_THROTTLE_CACHE_ALIAS = 'default'
+COURSES_THROTTLE_COSTS = {
+    'get_students_by_name': 5,
+    'get_courses_by_title': 5,
+    'get_courses_by_start_date': 2,
+    'get_courses_by_start_date_range': 2,
+    'post_bulk_enrollments': 10,
+    # Each token request with a password runs the password hasher.
+    'post_delete_token': 10,
+}
+
+# Tokens verified by courses.authentication.CachedTokenAuthentication are
+# kept, with their users but not their password hashes, in the cache named
+# by COURSES_TOKEN_CACHE_ALIAS for COURSES_TOKEN_CACHE_TIMEOUT seconds.
+# Deleting a token or saving its user revokes the cached entry, so share the
+# cache between the workers.
+COURSES_TOKEN_CACHE_ALIAS = 'default'
+COURSES_TOKEN_CACHE_TIMEOUT = 60
+
 REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'courses.pagination.PortalCursorPagination',
+    'PAGE_SIZE': 100,
+    # FastJSONRenderer/FastJSONParser use orjson when it is installed and
+    # fall back to DRF's JSONRenderer/JSONParser otherwise. Replace them
+    # with the rest_framework classes to always use the stdlib json.
+    'DEFAULT_RENDERER_CLASSES': (
+        'courses.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer'
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'courses.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser'
+    ),
     'DEFAULT_THROTTLE_CLASSES': (
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'courses.throttling.AnonRateThrottle',
+        'courses.throttling.UserRateThrottle'
     ),
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/minute',
@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers import asgi
+from django.db import close_old_connections, connections
+
+
+_READ_METHODS = ('GET', 'HEAD')
+
+
+def is_enabled():
+    return getattr(settings, 'COURSES_ASYNC_READS', False)
+
+def _run_read(view_func, request, *args, **kwargs):
+    try:
+        response = view_func(request, *args, **kwargs)
+        if not response.streaming and hasattr(response, 'render'):
+            response.render()
+
+        return response
+    finally:
+        # Django only closes the connections of the thread that finishes
+        # the request, not those of the pool threads.
+        close_old_connections()
+
+def async_reads(view_func):
+    """
+    Makes a view a coroutine when ``COURSES_ASYNC_READS`` is set, as it
+    is by ``course_portal.asgi``.
+
+    GET and HEAD requests run the view, including rendering, in a thread
+    of asgiref's pool (``thread_sensitive=False``) with its own database
+    connection, so one process serves many reads concurrently instead of
+    queueing them on the single thread Django 3.2 runs sync views in.
+    Other methods keep running in that single thread. Streamed responses
+    are returned unread, for ``ASGIHandler`` to send chunk by chunk.
+    """
+    if not is_enabled():
+        return view_func
+
+    run_read = sync_to_async(partial(_run_read, view_func),
+                             thread_sensitive=False)
+    run_write = sync_to_async(view_func)
+
+    @wraps(view_func)
+    async def wrapper(request, *args, **kwargs):
+        if request.method in _READ_METHODS:
+            return await run_read(request, *args, **kwargs)
+
+        return await run_write(request, *args, **kwargs)
+
+    return wrapper
+
+def _get_headers(response):
+    # Encoded as by Django's ASGIHandler.send_response().
+    headers = [(header.encode('ascii'), value.encode('latin1'))
+               for header, value in response.items()]
+    headers.extend(
+        (b'Set-Cookie', cookie.output(header='').encode('ascii').strip())
+        for cookie in response.cookies.values()
+    )
+
+    return headers
+
+def _close_response(response):
+    try:
+        # Closes the content's iterator and sends request_finished.
+        response.close()
+    finally:
+        connections.close_all()
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """
+    Django's ASGI handler, except that streamed responses are read in a
+    thread of their own rather than on the event loop, where the ORM
+    cannot run; Django 3.2 has no async iterators for them.
+
+    The thread is kept for the whole response, so the rows of a
+    ``?stream=1`` export are read through one connection and its
+    server-side cursor. Each chunk is sent as soon as it is encoded, and
+    memory use stays that of one chunk.
+    """
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1)
+        parts = iter(response)
+        try:
+            await send({
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': _get_headers(response),
+            })
+            while True:
+                part = await loop.run_in_executor(executor, next, parts,
+                                                  None)
+                if part is None:
+                    break
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            await send({'type': 'http.response.body'})
+        finally:
+            await loop.run_in_executor(executor, _close_response, response)
+            executor.shutdown(wait=False)
+
+
+def get_asgi_application():
+    """
+    Returns the portal's ASGI application: Django's
+    ``get_asgi_application()`` with ``ASGIHandler``.
+    """
+    import django
+
+    django.setup(set_prefix=False)
+
+    return ASGIHandler()
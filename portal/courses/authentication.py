@@ -0,0 +1,111 @@
+import hashlib
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+DEFAULT_TOKEN_CACHE_TIMEOUT = 60
+
+
+def get_cache():
+    alias = getattr(settings, 'COURSES_TOKEN_CACHE_ALIAS', 'default')
+
+    return caches[alias]
+
+def get_timeout():
+    return getattr(settings,
+                   'COURSES_TOKEN_CACHE_TIMEOUT',
+                   DEFAULT_TOKEN_CACHE_TIMEOUT)
+
+def _get_key(token_key):
+    # Tokens are credentials: keep them out of the cache's key space.
+    return 'courses:token:%s' % hashlib.sha256(
+        token_key.encode()
+    ).hexdigest()
+
+def _to_entry(token):
+    """
+    Returns what the cache keeps of a token: its creation time and the
+    values of its user's fields, without the password hash.
+    """
+    user = token.user
+    field_names = [field.attname for field in user._meta.concrete_fields
+                   if field.attname != 'password']
+
+    return (token.created,
+            user._state.db,
+            field_names,
+            [getattr(user, name) for name in field_names])
+
+def _from_entry(key, entry):
+    """
+    Returns the token with the key of a cache entry, and its user, whose
+    password is deferred: it is read from the database if it is needed,
+    and save() leaves it alone.
+    """
+    created, db, field_names, values = entry
+    user = get_user_model().from_db(db, field_names, values)
+    token = Token.from_db(db, ['key', 'user_id', 'created'],
+                          [key, user.pk, created])
+    token.user = user
+
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication (``Authorization: Token <key>``) that keeps the
+    tokens it verified, with their users but not their password hashes, in
+    the cache named by COURSES_TOKEN_CACHE_ALIAS for
+    COURSES_TOKEN_CACHE_TIMEOUT seconds, so that most requests
+    authenticate without a query.
+
+    Deleting a token, or saving or deleting its user (e.g. to deactivate
+    it), drops it from the cache. Changes made without model signals, such
+    as QuerySet.update(), take effect when the cached entry expires.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_cache()
+        cache_key = _get_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(cache_key, _to_entry(token), timeout=get_timeout())
+        else:
+            token = _from_entry(key, entry)
+
+        return (token.user, token)
+
+
+def revoke_tokens(token_keys):
+    """
+    Drops the tokens from the cache. Inside a transaction they are dropped
+    again on commit, since a concurrent request may cache them from the
+    rows committed before.
+    """
+    cache_keys = [_get_key(key) for key in token_keys]
+    get_cache().delete_many(cache_keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: get_cache().delete_many(cache_keys))
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def revoke_token(sender, instance, **kwargs):
+    revoke_tokens([instance.key])
+
+@receiver(post_save, sender=get_user_model())
+def revoke_user_tokens(sender, instance, created, update_fields=None,
+                       **kwargs):
+    # Logins only update last_login, which tokens do not depend on.
+    if created or (update_fields is not None and
+                   set(update_fields) <= {'last_login'}):
+        return
+
+    revoke_tokens(Token.objects.filter(user=instance)
+                               .values_list('key', flat=True))
@@ -0,0 +1,184 @@
+from collections import Counter
+from functools import reduce
+import operator
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from rest_framework import serializers
+from . import cache
+from .counters import change_enrollment_counts
+from .models import Course, Enrollment, Student
+from .serializers import BulkEnrollmentEntrySerializer
+from .signals import get_enrollment_tags
+
+
+DEFAULT_BULK_BATCH_SIZE = 500
+
+# Pairs looked up per query by get_existing_enrollments(), well within
+# SQLite's limit of 1000 on the depth of an expression.
+ENROLLMENT_PAIRS_PER_QUERY = 400
+
+_DOES_NOT_EXIST = \
+    serializers.PrimaryKeyRelatedField.default_error_messages['does_not_exist']
+
+_NOT_UNIQUE = serializers.UniqueTogetherValidator.message.format(
+    field_names='course, student'
+)
+
+
+def get_bulk_batch_size():
+    return getattr(settings,
+                   'COURSES_BULK_BATCH_SIZE',
+                   DEFAULT_BULK_BATCH_SIZE)
+
+def get_existing_pks(model, pks):
+    if not pks:
+        return set()
+
+    return set(model.objects.filter(pk__in=pks)
+                            .values_list('pk', flat=True))
+
+def get_relation_errors(course_pk, student_pk, course_pks, student_pks):
+    """
+    Returns the errors of an enrollment whose course or student is not
+    among the existing ``course_pks`` or ``student_pks``.
+    """
+    errors = {}
+    if course_pk not in course_pks:
+        errors['course'] = [_DOES_NOT_EXIST.format(pk_value=course_pk)]
+    if student_pk not in student_pks:
+        errors['student'] = [_DOES_NOT_EXIST.format(pk_value=student_pk)]
+
+    return errors
+
+def get_existing_enrollments(pairs):
+    """
+    Returns the ``(course, student)`` pairs among ``pairs`` that are
+    already enrolled.
+
+    Only the given pairs are matched, with one query per
+    ENROLLMENT_PAIRS_PER_QUERY pairs, rather than every enrollment of the
+    given courses and students, which can be most of the table.
+    """
+    pairs = list(pairs)
+    enrolled = set()
+    for start in range(0, len(pairs), ENROLLMENT_PAIRS_PER_QUERY):
+        condition = reduce(operator.or_, (
+            Q(course=course_pk, student=student_pk)
+            for course_pk, student_pk
+            in pairs[start:start + ENROLLMENT_PAIRS_PER_QUERY]
+        ))
+        enrolled.update(Enrollment.objects.filter(condition)
+                                          .values_list('course', 'student'))
+
+    return enrolled
+
+def _check_entries(valid_entries):
+    """
+    Returns the ``(index, enrollment)`` pairs to insert for the validated
+    entries, and the errors of the others, checking the referenced
+    courses and students with one ``IN`` query each, and the existing
+    enrollments of the entries' pairs.
+    """
+    course_pks = get_existing_pks(
+        Course,
+        {data['course'] for _, data in valid_entries}
+    )
+    student_pks = get_existing_pks(
+        Student,
+        {data['student'] for _, data in valid_entries}
+    )
+
+    enrolled = get_existing_enrollments({
+        (data['course'], data['student']) for _, data in valid_entries
+        if data['course'] in course_pks and data['student'] in student_pks
+    })
+
+    enrollments = []
+    errors = []
+    for index, data in valid_entries:
+        entry_errors = get_relation_errors(data['course'],
+                                           data['student'],
+                                           course_pks,
+                                           student_pks)
+        if not entry_errors and (data['course'], data['student']) in enrolled:
+            entry_errors['non_field_errors'] = [_NOT_UNIQUE]
+        if entry_errors:
+            errors.append({'index': index, 'errors': entry_errors})
+            continue
+
+        enrolled.add((data['course'], data['student']))
+        enrollments.append((index, Enrollment(course_id=data['course'],
+                                              student_id=data['student'],
+                                              grade=data.get('grade'))))
+
+    return enrollments, errors
+
+def _insert_enrollments(enrollments, batch_size):
+    with transaction.atomic():
+        created = Enrollment.objects.bulk_create(enrollments,
+                                                 batch_size=batch_size)
+        # bulk_create() sends no post_save signals.
+        tags = [cache.get_collection_tag(Enrollment)]
+        for enrollment in created:
+            tags += get_enrollment_tags(enrollment.course_id,
+                                        enrollment.student_id)
+        cache.invalidate(tags)
+        change_enrollment_counts(Counter(enrollment.course_id
+                                         for enrollment in created))
+
+    return created
+
+def create_enrollments(entries, batch_size=None):
+    """
+    Validates and inserts a list of ``{course, student, grade}`` entries.
+
+    Referenced courses and students are checked with one ``IN`` query
+    each, and existing enrollments with a query per
+    ENROLLMENT_PAIRS_PER_QUERY entries. The valid entries are inserted
+    with ``bulk_create`` inside a single transaction, which also updates
+    the courses' enrollment counts. Invalid entries, including second
+    enrollments of a student in a course, are reported and skipped.
+    When a concurrent request enrolls, or deletes, some of the entries'
+    rows between the checks and the insert, the entries are checked again
+    and the insert retried without the ones that became invalid.
+
+    Returns a ``(created, errors)`` pair, where ``errors`` is a list of
+    ``{'index': ..., 'errors': ...}`` dicts.
+    """
+    if batch_size is None:
+        batch_size = get_bulk_batch_size()
+
+    valid_entries = []
+    errors = []
+    for index, entry in enumerate(entries):
+        serializer = BulkEnrollmentEntrySerializer(data=entry)
+        if serializer.is_valid():
+            valid_entries.append((index, serializer.validated_data))
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+
+    enrollments, entry_errors = _check_entries(valid_entries)
+    errors += entry_errors
+    while True:
+        try:
+            created = _insert_enrollments(
+                [enrollment for _, enrollment in enrollments],
+                batch_size
+            )
+            break
+        except IntegrityError:
+            indexes = {index for index, _ in enrollments}
+            enrollments, entry_errors = _check_entries(
+                [(index, data) for index, data in valid_entries
+                 if index in indexes]
+            )
+            # Without entries invalidated since the first check, the
+            # error is not a concurrent write's.
+            if not entry_errors:
+                raise
+            errors += entry_errors
+
+    errors.sort(key=lambda error: error['index'])
+
+    return created, errors
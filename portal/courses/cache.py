@@ -0,0 +1,163 @@
+import hashlib
+from functools import wraps
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+
+# Every cache entry depends on this tag, so bumping it drops everything.
+ALL_TAG = '*'
+
+DEFAULT_RESPONSE_CACHE_TIMEOUT = 300
+
+_SENTINEL = object()
+
+
+def is_enabled():
+    return getattr(settings, 'COURSES_RESPONSE_CACHE_ENABLED', False)
+
+def get_cache():
+    alias = getattr(settings, 'COURSES_RESPONSE_CACHE_ALIAS', 'default')
+
+    return caches[alias]
+
+def get_timeout():
+    return getattr(settings,
+                   'COURSES_RESPONSE_CACHE_TIMEOUT',
+                   DEFAULT_RESPONSE_CACHE_TIMEOUT)
+
+def get_instance_tag(model, pk):
+    return '%s:%s' % (model._meta.model_name, pk)
+
+def get_collection_tag(model):
+    return '%s:*' % model._meta.model_name
+
+def _get_version_key(tag):
+    return 'courses:tag:%s' % tag
+
+def _get_tag_versions(tags):
+    """
+    Returns the current version of each tag, creating missing ones.
+
+    New versions start from the clock rather than from 1, so a tag whose
+    version was evicted can never come back with a value that still
+    addresses entries cached before the eviction.
+    """
+    cache = get_cache()
+    keys = [_get_version_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+
+    return [versions[key] for key in keys]
+
+def _make_key(name, tags):
+    tags = [ALL_TAG] + list(tags)
+    versions = _get_tag_versions(tags)
+    source = '%s|%s' % (name, ','.join('%s=%s' % pair
+                                       for pair in zip(tags, versions)))
+
+    return 'courses:entry:%s' % hashlib.md5(source.encode()).hexdigest()
+
+def _bump_versions(tags):
+    cache = get_cache()
+    for tag in tags:
+        try:
+            cache.incr(_get_version_key(tag))
+        except ValueError:
+            # Nothing was cached under this tag yet.
+            pass
+
+def invalidate(tags):
+    """
+    Invalidates every cache entry that depends on any of the tags.
+
+    Entries are not deleted; their keys embed the tag versions, so
+    bumping a version makes them unreachable until they expire. Inside a
+    transaction the versions are bumped again on commit, since a reader
+    may cache the old rows in between.
+    """
+    if not is_enabled():
+        return
+
+    tags = set(tags)
+    _bump_versions(tags)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump_versions(tags))
+
+def invalidate_all():
+    invalidate([ALL_TAG])
+
+def memoize(name, tags, compute):
+    """
+    Returns ``compute()``, cached until one of the tags is invalidated.
+    """
+    if not is_enabled():
+        return compute()
+
+    cache = get_cache()
+    key = _make_key(name, tags)
+    value = cache.get(key, _SENTINEL)
+    if value is _SENTINEL:
+        value = compute()
+        cache.set(key, value, get_timeout())
+
+    return value
+
+def cached_response(*tag_templates):
+    """
+    Caches the rendered JSON responses of a GET view.
+
+    Entries are keyed by the full URL and the negotiated media type, and
+    depend on the tags built by formatting ``tag_templates`` with the
+    view's keyword arguments, e.g. ``'student:{pk}'``. A template can also
+    be a callable taking the request and the keyword arguments and
+    returning a list of tags. Model signals invalidate the tags (see
+    ``courses.signals``).
+
+    Only successful JSON responses are cached: the browsable API embeds
+    per-user content such as CSRF tokens.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (not is_enabled() or
+                    request.method != 'GET' or
+                    request.accepted_renderer.format != 'json'):
+                return view_func(request, *args, **kwargs)
+
+            tags = []
+            for template in tag_templates:
+                if callable(template):
+                    tags += template(request, **kwargs)
+                else:
+                    tags.append(template.format(**kwargs))
+            name = '%s|%s' % (request.get_full_path(),
+                              request.accepted_media_type)
+            key = _make_key(name, tags)
+            cache = get_cache()
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+
+                return HttpResponse(content, content_type=content_type)
+
+            response = view_func(request, *args, **kwargs)
+            if (isinstance(response, Response) and
+                    response.status_code == 200):
+                response.add_post_render_callback(
+                    lambda r: cache.set(key,
+                                        (r.content, r['Content-Type']),
+                                        get_timeout())
+                )
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.core import checks
+from django.core.cache.backends.locmem import LocMemCache
+from . import authentication, throttling
+
+
+# The caches that the worker processes must share, by the setting naming
+# them, with what happens when each process keeps its own.
+_SHARED_CACHES = (
+    ('COURSES_THROTTLE_CACHE_ALIAS', throttling.get_cache,
+     'each worker process enforces the throttle rates on its own'),
+    ('COURSES_TOKEN_CACHE_ALIAS', authentication.get_cache,
+     'tokens revoked in one worker process stay valid in the others until '
+     'their entries expire'),
+)
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    """
+    Warns about the caches that should be shared by the worker processes
+    but are kept in each of them, unless DEBUG is on as with runserver.
+    """
+    if settings.DEBUG:
+        return []
+
+    return [
+        checks.Warning(
+            '%s names a LocMemCache, so %s.' % (name, consequence),
+            hint=('Name a cache shared by all worker processes, such as '
+                  'memcached with COURSES_MEMCACHED_LOCATION, or silence '
+                  'courses.W001 when serving from a single process.'),
+            id='courses.W001',
+        )
+        for name, get_cache, consequence in _SHARED_CACHES
+        if isinstance(get_cache(), LocMemCache)
+    ]
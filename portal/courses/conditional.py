@@ -0,0 +1,102 @@
+import hashlib
+from django.db.models import Count, Max
+from django.views.decorators.http import condition
+from . import cache
+
+
+_SAFE_METHODS = ('GET', 'HEAD')
+
+_PRECONDITION_HEADERS = ('HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+
+
+def _get_cached(request, attribute, tags, compute):
+    # condition() asks for the ETag and Last-Modified separately; compute
+    # their source once per request, and keep it in the response cache
+    # when that is enabled so that revalidating costs no query at all.
+    if not hasattr(request, attribute):
+        setattr(request, attribute, cache.memoize(attribute, tags, compute))
+
+    return getattr(request, attribute)
+
+def _is_expanded(request):
+    # Expanded representations also change with the related rows, which
+    # the validators below do not look at.
+    return 'expand' in request.GET
+
+def _has_preconditions(request):
+    # Writes without If-Match or If-Unmodified-Since have nothing to
+    # compare the validators with.
+    return any(header in request.META for header in _PRECONDITION_HEADERS)
+
+def _make_etag(request, *parts):
+    # The same resource is rendered differently depending on the query
+    # string (cursor, fields, ...) and the negotiated media type.
+    parts += (request.get_full_path(), request.META.get('HTTP_ACCEPT', ''))
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode())
+
+    return digest.hexdigest()
+
+def detail_condition(model):
+    """
+    Adds ETag/Last-Modified handling to a view of a single instance.
+
+    Both validators come from the instance's ``updated_at``, fetched with
+    one single-column query, so an unchanged resource is answered with a
+    304 before it is loaded and serialized. Requests with ``expand`` get
+    no validators, and writes only get them, at the cost of the query,
+    when they send If-Match or If-Unmodified-Since.
+    """
+    def get_updated_at(request, pk):
+        if _is_expanded(request):
+            return None
+        if (request.method not in _SAFE_METHODS and
+                not _has_preconditions(request)):
+            return None
+
+        return _get_cached(
+            request,
+            '_courses_updated_at',
+            [cache.get_instance_tag(model, pk)],
+            lambda: model.objects.filter(pk=pk)
+                                 .values_list('updated_at', flat=True)
+                                 .first()
+        )
+
+    def get_etag(request, pk):
+        updated_at = get_updated_at(request, pk)
+        if updated_at is None:
+            return None
+
+        return _make_etag(request, model.__name__, pk, updated_at.isoformat())
+
+    return condition(etag_func=get_etag, last_modified_func=get_updated_at)
+
+def list_condition(model):
+    """
+    Adds ETag handling to a view of a whole collection.
+
+    The ETag is derived from ``MAX(updated_at)`` and ``COUNT(*)`` in one
+    aggregate query, so checking an unchanged collection never renders
+    it. No Last-Modified is sent: deleting a row does not move
+    ``MAX(updated_at)``, so If-Modified-Since would miss deletions.
+    Requests with ``expand`` get no ETag.
+    """
+    def get_etag(request):
+        if request.method not in _SAFE_METHODS or _is_expanded(request):
+            return None
+
+        state = _get_cached(
+            request,
+            '_courses_list_state',
+            [cache.get_collection_tag(model)],
+            lambda: model.objects.aggregate(count=Count('id'),
+                                            last_modified=Max('updated_at'))
+        )
+        last_modified = state['last_modified']
+
+        return _make_etag(request,
+                          model.__name__,
+                          state['count'],
+                          last_modified.isoformat() if last_modified else '')
+
+    return condition(etag_func=get_etag)
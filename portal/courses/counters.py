@@ -0,0 +1,155 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef
+from django.db.models import Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Course, Enrollment
+from .signals import invalidate_courses
+
+
+# The deletion in progress in enrollment_cascade(), if any.
+_cascade = ContextVar('courses_enrollment_cascade', default=None)
+
+
+def change_enrollment_counts(deltas):
+    """
+    Adds ``deltas`` (number of enrollments by course pk) to the courses'
+    ``enrollment_count`` in one ``UPDATE``.
+
+    The counts are changed relative to their current value with ``F()``,
+    so concurrent changes are not lost. ``updated_at`` moves as well, as
+    the count is part of the course representation.
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    delta = Case(*[When(pk=pk, then=Value(delta))
+                   for pk, delta in deltas.items()],
+                 default=Value(0),
+                 output_field=IntegerField())
+    Course.objects.filter(pk__in=deltas) \
+                  .update(enrollment_count=F('enrollment_count') + delta,
+                          updated_at=timezone.now())
+    invalidate_courses(list(deltas))
+
+def _build_reconcile_sql():
+    quote = connection.ops.quote_name
+    course = Course._meta
+    enrollment = Enrollment._meta
+
+    return (
+        'UPDATE %(course)s AS c '
+        'SET %(count)s = counts.count, %(updated_at)s = %%s '
+        'FROM (SELECT cc.%(pk)s AS id, COUNT(e.%(enrollment_pk)s) AS count '
+        'FROM %(course)s AS cc LEFT JOIN %(enrollment)s AS e '
+        'ON e.%(course_fk)s = cc.%(pk)s GROUP BY cc.%(pk)s) AS counts '
+        'WHERE c.%(pk)s = counts.id AND c.%(count)s <> counts.count '
+        'RETURNING c.%(pk)s'
+    ) % {
+        'course': quote(course.db_table),
+        'pk': quote(course.pk.column),
+        'count': quote(course.get_field('enrollment_count').column),
+        'updated_at': quote(course.get_field('updated_at').column),
+        'enrollment': quote(enrollment.db_table),
+        'enrollment_pk': quote(enrollment.pk.column),
+        'course_fk': quote(enrollment.get_field('course').column),
+    }
+
+def reconcile_enrollment_counts():
+    """
+    Recomputes ``enrollment_count`` from the enrollments, fixing drift
+    left by writes that bypass the model signals (``QuerySet.update()``,
+    raw SQL, ...), and returns the pks of the courses that were fixed.
+
+    On PostgreSQL this is a single ``UPDATE ... FROM (SELECT ... GROUP
+    BY)``; other databases select the drifted courses and update them
+    with a correlated subquery.
+    """
+    now = timezone.now()
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(_build_reconcile_sql(), [now])
+            pks = [pk for pk, in cursor.fetchall()]
+    else:
+        actual = Coalesce(
+            Subquery(Enrollment.objects.filter(course=OuterRef('pk'))
+                                       .values('course')
+                                       .annotate(count=Count('id'))
+                                       .values('count')),
+            0
+        )
+        drifted = Course.objects.exclude(enrollment_count=actual)
+        pks = list(drifted.values_list('pk', flat=True))
+        drifted.update(enrollment_count=actual, updated_at=now)
+    invalidate_courses(pks)
+
+    return pks
+
+@receiver(post_save, sender=Enrollment)
+def count_saved_enrollment(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    deltas = Counter()
+    if created:
+        deltas[instance.course_id] += 1
+    else:
+        previous_relations = getattr(instance, '_previous_relations', None)
+        if previous_relations is not None:
+            deltas[previous_relations[0]] -= 1
+            deltas[instance.course_id] += 1
+    change_enrollment_counts(deltas)
+
+@receiver(post_delete, sender=Enrollment)
+def count_deleted_enrollment(sender, instance, **kwargs):
+    cascade = _cascade.get()
+    if cascade is None:
+        change_enrollment_counts({instance.course_id: -1})
+    elif instance.course_id not in cascade.courses:
+        cascade.deltas[instance.course_id] -= 1
+
+@receiver(pre_delete, sender=Course)
+def skip_deleted_course(sender, instance, **kwargs):
+    # Django sends every pre_delete signal of a deletion before the
+    # post_delete signals, so the enrollments of a course being deleted
+    # leave its count alone.
+    cascade = _cascade.get()
+    if cascade is not None:
+        cascade.courses.add(instance.pk)
+
+
+class _Cascade:
+
+    def __init__(self):
+        self.courses = set()
+        self.deltas = Counter()
+
+
+@contextmanager
+def enrollment_cascade():
+    """
+    Buffers the count changes of the enrollments deleted within, such as
+    those a deleted student or course takes along one signal at a time,
+    and applies them in one ``UPDATE`` once the deletion succeeded.
+
+    Used by the ``delete()`` methods of the models that enrollments
+    cascade from. The cascade ends with the block, even if it fails.
+    """
+    if _cascade.get() is not None:
+        yield
+        return
+
+    cascade = _Cascade()
+    with transaction.atomic(savepoint=False):
+        token = _cascade.set(cascade)
+        try:
+            yield
+        finally:
+            _cascade.reset(token)
+        change_enrollment_counts(cascade.deltas)
@@ -0,0 +1,52 @@
+import csv
+import io
+
+
+# NULL marker used in the CSV fed to COPY, so that NULL and '' stay distinct.
+COPY_NULL = '\\N'
+
+
+def iter_chunks(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _encode_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerows([COPY_NULL if value is None else value for value in row]
+                     for row in rows)
+
+    return buffer.getvalue()
+
+
+class CopyStream:
+    """
+    File-like object that feeds chunks of rows to ``COPY FROM STDIN``.
+
+    Only one chunk is encoded at a time, so memory use follows the chunk
+    size rather than the size of the input file.
+    """
+
+    def __init__(self, chunks, on_chunk=None):
+        self._chunks = chunks
+        self._on_chunk = on_chunk
+        self._buffer = io.StringIO()
+
+    def read(self, size=-1):
+        data = self._buffer.read(size)
+        while not data:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return ''
+            if self._on_chunk is not None:
+                self._on_chunk(chunk)
+            self._buffer = io.StringIO(_encode_csv(chunk))
+            data = self._buffer.read(size)
+
+        return data
@@ -0,0 +1,183 @@
+from collections import deque
+import os
+import threading
+import time
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of at most ``max_size`` DB-API connections.
+
+    ``connect()`` opens a new connection. ``acquire()`` returns an idle
+    connection, most recently released first so that rarely needed ones
+    stay idle, opens one if the pool is not full, or else waits up to
+    ``timeout`` seconds for a release. ``release()`` rolls back what the
+    connection left open and keeps it, unless it is broken.
+    """
+
+    def __init__(self, connect, max_size=10, timeout=30.0):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self._condition = threading.Condition()
+        self._closed = False
+        self._idle = deque()
+        self._size = 0
+        self._waiting = 0
+        self._requests = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+
+    def acquire(self):
+        """
+        Returns a ``(connection, reused)`` pair, where ``reused`` tells
+        whether the connection was idle in the pool.
+        """
+        started_at = time.monotonic()
+        waited = False
+        with self._condition:
+            self._requests += 1
+            try:
+                while True:
+                    if self._idle:
+                        return self._idle.pop(), True
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    remaining = self.timeout - (time.monotonic() - started_at)
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            'No connection was released within %s seconds '
+                            '(%d in use).' % (self.timeout, self._size)
+                        )
+                    waited = True
+                    self._waiting += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+            finally:
+                if waited:
+                    wait_time = time.monotonic() - started_at
+                    self._waits += 1
+                    self._wait_time += wait_time
+                    self._max_wait_time = max(self._max_wait_time,
+                                              wait_time)
+
+        try:
+            connection = self._connect()
+        except BaseException:
+            self._forget()
+            raise
+        with self._condition:
+            self._created += 1
+
+        return connection, False
+
+    def release(self, connection):
+        try:
+            if connection.closed:
+                self._forget()
+                return
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+
+        with self._condition:
+            if not self._closed:
+                self._idle.append(connection)
+                self._condition.notify()
+                return
+        self.discard(connection)
+
+    def discard(self, connection):
+        """
+        Closes a checked out connection instead of releasing it.
+        """
+        try:
+            connection.close()
+        finally:
+            self._forget()
+
+    def close(self):
+        """
+        Closes the idle connections. Connections in use are closed when
+        they are released.
+        """
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._closed = True
+        for connection in idle:
+            self.discard(connection)
+
+    def _forget(self):
+        with self._condition:
+            self._size -= 1
+            self._discarded += 1
+            self._condition.notify()
+
+    def get_stats(self):
+        with self._condition:
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._size - len(self._idle),
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'requests': self._requests,
+                'waits': self._waits,
+                'wait_time': self._wait_time,
+                'max_wait_time': self._max_wait_time,
+                'timeouts': self._timeouts,
+                'connections_created': self._created,
+                'connections_discarded': self._discarded,
+            }
+
+
+def get_pool(alias, key, connect, **options):
+    """
+    Returns the process' pool for a database alias and its connection
+    parameters (``key``), creating it with ``options`` if needed.
+
+    A forked worker does not reuse the pool, or the sockets, it inherited
+    from its parent.
+    """
+    with _pools_lock:
+        pid, pool = _pools.get((alias, key), (None, None))
+        if pid != os.getpid():
+            pool = ConnectionPool(connect, **options)
+            _pools[(alias, key)] = (os.getpid(), pool)
+
+    return pool
+
+def close_pool(alias, key):
+    with _pools_lock:
+        pid, pool = _pools.pop((alias, key), (None, None))
+    if pid == os.getpid():
+        pool.close()
+
+def get_pool_stats():
+    """
+    Returns the statistics of each pool of this process by database alias.
+    """
+    with _pools_lock:
+        pools = [(alias, pool)
+                 for (alias, _), (pid, pool) in _pools.items()
+                 if pid == os.getpid()]
+
+    return {alias: pool.get_stats() for alias, pool in pools}
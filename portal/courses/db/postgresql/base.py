@@ -0,0 +1,148 @@
+"""
+The PostgreSQL backend with connection health checks and an optional
+connection pool, as Django 4.1 and 5.1 added them upstream:
+
+    DATABASES['default'] = {
+        'ENGINE': 'courses.db.postgresql',
+        ...
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+``CONN_HEALTH_CHECKS`` runs ``SELECT 1`` before the first query of a
+request that reuses a connection, and reconnects if the connection broke
+while idle. ``OPTIONS['pool']`` (``True`` or ``{'max_size': 10,
+'timeout': 30}``) shares up to ``max_size`` connections between the
+threads of a process, which then return their connection to the pool at
+the end of each request; it requires ``CONN_MAX_AGE`` 0.
+"""
+
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+from ..pool import PoolTimeout, close_pool, get_pool
+from .creation import DatabaseCreation
+
+
+Database = base.Database
+
+
+def _get_pool_key(conn_params):
+    return repr(sorted(conn_params.items()))
+
+def _connect(conn_params, isolation_level):
+    # As base.DatabaseWrapper.get_new_connection(), without touching the
+    # wrapper of the thread that happens to open the connection.
+    connection = Database.connect(**conn_params)
+    if (isolation_level is not None and
+            isolation_level != connection.isolation_level):
+        connection.set_session(isolation_level=isolation_level)
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection,
+                                           loads=lambda x: x)
+
+    return connection
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_enabled = \
+            self.settings_dict.get('CONN_HEALTH_CHECKS', False)
+        self.health_check_done = False
+        self._pool = None
+        self._reused_connection = False
+
+    def _get_pool_options(self):
+        # Creating and dropping the test database must not keep
+        # connections to the 'postgres' database around.
+        options = self.settings_dict['OPTIONS'].get('pool')
+        if not options or self.alias == NO_DB_ALIAS:
+            return None
+
+        return {} if options is True else dict(options)
+
+    def check_settings(self):
+        super().check_settings()
+        if (self._get_pool_options() is not None and
+                self.settings_dict['CONN_MAX_AGE'] != 0):
+            raise ImproperlyConfigured(
+                "Pooled connections are returned to the pool at the end of "
+                "each request. Set CONN_MAX_AGE to 0 to use "
+                "OPTIONS['pool']."
+            )
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        options = self._get_pool_options()
+        if options is None:
+            self._pool = None
+            self._reused_connection = False
+            return super().get_new_connection(conn_params)
+
+        isolation_level = \
+            self.settings_dict['OPTIONS'].get('isolation_level')
+        self._pool = get_pool(self.alias,
+                              _get_pool_key(conn_params),
+                              lambda: _connect(conn_params, isolation_level),
+                              **options)
+        try:
+            connection, self._reused_connection = self._pool.acquire()
+        except PoolTimeout as e:
+            raise Database.OperationalError(str(e)) from e
+        self.isolation_level = connection.isolation_level
+
+        return connection
+
+    def connect(self):
+        super().connect()
+        # A new connection needs no check; a pooled one may have been idle
+        # for a long time.
+        self.health_check_done = not self._reused_connection
+
+    def _close(self):
+        if self._pool is None:
+            return super()._close()
+
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps the connection until the atomic block exits,
+                # so it must not be handed out again.
+                self._pool.discard(self.connection)
+            else:
+                self._pool.release(self.connection)
+
+    def close_pool(self):
+        """
+        Closes this thread's connection and the idle connections of the
+        pool it came from.
+        """
+        self.close()
+        close_pool(self.alias, _get_pool_key(self.get_connection_params()))
+
+    def close_if_unusable_or_obsolete(self):
+        super().close_if_unusable_or_obsolete()
+        # Runs when a request starts and finishes.
+        self.health_check_done = False
+
+    def close_if_health_check_failed(self):
+        if (self.connection is None or
+                not self.health_check_enabled or
+                self.health_check_done):
+            return
+
+        if not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _cursor(self, name=None):
+        self.close_if_health_check_failed()
+
+        return super()._cursor(name)
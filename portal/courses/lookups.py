@@ -0,0 +1,24 @@
+from django.db.models.lookups import IContains
+
+
+class TrigramContains(IContains):
+    """
+    Case-insensitive substring match that a pg_trgm GIN index can serve.
+
+    On PostgreSQL the built-in ``icontains`` compiles to
+    ``UPPER(column::text) LIKE UPPER(pattern)``, which an index on the bare
+    column cannot answer, so this lookup emits ``column ILIKE pattern``
+    instead. Other backends fall back to ``icontains``.
+    """
+
+    lookup_name = 'trigram_contains'
+
+    def as_sql(self, compiler, connection):
+        if connection.vendor != 'postgresql':
+            return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        params.extend(rhs_params)
+
+        return '%s ILIKE %s' % (lhs_sql, rhs_sql), params
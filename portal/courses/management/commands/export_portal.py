@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from django.core.management.base import BaseCommand
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from ..tables import ENROLLMENT_DETAILS_COLUMNS, PORTAL_TABLES
+from .import_portal import Progress
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+ENROLLMENT_DETAILS = 'enrollment-details'
+
+
+def _get_export_query(table):
+    """
+    Returns the ``(headers, queryset)`` pair to export for a table.
+
+    The queryset yields tuples through ``values_list()``, so no model
+    instances are built while exporting.
+    """
+    if table == ENROLLMENT_DETAILS:
+        model = PORTAL_TABLES['enrollments'][0]
+        headers = [header for header, _ in ENROLLMENT_DETAILS_COLUMNS]
+        lookups = [lookup for _, lookup in ENROLLMENT_DETAILS_COLUMNS]
+    else:
+        model, columns = PORTAL_TABLES[table]
+        headers = ['id'] + list(columns) + ['created_at', 'updated_at']
+        lookups = headers
+    queryset = model.objects.order_by('id').values_list(*lookups)
+
+    return headers, queryset
+
+def _format_csv_value(value):
+    if value is None:
+        return ''
+    elif hasattr(value, 'isoformat'):
+        return value.isoformat()
+
+    return value
+
+
+class _OutputStream(io.TextIOBase):
+    """
+    Text stream over the command's stdout.
+
+    ``OutputWrapper.write()`` appends a line ending to every call, which
+    would corrupt data written in arbitrary pieces by ``COPY TO STDOUT``.
+    """
+
+    def __init__(self, output):
+        self._output = output
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._output.write(data, ending='')
+
+        return len(data)
+
+
+class Command(BaseCommand):
+    help = ('Exports students, teachers, courses, enrollments or '
+            'denormalized enrollment details to CSV or NDJSON. Uses COPY on '
+            'PostgreSQL for CSV and a server-side cursor otherwise.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'table',
+            choices=sorted(PORTAL_TABLES) + [ENROLLMENT_DETAILS]
+        )
+        parser.add_argument('--format',
+                            choices=('csv', 'ndjson'),
+                            default='csv')
+        parser.add_argument('--output',
+                            default='-',
+                            help="Output file, or '-' for stdout (default).")
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        headers, queryset = _get_export_query(options['table'])
+        if options['output'] == '-':
+            output = _OutputStream(self.stdout)
+        else:
+            output = open(options['output'], 'w', newline='', encoding='utf-8')
+        progress = Progress(self.stderr)
+        try:
+            if options['format'] == 'csv':
+                csv.writer(output, lineterminator='\n').writerow(headers)
+                if connection.vendor == 'postgresql':
+                    self._copy(queryset, output)
+                else:
+                    self._write_csv(queryset,
+                                    output,
+                                    options['chunk_size'],
+                                    progress)
+            else:
+                self._write_ndjson(headers,
+                                   queryset,
+                                   output,
+                                   options['chunk_size'],
+                                   progress)
+        finally:
+            if options['output'] != '-':
+                output.close()
+
+        self.stderr.write('Exported %s in %.1fs' % (options['table'],
+                                                    progress.elapsed))
+
+    def _iter_chunks(self, queryset, chunk_size, progress):
+        # iterator() reads through a named server-side cursor on PostgreSQL.
+        chunk = []
+        for row in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                yield chunk
+                progress.add(len(chunk))
+                chunk = []
+        if chunk:
+            yield chunk
+            progress.add(len(chunk))
+
+    def _copy(self, queryset, output):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            # COPY does not take query parameters, so inline them.
+            query = cursor.mogrify(sql, params).decode()
+            cursor.copy_expert('COPY (%s) TO STDOUT WITH (FORMAT csv)' % query,
+                               output)
+
+    def _write_csv(self, queryset, output, chunk_size, progress):
+        writer = csv.writer(output, lineterminator='\n')
+        for chunk in self._iter_chunks(queryset, chunk_size, progress):
+            writer.writerows([_format_csv_value(value) for value in row]
+                             for row in chunk)
+
+    def _write_ndjson(self, headers, queryset, output, chunk_size, progress):
+        encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for chunk in self._iter_chunks(queryset, chunk_size, progress):
+            output.write(''.join(
+                encoder.encode(dict(zip(headers, row))) + '\n'
+                for row in chunk
+            ))
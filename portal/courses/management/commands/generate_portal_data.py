@@ -0,0 +1,231 @@
+from datetime import date, timedelta
+from itertools import accumulate
+import random
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from ... import cache
+from ...counters import reconcile_enrollment_counts
+from ...db.copy import COPY_NULL, CopyStream, iter_chunks
+from ...models import Course, Enrollment, Student, Teacher
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+FIRST_NAMES = (
+    'Aiden', 'Amara', 'Ana', 'Arjun', 'Ava', 'Benjamin', 'Carlos', 'Chen',
+    'Chloe', 'Daniel', 'Elena', 'Emma', 'Ethan', 'Fatima', 'Gabriel',
+    'Grace', 'Hannah', 'Hiro', 'Isabella', 'Ivan', 'Jacob', 'Jamal', 'Julia',
+    'Kai', 'Layla', 'Leo', 'Liam', 'Lucas', 'Maya', 'Mei', 'Mia', 'Noah',
+    'Nora', 'Olivia', 'Omar', 'Priya', 'Rosa', 'Sofia', 'Yusuf', 'Zoe',
+)
+
+LAST_NAMES = (
+    'Ahmed', 'Anderson', 'Brown', 'Chen', 'Costa', 'Davis', 'Dubois',
+    'Fernandez', 'Garcia', 'Gupta', 'Hansen', 'Ito', 'Johnson', 'Kim',
+    'Kowalski', 'Lee', 'Lopez', 'Martin', 'Miller', 'Moore', 'Muller',
+    'Nguyen', 'Novak', 'Okafor', 'Patel', 'Perez', 'Rossi', 'Santos',
+    'Schmidt', 'Silva', 'Singh', 'Smith', 'Suzuki', 'Taylor', 'Thomas',
+    'Wang', 'Williams', 'Wilson', 'Yamamoto', 'Zhang',
+)
+
+SUBJECTS = (
+    'Algebra', 'Anatomy', 'Anthropology', 'Architecture', 'Art',
+    'Astronomy', 'Biology', 'Calculus', 'Chemistry', 'Databases',
+    'Economics', 'Ethics', 'Finance', 'Genetics', 'Geography', 'Geology',
+    'History', 'Linguistics', 'Literature', 'Logic', 'Music', 'Networks',
+    'Philosophy', 'Physics', 'Programming', 'Psychology', 'Sociology',
+    'Statistics',
+)
+
+LEVELS = (
+    'Introduction to', 'Foundations of', 'Topics in', 'Advanced',
+    'Seminar in',
+)
+
+GRADES = ('A', 'B', 'C', 'D', 'F', None)
+
+# Cumulative weights of GRADES; None stands for courses not graded yet.
+GRADE_WEIGHTS = tuple(accumulate((25, 30, 20, 8, 5, 12)))
+
+FIRST_TERM = date(2015, 1, 1)
+
+TERMS = 20
+
+
+def _get_next_id(model):
+    return (model.objects.aggregate(Max('id'))['id__max'] or 0) + 1
+
+def _generate_people(rng, first_id, count, domain, now):
+    for person_id in range(first_id, first_id + count):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        email_address = '%s.%s.%d@%s' % (first_name.lower(),
+                                         last_name.lower(),
+                                         person_id,
+                                         domain)
+        yield (person_id, first_name, last_name, email_address, now, now)
+
+def _generate_courses(rng, first_id, count, teacher_ids, now):
+    for course_id in range(first_id, first_id + count):
+        title = '%s %s %d' % (rng.choice(LEVELS),
+                              rng.choice(SUBJECTS),
+                              rng.randrange(100, 500))
+        # Spring and fall terms, starting within two weeks of the 1st.
+        term = rng.randrange(TERMS)
+        start_date = date(FIRST_TERM.year + term // 2,
+                          1 if term % 2 == 0 else 9,
+                          1) + timedelta(days=rng.randrange(14))
+        yield (course_id,
+               title,
+               rng.choice(teacher_ids),
+               connection.ops.adapt_datefield_value(start_date),
+               0,
+               now,
+               now)
+
+def _generate_enrollments(rng, first_id, count, student_ids, course_ids,
+                          now):
+    """
+    Enrolls every student in ``count // len(student_ids)`` (or one more)
+    distinct courses. Courses are picked with a skew towards the first
+    ones, so a few courses have large rosters and most have small ones.
+    """
+    per_student, extra = divmod(count, len(student_ids))
+    enrollment_id = first_id
+    for i, student_id in enumerate(student_ids):
+        size = per_student + (1 if i < extra else 0)
+        if size * 2 > len(course_ids):
+            picked = rng.sample(range(len(course_ids)), size)
+        else:
+            picked = set()
+            while len(picked) < size:
+                picked.add(int(len(course_ids) * rng.random() ** 1.5))
+        grades = rng.choices(GRADES, cum_weights=GRADE_WEIGHTS, k=size)
+        for index, grade in zip(picked, grades):
+            yield (enrollment_id, course_ids[index], student_id, grade,
+                   now, now)
+            enrollment_id += 1
+
+def _insert(model, rows, chunk_size):
+    """
+    Inserts rows holding a value for each concrete field of the model,
+    in order, with COPY on PostgreSQL and executemany() elsewhere.
+    """
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = [quote(field.column) for field in model._meta.concrete_fields]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.copy_expert(
+                "COPY %s (%s) FROM STDIN WITH (FORMAT csv, NULL '%s')"
+                % (table, ', '.join(columns), COPY_NULL),
+                CopyStream(iter_chunks(rows, chunk_size))
+            )
+            return
+
+        sql = 'INSERT INTO %s (%s) VALUES (%s)' % (
+            table,
+            ', '.join(columns),
+            ', '.join(['%s'] * len(columns)),
+        )
+        for chunk in iter_chunks(rows, chunk_size):
+            cursor.executemany(sql, chunk)
+
+
+class Command(BaseCommand):
+    help = ('Generates reproducible synthetic students, teachers, courses '
+            'and enrollments for load testing. Uses COPY on PostgreSQL and '
+            'executemany() elsewhere.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=100000)
+        parser.add_argument('--teachers', type=int, default=5000)
+        parser.add_argument('--courses', type=int, default=20000)
+        parser.add_argument(
+            '--enrollments',
+            type=int,
+            default=2000000,
+            help='Enrollments of the generated students in the generated '
+                 'courses.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        students = options['students']
+        teachers = options['teachers']
+        courses = options['courses']
+        enrollments = options['enrollments']
+        if min(students, teachers, courses, enrollments) < 0:
+            raise CommandError('Counts cannot be negative.')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        if courses and not teachers:
+            raise CommandError('Courses need at least one teacher.')
+        if enrollments > students * courses:
+            raise CommandError('Cannot enroll %d times %d students in %d '
+                               'courses.' % (enrollments, students, courses))
+
+        rng = random.Random(options['seed'])
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        chunk_size = options['chunk_size']
+        started_at = time.monotonic()
+        with transaction.atomic():
+            student_id = _get_next_id(Student)
+            self._insert(Student,
+                         _generate_people(rng, student_id, students,
+                                          'students.example.edu', now),
+                         chunk_size)
+            teacher_id = _get_next_id(Teacher)
+            self._insert(Teacher,
+                         _generate_people(rng, teacher_id, teachers,
+                                          'faculty.example.edu', now),
+                         chunk_size)
+            course_id = _get_next_id(Course)
+            teacher_ids = range(teacher_id, teacher_id + teachers)
+            self._insert(Course,
+                         _generate_courses(rng, course_id, courses,
+                                           teacher_ids, now),
+                         chunk_size)
+            if enrollments:
+                self._insert(
+                    Enrollment,
+                    _generate_enrollments(
+                        rng,
+                        _get_next_id(Enrollment),
+                        enrollments,
+                        range(student_id, student_id + students),
+                        range(course_id, course_id + courses),
+                        now
+                    ),
+                    chunk_size
+                )
+
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(
+                        no_style(), [Student, Teacher, Course, Enrollment]):
+                    cursor.execute(sql)
+            # Neither COPY nor executemany() sends model signals.
+            reconcile_enrollment_counts()
+            cache.invalidate_all()
+
+        self.stdout.write(self.style.SUCCESS(
+            'Generated %d students, %d teachers, %d courses and %d '
+            'enrollments in %.1fs' % (students,
+                                      teachers,
+                                      courses,
+                                      enrollments,
+                                      time.monotonic() - started_at)
+        ))
+
+    def _insert(self, model, rows, chunk_size):
+        started_at = time.monotonic()
+        _insert(model, rows, chunk_size)
+        self.stdout.write('%s: %.1fs' % (model._meta.verbose_name_plural,
+                                         time.monotonic() - started_at))
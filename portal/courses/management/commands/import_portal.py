@@ -0,0 +1,284 @@
+import csv
+import json
+import sys
+import time
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from ... import cache
+from ...bulk import get_existing_pks
+from ...counters import reconcile_enrollment_counts
+from ...db.copy import COPY_NULL, CopyStream, iter_chunks
+from ...models import Enrollment
+from ..tables import PORTAL_TABLES
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+STAGING_TABLE = 'courses_import_staging'
+
+
+def _read_csv_rows(stream, columns):
+    reader = csv.DictReader(stream)
+    missing = [c for c in columns if c not in (reader.fieldnames or ())]
+    if missing:
+        raise CommandError('Missing CSV columns: %s' % ', '.join(missing))
+
+    for row in reader:
+        yield row
+
+def _read_ndjson_rows(stream, columns):
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            raise CommandError('Line %d: %s' % (number, e))
+        if not isinstance(row, dict):
+            raise CommandError('Line %d: expected a JSON object.' % number)
+        yield row
+
+_READERS = {
+    'csv': _read_csv_rows,
+    'ndjson': _read_ndjson_rows,
+}
+
+def _to_values(rows, model, columns):
+    # An empty CSV cell means NULL unless the column is a non-null string.
+    keeps_empty = [
+        not field.null and field.get_internal_type() in ('CharField',
+                                                         'TextField')
+        for field in (model._meta.get_field(c) for c in columns)
+    ]
+    for row in rows:
+        values = []
+        for column, keep_empty in zip(columns, keeps_empty):
+            value = row.get(column)
+            if value == '' and not keep_empty:
+                value = None
+            values.append(value)
+        yield values
+
+def _build_insert_sql(model, columns, staging_table):
+    """
+    Builds the statement that moves staged rows into the model's table.
+
+    Foreign keys are resolved by joining the staging table against the
+    referenced tables, so rows pointing at missing ids are dropped in the
+    same statement. Timestamps and defaults of columns missing from the
+    file are filled in by the database, and rows violating a unique
+    constraint, such as a second enrollment of a student in a course, are
+    skipped.
+    """
+    quote = connection.ops.quote_name
+    target_columns = []
+    values = []
+    joins = []
+    params = []
+    for column in columns:
+        field = model._meta.get_field(column)
+        source = 's.%s' % quote(column)
+        if field.is_relation:
+            related_meta = field.related_model._meta
+            alias = quote('r_%s' % column)
+            joins.append('JOIN %s AS %s ON %s.%s = CAST(%s AS %s)' % (
+                quote(related_meta.db_table),
+                alias,
+                alias,
+                quote(related_meta.pk.column),
+                source,
+                field.rel_db_type(connection),
+            ))
+            value = '%s.%s' % (alias, quote(related_meta.pk.column))
+        elif field.get_internal_type() in ('CharField', 'TextField'):
+            value = source
+        else:
+            value = 'CAST(%s AS %s)' % (source, field.rel_db_type(connection))
+        target_columns.append(quote(field.column))
+        values.append(value)
+
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.name in columns:
+            continue
+        if (getattr(field, 'auto_now', False) or
+                getattr(field, 'auto_now_add', False)):
+            value = 'CURRENT_TIMESTAMP'
+        elif field.has_default():
+            value = '%s'
+            params.append(field.get_db_prep_save(field.get_default(),
+                                                 connection))
+        else:
+            continue
+        target_columns.append(quote(field.column))
+        values.append(value)
+
+    sql = ('INSERT INTO %s (%s) SELECT %s FROM %s AS s %s '
+           'ON CONFLICT DO NOTHING') % (
+        quote(model._meta.db_table),
+        ', '.join(target_columns),
+        ', '.join(values),
+        quote(staging_table),
+        ' '.join(joins),
+    )
+
+    return sql, params
+
+
+class Progress:
+
+    def __init__(self, stdout):
+        self._stdout = stdout
+        self._started_at = time.monotonic()
+        self.rows = 0
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self._started_at
+
+    @property
+    def rate(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def add(self, count):
+        self.rows += count
+        self._stdout.write('%d rows read (%.0f rows/sec)'
+                           % (self.rows, self.rate))
+
+
+class Command(BaseCommand):
+    help = ('Imports students, teachers, courses or enrollments from a CSV '
+            'or NDJSON file. Uses COPY on PostgreSQL and chunked '
+            'bulk_create elsewhere.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=sorted(PORTAL_TABLES))
+        parser.add_argument('path', help="Input file, or '-' for stdin.")
+        parser.add_argument(
+            '--format',
+            choices=sorted(_READERS),
+            help='Input format; guessed from the file extension by default.'
+        )
+        parser.add_argument('--chunk-size',
+                            type=int,
+                            default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--with-ids',
+            action='store_true',
+            help='Keep the ids given in an "id" column of the input.'
+        )
+
+    def handle(self, *args, **options):
+        model, columns = PORTAL_TABLES[options['table']]
+        if options['with_ids']:
+            columns = ('id', ) + columns
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive.')
+        input_format = options['format'] or self._guess_format(options['path'])
+
+        if options['path'] == '-':
+            stream = sys.stdin
+        else:
+            stream = open(options['path'], newline='', encoding='utf-8')
+        try:
+            rows = _READERS[input_format](stream, columns)
+            chunks = iter_chunks(_to_values(rows, model, columns),
+                                  options['chunk_size'])
+            progress = Progress(self.stdout)
+            with transaction.atomic():
+                if connection.vendor == 'postgresql':
+                    inserted = self._copy(model, columns, chunks, progress)
+                else:
+                    inserted = self._bulk_create(model,
+                                                 columns,
+                                                 chunks,
+                                                 progress)
+                if options['with_ids']:
+                    self._reset_sequence(model)
+                # Neither COPY nor bulk_create() sends model signals.
+                if model is Enrollment:
+                    reconcile_enrollment_counts()
+                cache.invalidate_all()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            'Imported %d %s (%d skipped) in %.1fs (%.0f rows/sec)' % (
+                inserted,
+                options['table'],
+                progress.rows - inserted,
+                progress.elapsed,
+                progress.rate,
+            )
+        ))
+
+    def _guess_format(self, path):
+        if path.endswith('.csv'):
+            return 'csv'
+        elif path.endswith(('.ndjson', '.jsonl')):
+            return 'ndjson'
+
+        raise CommandError('Cannot guess the format of %r; use --format.'
+                           % path)
+
+    def _copy(self, model, columns, chunks, progress):
+        quote = connection.ops.quote_name
+        column_list = ', '.join(quote(c) for c in columns)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TEMPORARY TABLE %s (%s) ON COMMIT DROP' % (
+                    quote(STAGING_TABLE),
+                    ', '.join('%s text' % quote(c) for c in columns),
+                )
+            )
+            stream = CopyStream(chunks, lambda chunk: progress.add(len(chunk)))
+            cursor.copy_expert(
+                "COPY %s (%s) FROM STDIN WITH (FORMAT csv, NULL '%s')"
+                % (quote(STAGING_TABLE), column_list, COPY_NULL),
+                stream
+            )
+            sql, params = _build_insert_sql(model, columns, STAGING_TABLE)
+            cursor.execute(sql, params)
+
+            return cursor.rowcount
+
+    def _bulk_create(self, model, columns, chunks, progress):
+        fields = [model._meta.get_field(c) for c in columns]
+        relations = [(i, field) for i, field in enumerate(fields)
+                     if field.is_relation]
+        count_before = model.objects.count()
+        for chunk in chunks:
+            try:
+                chunk = [[field.to_python(value)
+                          for field, value in zip(fields, values)]
+                         for values in chunk]
+            except ValidationError as e:
+                raise CommandError('Rows %d-%d: %s' % (
+                    progress.rows + 1,
+                    progress.rows + len(chunk),
+                    '; '.join(e.messages),
+                ))
+            existing = {
+                i: get_existing_pks(field.related_model,
+                                    {values[i] for values in chunk})
+                for i, field in relations
+            }
+            instances = [
+                model(**{field.attname: value
+                         for field, value in zip(fields, values)})
+                for values in chunk
+                if all(values[i] in existing[i] for i, _ in relations)
+            ]
+            # Rows violating a unique constraint are skipped, as on COPY.
+            model.objects.bulk_create(instances, ignore_conflicts=True)
+            progress.add(len(chunk))
+
+        return model.objects.count() - count_before
+
+    def _reset_sequence(self, model):
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(sql)
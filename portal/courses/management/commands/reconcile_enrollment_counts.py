@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...counters import reconcile_enrollment_counts
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the enrollment count of every course from the '
+            'enrollments. Uses a single UPDATE ... FROM on PostgreSQL.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            pks = reconcile_enrollment_counts()
+
+        self.stdout.write(self.style.SUCCESS(
+            'Fixed the enrollment count of %d courses' % len(pks)
+        ))
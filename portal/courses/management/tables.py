@@ -0,0 +1,27 @@
+from ..models import Course, Enrollment, Student, Teacher
+
+
+# Tables handled by the bulk import/export commands, with the columns read
+# from or written to files. Foreign key columns hold the referenced id.
+PORTAL_TABLES = {
+    'students': (Student, ('first_name', 'last_name', 'email_address')),
+    'teachers': (Teacher, ('first_name', 'last_name', 'email_address')),
+    'courses': (Course, ('title', 'teacher', 'start_date')),
+    'enrollments': (Enrollment, ('course', 'student', 'grade')),
+}
+
+# Denormalized enrollment view for exports: (column header, ORM lookup).
+ENROLLMENT_DETAILS_COLUMNS = (
+    ('id', 'id'),
+    ('grade', 'grade'),
+    ('course', 'course'),
+    ('course_title', 'course__title'),
+    ('course_start_date', 'course__start_date'),
+    ('teacher', 'course__teacher'),
+    ('student', 'student'),
+    ('student_first_name', 'student__first_name'),
+    ('student_last_name', 'student__last_name'),
+    ('student_email_address', 'student__email_address'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
@@ -0,0 +1,261 @@
+import asyncio
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+import threading
+import time
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from .db.pool import get_pool_stats
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Other methods share one label, so clients cannot add label values.
+_METHODS = {'GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+_POOL_GAUGES = (
+    ('size', 'Connections opened by the pool.'),
+    ('in_use', 'Connections checked out of the pool.'),
+    ('idle', 'Connections waiting in the pool.'),
+    ('waiting', 'Threads waiting for a connection.'),
+)
+
+_POOL_COUNTERS = (
+    ('waits', 'Connection requests that had to wait.'),
+    ('wait_time', 'Seconds spent waiting for a connection.'),
+    ('timeouts', 'Connection requests that timed out.'),
+)
+
+# The statistics of the request being served, set by MetricsMiddleware.
+# The object is shared with the threads the async views run in.
+_request_stats = ContextVar('courses_metrics_stats', default=None)
+
+
+def is_enabled():
+    return getattr(settings, 'COURSES_METRICS_ENABLED', True)
+
+
+class _RequestStats:
+    __slots__ = ('queries', 'query_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.query_time = 0.0
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.query_time += time.perf_counter() - started_at
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    # A permanent connection.execute_wrapper(): connections are per
+    # thread, and the async views query from threads of their own. It
+    # goes first, as connection.execute_wrapper() blocks entered before
+    # the connection was opened pop the last wrapper when they exit.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+class _Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+def _format_labels(labels):
+    return ','.join('%s="%s"' % (name, str(value).replace('\\', r'\\')
+                                                 .replace('"', r'\"')
+                                                 .replace('\n', r'\n'))
+                    for name, value in labels)
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _render_family(lines, name, kind, help_text, samples):
+    lines.append('# HELP %s %s' % (name, help_text))
+    lines.append('# TYPE %s %s' % (name, kind))
+    for suffix, labels, value in samples:
+        lines.append('%s%s{%s} %s' % (name,
+                                      suffix,
+                                      _format_labels(labels),
+                                      _format_value(value)))
+
+def _get_histogram_samples(histograms):
+    for labels, histogram in sorted(histograms.items()):
+        labels = list(zip(('view', 'method'), labels))
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + ('+Inf',),
+                                histogram.counts):
+            cumulative += count
+            yield '_bucket', labels + [('le', bound)], cumulative
+        yield '_sum', labels, histogram.sum
+        yield '_count', labels, cumulative
+
+def _get_counter_samples(counter, names=('view', 'method')):
+    for labels, value in sorted(counter.items()):
+        yield '', list(zip(names, labels)), value
+
+
+class Metrics:
+    """
+    The request metrics of this process, by URL name and method.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = Counter()
+            self._latency = {}
+            self._queries = {}
+            self._query_time = Counter()
+            self._response_bytes = Counter()
+
+    def observe(self, view, method, status, latency, queries, query_time,
+                response_bytes):
+        key = (view, method)
+        with self._lock:
+            self._requests[(view, method, str(status))] += 1
+            if key not in self._latency:
+                self._latency[key] = _Histogram(LATENCY_BUCKETS)
+                self._queries[key] = _Histogram(QUERY_COUNT_BUCKETS)
+            self._latency[key].observe(latency)
+            self._queries[key].observe(queries)
+            self._query_time[key] += query_time
+            self._response_bytes[key] += response_bytes
+
+    def render(self):
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self._lock:
+            _render_family(
+                lines, 'courses_http_requests_total', 'counter',
+                'Requests served, by view, method and status.',
+                _get_counter_samples(self._requests,
+                                     ('view', 'method', 'status'))
+            )
+            _render_family(
+                lines, 'courses_http_request_duration_seconds', 'histogram',
+                'Time until the response was returned to the server.',
+                _get_histogram_samples(self._latency)
+            )
+            _render_family(
+                lines, 'courses_http_request_db_queries', 'histogram',
+                'Database queries per request.',
+                _get_histogram_samples(self._queries)
+            )
+            _render_family(
+                lines, 'courses_http_request_db_seconds_total', 'counter',
+                'Seconds spent executing database queries.',
+                _get_counter_samples(self._query_time)
+            )
+            _render_family(
+                lines, 'courses_http_response_bytes_total', 'counter',
+                'Bytes of non-streamed response bodies.',
+                _get_counter_samples(self._response_bytes)
+            )
+
+        pool_stats = sorted(get_pool_stats().items())
+        for key, help_text in _POOL_GAUGES:
+            _render_family(lines, 'courses_db_pool_%s' % key, 'gauge',
+                           help_text,
+                           (('', [('database', alias)], stats[key])
+                            for alias, stats in pool_stats))
+        for key, help_text in _POOL_COUNTERS:
+            name = 'courses_db_pool_%s%s_total' % (
+                key, '_seconds' if key == 'wait_time' else '')
+            _render_family(lines, name, 'counter', help_text,
+                           (('', [('database', alias)], stats[key])
+                            for alias, stats in pool_stats))
+
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+def _observe(request, response, stats, latency):
+    resolver_match = request.resolver_match
+    view = (resolver_match.url_name or resolver_match.view_name
+            if resolver_match is not None else 'unresolved')
+    method = request.method if request.method in _METHODS else 'OTHER'
+    response_bytes = 0 if response.streaming else len(response.content)
+    metrics.observe(view, method, response.status_code, latency,
+                    stats.queries, stats.query_time, response_bytes)
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, database queries, database time, response size
+    and status of each request in ``metrics``, unless
+    ``COURSES_METRICS_ENABLED`` is off.
+
+    Streamed responses are timed until their headers are returned.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # As in ReplicaMiddleware, ASGI requests pass through without
+            # being handed to a thread.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not is_enabled():
+            return self.get_response(request)
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        _observe(request, response, stats, time.perf_counter() - started_at)
+
+        return response
+
+    async def __acall__(self, request):
+        if not is_enabled():
+            return await self.get_response(request)
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        started_at = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_stats.reset(token)
+        _observe(request, response, stats, time.perf_counter() - started_at)
+
+        return response
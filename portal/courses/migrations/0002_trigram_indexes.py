@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+TRIGRAM_INDEXES = (
+    ('courses_course_title_trgm', 'courses_course', 'title'),
+    ('courses_student_first_name_trgm', 'courses_student', 'first_name'),
+    ('courses_student_last_name_trgm', 'courses_student', 'last_name'),
+)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS %s ON %s USING gin (%s gin_trgm_ops)'
+            % (schema_editor.quote_name(name),
+               schema_editor.quote_name(table),
+               schema_editor.quote_name(column))
+        )
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute('DROP INDEX IF EXISTS %s'
+                              % schema_editor.quote_name(name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
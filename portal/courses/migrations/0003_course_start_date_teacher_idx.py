@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['start_date', 'teacher', 'id'], name='course_start_date_teacher_idx'),
+        ),
+    ]
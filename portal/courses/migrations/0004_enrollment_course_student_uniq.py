@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:39
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_enrollments(apps, schema_editor):
+    # Keep the most recently updated enrollment of each (course, student).
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    duplicates = Enrollment.objects.values('course', 'student') \
+                                   .annotate(count=Count('id')) \
+                                   .filter(count__gt=1)
+    for pair in duplicates.iterator():
+        pks = list(Enrollment.objects.filter(course=pair['course'],
+                                             student=pair['student'])
+                                     .order_by('-updated_at', '-id')
+                                     .values_list('pk', flat=True))
+        Enrollment.objects.filter(pk__in=pks[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_start_date_teacher_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_enrollments,
+                             migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'course'], name='enrollment_student_course_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='enrollment',
+            constraint=models.UniqueConstraint(fields=('course', 'student'), name='enrollment_course_student_uniq'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.25 on 2026-10-18 00:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_enrollments(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    counts = Enrollment.objects.filter(course=OuterRef('pk')) \
+                               .values('course') \
+                               .annotate(count=Count('id')) \
+                               .values('count')
+    Course.objects.update(enrollment_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_enrollment_course_student_uniq'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='enrollment_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_enrollments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['enrollment_count', 'id'], name='course_enrollment_count_idx'),
+        ),
+    ]
@@ -1,7 +1,41 @@
 from django.db import models
+from .lookups import TrigramContains
 
 
-class Student(models.Model):
+models.CharField.register_lookup(TrigramContains)
+
+
+class CascadeQuerySet(models.QuerySet):
+    """
+    Deletes within ``courses.counters.enrollment_cascade()``, so that the
+    enrollments deleted along change the enrollment counts at once.
+    """
+
+    def delete(self):
+        from .counters import enrollment_cascade
+
+        with enrollment_cascade():
+            return super().delete()
+
+
+class CascadeModel(models.Model):
+    """
+    Like CascadeQuerySet, for the models' own ``delete()``.
+    """
+
+    objects = CascadeQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, *args, **kwargs):
+        from .counters import enrollment_cascade
+
+        with enrollment_cascade():
+            return super().delete(*args, **kwargs)
+
+
+class Student(CascadeModel):
     first_name = models.CharField(max_length=200)
     last_name = models.CharField(max_length=200)
     email_address = models.CharField(max_length=255)
@@ -9,7 +43,7 @@ class Student(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 
-class Teacher(models.Model):
+class Teacher(CascadeModel):
     first_name = models.CharField(max_length=200)
     last_name = models.CharField(max_length=200)
     email_address = models.CharField(max_length=255)
@@ -17,13 +51,23 @@ class Teacher(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 
-class Course(models.Model):
+class Course(CascadeModel):
     title = models.CharField(max_length=200)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE)
     start_date = models.DateField()
+    # Maintained by courses.counters; see reconcile_enrollment_counts.
+    enrollment_count = models.IntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_date', 'teacher', 'id'],
+                         name='course_start_date_teacher_idx'),
+            models.Index(fields=['enrollment_count', 'id'],
+                         name='course_enrollment_count_idx'),
+        ]
+
 
 class Enrollment(models.Model):
     course = models.ForeignKey(Course, on_delete=models.CASCADE)
@@ -31,3 +75,25 @@ class Enrollment(models.Model):
     grade = models.CharField(max_length=2, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['course', 'student'],
+                                    name='enrollment_course_student_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['student', 'course'],
+                         name='enrollment_student_course_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets an update tell whether the enrollment moved to another
+        # course or student without querying the row again.
+        loaded = dict(zip(field_names, values))
+        if 'course_id' in loaded and 'student_id' in loaded:
+            instance._loaded_relations = (loaded['course_id'],
+                                          loaded['student_id'])
+
+        return instance
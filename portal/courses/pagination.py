@@ -0,0 +1,133 @@
+import json
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.pagination import _reverse_ordering
+
+
+class PortalCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key, or over an ``ordering`` whose
+    last field is the primary key, such as ``('enrollment_count', 'id')``.
+
+    Each page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n``,
+    so deep pages cost the same as the first one. For a composite ordering
+    the cursor holds the value of every field of the last row, and the
+    page starts after that row in the ordering:
+    ``WHERE a >= x AND (a > x OR (a = x AND id > y))``, which an index on
+    ``(a, id)`` serves as a range scan. As the ordering is unique, unlike
+    DRF's CursorPagination this needs no offset for ties.
+
+    The ordering fields must not be nullable.
+    """
+
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse, position = self.cursor.reverse, self.cursor.position
+
+        ordering = (_reverse_ordering(self.ordering) if reverse
+                    else self.ordering)
+        queryset = queryset.order_by(*ordering)
+        try:
+            if position is not None:
+                queryset = queryset.filter(
+                    self._get_keyset_filter(ordering, position)
+                )
+            results = list(queryset[:self.page_size + 1])
+        except (TypeError, ValueError, ValidationError):
+            # A forged position that does not fit the fields' types.
+            raise NotFound(self.invalid_cursor_message)
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _get_keyset_filter(self, ordering, position):
+        """
+        Returns the filter of the rows after ``position`` in ``ordering``.
+        """
+        after = Q()
+        equal = {}
+        for name, value in zip(ordering, position):
+            field = name.lstrip('-')
+            lookup = '__lt' if name.startswith('-') else '__gt'
+            after |= Q(**equal, **{field + lookup: value})
+            equal[field] = value
+        first = ordering[0]
+        bound = '__lte' if first.startswith('-') else '__gte'
+
+        return Q(**{first.lstrip('-') + bound: position[0]}) & after
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        position = (self._get_position(self.page[-1]) if self.page
+                    else self.cursor.position)
+
+        return self.encode_cursor(Cursor(offset=0,
+                                         reverse=False,
+                                         position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        position = (self._get_position(self.page[0]) if self.page
+                    else self.cursor.position)
+
+        return self.encode_cursor(Cursor(offset=0,
+                                         reverse=True,
+                                         position=position))
+
+    def _get_position(self, row):
+        return [row[name.lstrip('-')] if isinstance(row, dict)
+                else getattr(row, name.lstrip('-'))
+                for name in self.ordering]
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None or cursor.position is None:
+            return cursor
+
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        # Cursors of the id ordering hold a bare id.
+        if not isinstance(position, list):
+            position = [position]
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return cursor._replace(position=position)
+
+    def encode_cursor(self, cursor):
+        position = cursor.position
+        if len(position) == 1:
+            position = position[0]
+
+        return super().encode_cursor(cursor._replace(
+            position=json.dumps(position, cls=DjangoJSONEncoder)
+        ))
@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes with orjson when it is installed.
+
+    orjson writes UTF-8 bytes directly and encodes dates, datetimes and
+    UUIDs natively; anything else it does not know (decimals, lazy
+    strings, querysets, ...) goes through DRF's ``JSONEncoder``. Indented
+    output (the browsable API), non-default ``UNICODE_JSON`` or
+    ``COMPACT_JSON`` settings, and data orjson rejects, such as integers
+    over 64 bits, fall back to ``JSONRenderer``.
+
+    Unlike ``JSONRenderer``, datetimes are not truncated to milliseconds
+    and NaN is written as ``null``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or
+                data is None or
+                self.ensure_ascii or
+                not self.compact or
+                self.get_indent(accepted_media_type,
+                                renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data,
+                               default=_encoder.default,
+                               option=orjson.OPT_NON_STR_KEYS |
+                                      orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict JavaScript subset, like JSONRenderer.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028')
+            ret = ret.replace(b'\xe2\x80\xa9', b'\\u2029')
+
+        return ret
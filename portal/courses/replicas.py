@@ -0,0 +1,152 @@
+import asyncio
+from contextvars import ContextVar
+import random
+import time
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+PIN_COOKIE = 'courses_primary_until'
+
+DEFAULT_REPLICA_PIN_SECONDS = 5
+
+# Set by ReplicaMiddleware for the duration of a request. It holds a
+# mutable object so that writes made in another thread or task, such as
+# those of the async views, are seen by the middleware.
+_request_state = ContextVar('courses_replica_state', default=None)
+
+
+class _RequestState:
+
+    def __init__(self, replica):
+        # The replica this request reads from, or None for the primary.
+        self.replica = replica
+        self.wrote = False
+
+
+def get_replicas():
+    return getattr(settings, 'COURSES_READ_REPLICAS', [])
+
+def get_pin_seconds():
+    return getattr(settings,
+                   'COURSES_REPLICA_PIN_SECONDS',
+                   DEFAULT_REPLICA_PIN_SECONDS)
+
+def _is_pinned(request):
+    try:
+        pinned_until = float(request.COOKIES[PIN_COOKIE])
+    except (KeyError, ValueError):
+        return False
+
+    # Ignore forged or stale values pinning for longer than configured.
+    now = time.time()
+
+    return now < pinned_until <= now + get_pin_seconds()
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe requests to a replica of
+    ``COURSES_READ_REPLICAS``, chosen once per request, and everything
+    else to the primary (``default``).
+
+    A request sticks to the primary from its first write on. Queries
+    made outside ``ReplicaMiddleware``, such as those of management
+    commands, use the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state.replica is None:
+            return DEFAULT_DB_ALIAS
+
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state.replica = None
+            state.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        if db in get_replicas():
+            return False
+
+        return None
+
+
+class ReplicaMiddleware:
+    """
+    Routes the reads of GET, HEAD and OPTIONS requests to a replica.
+
+    Unsafe requests, and requests that wrote, set a cookie pinning the
+    client's reads to the primary for ``COURSES_REPLICA_PIN_SECONDS``,
+    so they see their writes before the replicas catch up.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Marks the instance as a coroutine function, as Django's
+            # MiddlewareMixin does, so that ASGI requests are not handed to
+            # a thread to pass through it.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+
+        state = self._start(request)
+        token = _request_state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        state = self._start(request)
+        token = _request_state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        return self._finish(request, response, state)
+
+    def _start(self, request):
+        replicas = get_replicas()
+        if (replicas and
+                request.method in SAFE_METHODS and
+                not _is_pinned(request)):
+            return _RequestState(random.choice(replicas))
+
+        return _RequestState(None)
+
+    def _finish(self, request, response, state):
+        if get_replicas() and (state.wrote or
+                               request.method not in SAFE_METHODS):
+            pin_seconds = get_pin_seconds()
+            response.set_cookie(PIN_COOKIE,
+                                '%.3f' % (time.time() + pin_seconds),
+                                max_age=pin_seconds,
+                                httponly=True,
+                                samesite='Lax')
+
+        return response
@@ -1,4 +1,8 @@
-from rest_framework import serializers
+from datetime import datetime
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from .models import Course, Enrollment, Student, Teacher
 
 
@@ -31,11 +35,11 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = ('title',
                   'teacher',
                   'start_date',
+                  'enrollment_count',
                   'created_at',
                   'updated_at')
 
 
-
 class EnrollmentSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -45,3 +49,304 @@ class EnrollmentSerializer(serializers.ModelSerializer):
                   'grade',
                   'created_at',
                   'updated_at')
+
+
+def _get_datetime_converter(field):
+    # Same output as DateTimeField.to_representation(), but the field's
+    # time zone is resolved once rather than for every value.
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    if hasattr(field, 'timezone'):
+        field_timezone = field.timezone
+    else:
+        field_timezone = field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime) or not timezone.is_aware(value):
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+
+        return value
+
+    return convert
+
+def _get_converter(field):
+    # Strings and primary keys come out of values() in their final form.
+    if isinstance(field, (serializers.CharField,
+                          serializers.PrimaryKeyRelatedField)):
+        return None
+    elif isinstance(field, serializers.DateTimeField):
+        return _get_datetime_converter(field)
+
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer for rows of ``QuerySet.values()``.
+
+    Produces the same representation as ``model_serializer_class`` but
+    skips building model instances and DRF's per-field attribute lookups.
+    Values are converted by the model serializer's own fields, so formats
+    such as those of datetimes stay identical.
+
+    ``fields`` restricts the output to some of the fields. ``expand`` is a
+    tree such as ``{'course': {'teacher': {}}}`` (see ``parse_expand()``)
+    of related fields to nest, with their ``id``, in place of their
+    primary keys; their columns are joined into the same ``values()``
+    query.
+
+    Every read view uses these, with no setting to go back to the model
+    serializers: the output is the same, and the sparse fieldsets,
+    expansion and ordering of the read endpoints are only implemented
+    here. The model serializers still validate and save writes and
+    define the representation.
+    """
+
+    model_serializer_class = None
+
+    # Maps related field names to the ValuesSerializer of their model.
+    expandable = {}
+
+    # Fields lists can be ordered by, besides the default id.
+    sortable = ()
+
+    def __init__(self, instance=None, many=False, fields=None, expand=None):
+        self.field_names = fields
+        self.expand = expand or {}
+        if isinstance(instance, QuerySet):
+            instance = self.prepare_queryset(instance, fields, expand)
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def get_fields(cls):
+        fields = cls.__dict__.get('_fields')
+        if fields is None:
+            fields = cls.model_serializer_class().fields
+            cls._fields = fields
+
+        return fields
+
+    @classmethod
+    def parse_expand(cls, paths):
+        """
+        Returns the tree of the dotted ``paths``, e.g. ``course.teacher``.
+
+        Raises ``ValueError`` for a path that cannot be expanded.
+        """
+        tree = {}
+        for path in paths:
+            serializer_class = cls
+            node = tree
+            for name in path.split('.'):
+                if name not in serializer_class.expandable:
+                    raise ValueError(path)
+                serializer_class = serializer_class.expandable[name]
+                node = node.setdefault(name, {})
+
+        return tree
+
+    @classmethod
+    def get_expanded_models(cls, expand):
+        """
+        Returns the models whose rows are nested by the ``expand`` tree.
+        """
+        models = []
+        for name, subtree in expand.items():
+            serializer_class = cls.expandable[name]
+            models.append(serializer_class.model_serializer_class.Meta.model)
+            models += serializer_class.get_expanded_models(subtree)
+
+        return models
+
+    @classmethod
+    def get_plan(cls, fields=None, expand=None, prefix=''):
+        """
+        Returns ``(name, column, converter, nested plan)`` for each output
+        field, ``column`` being the key of the field in the rows.
+        """
+        expand = expand or {}
+        plan = []
+        for name, field in cls.get_fields().items():
+            if fields is not None and name not in fields:
+                continue
+            column = prefix + name
+            if name in expand:
+                nested = cls.expandable[name].get_plan(
+                    expand=expand[name],
+                    prefix=column + '__'
+                )
+                plan.append((name, column, None, nested))
+            else:
+                plan.append((name, column, _get_converter(field), None))
+
+        return plan
+
+    @classmethod
+    def _get_columns(cls, plan):
+        columns = []
+        for _, column, _, nested in plan:
+            columns.append(column)
+            if nested is not None:
+                columns += cls._get_columns(nested)
+
+        return columns
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None, expand=None,
+                         ordering=()):
+        """
+        Returns the queryset as ``values()`` rows of the given fields (all
+        of them by default) and expanded relations, including the ``id``
+        and the ``ordering`` fields needed by the cursor pagination.
+        """
+        plan = cls.get_plan(fields, expand)
+        columns = ['id'] + cls._get_columns(plan)
+        columns += [name.lstrip('-') for name in ordering
+                    if name.lstrip('-') not in columns]
+
+        return queryset.values(*columns)
+
+    def to_representation(self, row, plan=None):
+        if plan is None:
+            plan = self.get_plan(self.field_names, self.expand)
+        ret = {}
+        for name, column, convert, nested in plan:
+            value = row[column]
+            if nested is not None:
+                if value is not None:
+                    value = dict(id=value,
+                                 **self.to_representation(row, nested))
+            elif value is not None and convert is not None:
+                value = convert(value)
+            ret[name] = value
+
+        return ret
+
+    @property
+    def data(self):
+        plan = self.get_plan(self.field_names, self.expand)
+        if self.many:
+            return [self.to_representation(row, plan)
+                    for row in self.instance]
+
+        return self.to_representation(self.instance, plan)
+
+
+class StudentValuesSerializer(ValuesSerializer):
+    model_serializer_class = StudentSerializer
+
+
+class TeacherValuesSerializer(ValuesSerializer):
+    model_serializer_class = TeacherSerializer
+
+
+class CourseValuesSerializer(ValuesSerializer):
+    model_serializer_class = CourseSerializer
+    expandable = {'teacher': TeacherValuesSerializer}
+    sortable = ('enrollment_count', )
+
+
+class EnrollmentValuesSerializer(ValuesSerializer):
+    model_serializer_class = EnrollmentSerializer
+    expandable = {
+        'course': CourseValuesSerializer,
+        'student': StudentValuesSerializer,
+    }
+
+
+class BulkEnrollmentEntrySerializer(serializers.Serializer):
+    course = serializers.IntegerField()
+    student = serializers.IntegerField()
+    grade = serializers.CharField(max_length=2,
+                                  allow_null=True,
+                                  required=False)
+
+
+class FieldsQuerySerializer(serializers.Serializer):
+    """
+    Validates the comma-separated ``fields`` and ``expand`` parameters
+    against the ``ValuesSerializer`` given as ``serializer_class`` in the
+    context.
+    """
+
+    fields = serializers.CharField(required=False)
+    expand = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        known = self.context['serializer_class'].get_fields()
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise serializers.ValidationError(
+                'Unknown fields: %s.' % ', '.join(unknown)
+            )
+        elif not names:
+            raise serializers.ValidationError('No fields given.')
+
+        return tuple(name for name in known if name in names)
+
+    def validate_expand(self, value):
+        paths = [path.strip() for path in value.split(',') if path.strip()]
+        try:
+            return self.context['serializer_class'].parse_expand(paths)
+        except ValueError as e:
+            raise serializers.ValidationError('Cannot expand: %s.' % e)
+
+
+class ListQuerySerializer(FieldsQuerySerializer):
+    """
+    Adds an ``ordering`` parameter, one of the ``sortable`` fields of the
+    serializer optionally prefixed with ``-``, to ``FieldsQuerySerializer``.
+    """
+
+    ordering = serializers.CharField(required=False)
+
+    def validate_ordering(self, value):
+        name = value[1:] if value.startswith('-') else value
+        if name not in self.context['serializer_class'].sortable:
+            raise serializers.ValidationError(
+                'Cannot order by: %s.' % value
+            )
+
+        # Ties are broken by id, which PortalCursorPagination keeps in its
+        # cursors along with the field.
+        return (value, '-id' if value.startswith('-') else 'id')
+
+
+class SearchQuerySerializer(FieldsQuerySerializer):
+    order = serializers.ChoiceField(choices=('similarity', ), required=False)
+    limit = serializers.IntegerField(min_value=1,
+                                     max_value=1000,
+                                     required=False)
+
+
+class StartDateRangeQuerySerializer(FieldsQuerySerializer):
+    from_date = serializers.DateField(required=False)
+    to = serializers.DateField(required=False)
+    teacher = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(min_value=1,
+                                     max_value=1000,
+                                     required=False)
+
+    def get_fields(self):
+        # 'from' is a Python keyword, so it cannot be declared directly.
+        fields = super().get_fields()
+        fields['from'] = fields.pop('from_date')
+
+        return fields
+
+    def validate(self, data):
+        if 'from' in data and 'to' in data and data['from'] > data['to']:
+            raise serializers.ValidationError("'from' must not be after 'to'.")
+
+        return data
@@ -0,0 +1,94 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from . import cache
+from .models import Course, Enrollment, Student, Teacher
+
+
+def get_roster_tag(course_pk):
+    return 'roster:%s' % course_pk
+
+def get_transcript_tag(student_pk):
+    return 'transcript:%s' % student_pk
+
+def get_enrollment_tags(course_pk, student_pk):
+    return [get_roster_tag(course_pk), get_transcript_tag(student_pk)]
+
+def invalidate_courses(course_pks):
+    """
+    Invalidates the given courses and the transcripts listing them.
+    """
+    if not cache.is_enabled() or not course_pks:
+        return
+
+    student_pks = Enrollment.objects.filter(course__in=course_pks) \
+                                    .values_list('student', flat=True) \
+                                    .distinct()
+    cache.invalidate([cache.get_instance_tag(Course, pk)
+                      for pk in course_pks] +
+                     [cache.get_collection_tag(Course)] +
+                     [get_transcript_tag(pk) for pk in student_pks])
+
+def _get_model_tags(instance):
+    model = type(instance)
+
+    return [cache.get_instance_tag(model, instance.pk),
+            cache.get_collection_tag(model)]
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_student(sender, instance, **kwargs):
+    if not cache.is_enabled():
+        return
+
+    course_pks = Enrollment.objects.filter(student=instance.pk) \
+                                   .values_list('course', flat=True)
+    cache.invalidate(_get_model_tags(instance) +
+                     [get_roster_tag(pk) for pk in course_pks])
+
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def invalidate_teacher(sender, instance, **kwargs):
+    cache.invalidate(_get_model_tags(instance))
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    invalidate_courses([instance.pk])
+
+@receiver(pre_save, sender=Enrollment)
+def remember_enrollment_relations(sender, instance, raw=False, **kwargs):
+    """
+    Sets ``_previous_relations`` to the ``(course, student)`` pair that an
+    update moves the enrollment away from, whose roster, transcript and
+    enrollment count then change as well, or to None.
+    """
+    instance._previous_relations = None
+    if raw or instance.pk is None:
+        return
+
+    previous_relations = getattr(instance, '_loaded_relations', None)
+    if previous_relations is None:
+        # Only instances built with a pk, rather than loaded, get here.
+        previous_relations = \
+            Enrollment.objects.filter(pk=instance.pk) \
+                              .values_list('course', 'student') \
+                              .first()
+    if previous_relations != (instance.course_id, instance.student_id):
+        instance._previous_relations = previous_relations
+
+@receiver(post_save, sender=Enrollment)
+def update_loaded_relations(sender, instance, **kwargs):
+    instance._loaded_relations = (instance.course_id, instance.student_id)
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_enrollment(sender, instance, **kwargs):
+    if not cache.is_enabled():
+        return
+
+    tags = _get_model_tags(instance)
+    tags += get_enrollment_tags(instance.course_id, instance.student_id)
+    previous_relations = getattr(instance, '_previous_relations', None)
+    if previous_relations is not None:
+        tags += get_enrollment_tags(*previous_relations)
+    cache.invalidate(tags)
@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+
+DEFAULT_STREAM_CHUNK_SIZE = 2000
+
+
+def get_stream_chunk_size():
+    return getattr(settings,
+                   'COURSES_STREAM_CHUNK_SIZE',
+                   DEFAULT_STREAM_CHUNK_SIZE)
+
+def get_json_renderer():
+    """
+    Returns the first JSON renderer of ``DEFAULT_RENDERER_CLASSES``, so
+    streamed responses are encoded like the others.
+    """
+    for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES:
+        if issubclass(renderer_class, JSONRenderer):
+            return renderer_class()
+
+    return JSONRenderer()
+
+def _encode_chunk(instances, serializer_class, renderer):
+    serializer = serializer_class(instances, many=True)
+    encoded = renderer.render(serializer.data)
+
+    # Drop the enclosing brackets; the caller writes the array delimiters.
+    return encoded[1:-1]
+
+def _iter_json_array(queryset, serializer_class, chunk_size):
+    renderer = get_json_renderer()
+    yield b'['
+    separator = b''
+    chunk = []
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(instance)
+        if len(chunk) == chunk_size:
+            yield separator + _encode_chunk(chunk, serializer_class, renderer)
+            separator = b','
+            chunk = []
+    if chunk:
+        yield separator + _encode_chunk(chunk, serializer_class, renderer)
+    yield b']'
+
+def stream_json_array(queryset, serializer_class):
+    """
+    Returns a response that writes the queryset as a JSON array.
+
+    Rows are read through ``QuerySet.iterator()`` (a server-side cursor on
+    PostgreSQL) and serialized one chunk at a time, so memory use depends
+    on the chunk size rather than on the number of rows.
+    """
+    chunk_size = get_stream_chunk_size()
+    # The rows are read after the view returns, so route the query now,
+    # while the database routers still see the request.
+    queryset = queryset.using(queryset.db)
+    response = StreamingHttpResponse(
+        _iter_json_array(queryset, serializer_class, chunk_size),
+        content_type='application/json'
+    )
+
+    return response
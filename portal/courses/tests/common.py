@@ -1,4 +1,39 @@
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+# Queries run by each view, by URL name and method, whatever the number of
+# rows involved, or by database vendor where the view takes another path.
+# assert_query_budget() checks them at every size of QUERY_BUDGET_SIZES,
+# so a query per row fails the test.
+QUERY_BUDGETS = {
+    ('get_delete_update_student', 'GET'): 2,
+    ('get_delete_update_student', 'DELETE'): 5,
+    ('get_post_students', 'GET'): 2,
+    ('get_students_in_course', 'GET'): 1,
+    ('get_students_by_name', 'GET'): 1,
+    ('get_delete_update_teacher', 'GET'): 2,
+    ('get_post_teachers', 'GET'): 2,
+    ('get_delete_update_course', 'GET'): 2,
+    ('get_delete_update_course', 'DELETE'): 4,
+    ('get_post_courses', 'GET'): 2,
+    ('get_courses_taken_by_student', 'GET'): 1,
+    ('get_courses_by_title', 'GET'): 1,
+    ('get_courses_by_start_date', 'GET'): 1,
+    ('get_courses_by_start_date_range', 'GET'): 1,
+    ('get_delete_update_enrollment', 'GET'): 2,
+    ('get_post_enrollments', 'GET'): 2,
+    ('get_upsert_enrollment', 'GET'): 1,
+    # INSERT ... ON CONFLICT on PostgreSQL, update_or_create() elsewhere.
+    ('get_upsert_enrollment', 'PUT'): {'postgresql': 4, 'default': 9},
+    ('post_bulk_enrollments', 'POST'): 7,
+    ('get_db_pool_stats', 'GET'): 0,
+    ('post_delete_token', 'DELETE'): 2,
+    ('get_metrics', 'GET'): 0,
+}
+
+QUERY_BUDGET_SIZES = (2, 20)
 
 
 def set_up_admin():
@@ -8,3 +43,43 @@ def set_up_admin():
 def clean_up_admin(admin_user, client):
     client.force_authenticate(user=None)
     admin_user.delete()
+
+def _format_queries(method, url_name, budget, captured):
+    lines = ['%s %s ran %s queries for %s rows, instead of %d:' % (
+        method,
+        url_name,
+        '/'.join(str(len(queries)) for size, queries in captured),
+        '/'.join(str(size) for size, queries in captured),
+        budget,
+    )]
+    for size, queries in captured:
+        lines.append('  %d rows:' % size)
+        lines.extend('    %d. %s' % (i, query['sql'])
+                     for i, query in enumerate(queries, 1))
+
+    return '\n'.join(lines)
+
+def assert_query_budget(test_case, url_name, method, create_data,
+                        send_request):
+    """
+    For each size of QUERY_BUDGET_SIZES, calls ``create_data(size)`` and
+    ``send_request()`` with what it returns, and fails, listing the SQL of
+    every request, unless each request succeeds with the number of queries
+    of its QUERY_BUDGETS entry for the database in use.
+
+    ``create_data()`` is called again for the larger sizes without the
+    database being cleaned up in between.
+    """
+    budget = QUERY_BUDGETS[(url_name, method)]
+    if isinstance(budget, dict):
+        budget = budget.get(connection.vendor, budget['default'])
+    captured = []
+    for size in QUERY_BUDGET_SIZES:
+        data = create_data(size)
+        with CaptureQueriesContext(connection) as queries:
+            response = send_request(data)
+        test_case.assertLess(response.status_code, 400, response.content)
+        captured.append((size, queries.captured_queries))
+
+    if any(len(queries) != budget for size, queries in captured):
+        test_case.fail(_format_queries(method, url_name, budget, captured))
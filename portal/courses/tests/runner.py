@@ -0,0 +1,35 @@
+import unittest
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from ..throttling import get_cache
+
+
+class _ThrottleResetMixin:
+
+    def startTest(self, test):
+        # Test requests all come from the same client, so without this the
+        # throttles would refuse them depending on the tests that ran
+        # before.
+        get_cache().clear()
+        super().startTest(test)
+
+
+class PortalTestRunner(DiscoverRunner):
+    """
+    Runs every test with the throttle counters cleared, as each test starts
+    with the database rolled back.
+    """
+
+    def run_checks(self, databases):
+        # The tests run in a single process, which may keep its caches.
+        silenced = [*settings.SILENCED_SYSTEM_CHECKS, 'courses.W001']
+        with override_settings(SILENCED_SYSTEM_CHECKS=silenced):
+            super().run_checks(databases)
+
+    def get_resultclass(self):
+        resultclass = super().get_resultclass() or unittest.TextTestResult
+
+        return type('Portal' + resultclass.__name__,
+                    (_ThrottleResetMixin, resultclass),
+                    {})
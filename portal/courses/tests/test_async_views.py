@@ -0,0 +1,130 @@
+import asyncio
+import json
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TransactionTestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from .. import views
+from ..async_views import ASGIHandler, async_reads
+from ..models import Student
+
+
+factory = RequestFactory()
+
+def _clean_up_db():
+    Student.objects.all().delete()
+
+def _get_over_asgi(path, query_string=''):
+    """
+    Sends a GET request to the portal's ASGI application and returns the
+    messages it sent.
+    """
+    application = ASGIHandler()
+    messages = []
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 40000),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    async_to_sync(application)(scope, receive, send)
+
+    return messages
+
+def _create_students(count):
+    return [
+        Student.objects.create(first_name='First%d' % i,
+                               last_name='Last%d' % i,
+                               email_address='email-address%d' % i)
+        for i in range(count)
+    ]
+
+
+class AsyncReadsTest(TransactionTestCase):
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_view_stays_sync_when_disabled(self):
+        view = async_reads(views.get_post_students)
+
+        self.assertIs(views.get_post_students, view)
+
+    @override_settings(COURSES_ASYNC_READS=True)
+    def test_get_student(self):
+        student, = _create_students(1)
+        view = async_reads(views.get_delete_update_student)
+
+        self.assertTrue(asyncio.iscoroutinefunction(view))
+        response = async_to_sync(view)(factory.get('/'), pk=student.pk)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual('First0', json.loads(response.content)['first_name'])
+
+    @override_settings(COURSES_ASYNC_READS=True)
+    def test_get_students_concurrently(self):
+        students = _create_students(3)
+        view = async_reads(views.get_delete_update_student)
+
+        async def get_all():
+            return await asyncio.gather(*[
+                view(factory.get('/'), pk=student.pk) for student in students
+            ])
+
+        responses = async_to_sync(get_all)()
+
+        self.assertEqual(['First0', 'First1', 'First2'],
+                         [json.loads(response.content)['first_name']
+                          for response in responses])
+
+    @override_settings(COURSES_ASYNC_READS=True)
+    def test_stream_students(self):
+        _create_students(3)
+        view = async_reads(views.get_post_students)
+
+        response = async_to_sync(view)(factory.get('/', {'stream': '1'}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        response.close()
+
+    @override_settings(COURSES_STREAM_CHUNK_SIZE=1)
+    def test_stream_students_over_asgi(self):
+        _create_students(3)
+
+        start, *bodies = _get_over_asgi(reverse('get_post_students'),
+                                        'stream=1')
+
+        self.assertEqual(status.HTTP_200_OK, start['status'])
+        # '[', a chunk per student, ']' and the closing message.
+        self.assertEqual([True] * 5 + [False],
+                         [body.get('more_body', False) for body in bodies])
+        content = b''.join(body.get('body', b'') for body in bodies)
+        self.assertEqual(['First0', 'First1', 'First2'],
+                         [row['first_name'] for row in json.loads(content)])
+
+    @override_settings(COURSES_ASYNC_READS=True)
+    def test_delete_student_without_authentication(self):
+        student, = _create_students(1)
+        view = async_reads(views.get_delete_update_student)
+
+        response = async_to_sync(view)(factory.delete('/'), pk=student.pk)
+        response.render()
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(1, Student.objects.count())
@@ -0,0 +1,231 @@
+from datetime import date
+from django.core.serializers.json import json
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from unittest import mock
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from .. import bulk
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = APIClient()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_course_and_students(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    students = [
+        Student.objects.create(first_name='StudentFirst%d' % i,
+                               last_name='StudentLast%d' % i,
+                               email_address='student-email-address%d' % i)
+        for i in range(count)
+    ]
+
+    return (course, students)
+
+
+class CreateBulkEnrollmentsTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        _clean_up_db()
+
+    def _do_post(self, payload):
+        response = client.post(reverse('post_bulk_enrollments'),
+                               data=json.dumps(payload),
+                               content_type='application/json')
+
+        return response
+
+    def test_create_enrollments_without_authentication(self):
+        course, students = _create_course_and_students(1)
+        payload = [{'course': course.pk, 'student': students[0].pk}]
+
+        response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_create_enrollments(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(3)
+        payload = [{'course': course.pk, 'student': student.pk, 'grade': 'A'}
+                   for student in students]
+
+        response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(3, len(response.data['created']))
+        self.assertEqual([], response.data['errors'])
+        self.assertEqual(
+            [student.pk for student in students],
+            list(Enrollment.objects.order_by('id')
+                                   .values_list('student', flat=True))
+        )
+
+    def test_create_enrollments_with_some_invalid_entries(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(2)
+        payload = [
+            {'course': course.pk, 'student': students[0].pk, 'grade': 'A'},
+            {'course': 1234567890, 'student': students[1].pk},
+            {'course': course.pk, 'student': students[1].pk, 'grade': 'ABC'},
+            {'course': course.pk, 'student': 1234567890},
+            {'course': course.pk, 'student': students[1].pk, 'grade': None},
+        ]
+
+        response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(2, len(response.data['created']))
+        self.assertEqual([1, 2, 3],
+                         [error['index'] for error in response.data['errors']])
+        self.assertIn('course', response.data['errors'][0]['errors'])
+        self.assertIn('grade', response.data['errors'][1]['errors'])
+        self.assertIn('student', response.data['errors'][2]['errors'])
+        self.assertEqual(2, Enrollment.objects.count())
+
+    def test_create_enrollments_with_only_invalid_entries(self):
+        client.force_authenticate(user=self._admin_user)
+
+        response = self._do_post([{'course': None, 'student': None}, 'x'])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([0, 1],
+                         [error['index'] for error in response.data['errors']])
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_create_enrollments_from_non_list_payload(self):
+        client.force_authenticate(user=self._admin_user)
+
+        response = self._do_post({'course': 1, 'student': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_duplicate_enrollments(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(2)
+        Enrollment.objects.create(course=course, student=students[0])
+        payload = [
+            {'course': course.pk, 'student': students[0].pk},
+            {'course': course.pk, 'student': students[1].pk},
+            {'course': course.pk, 'student': students[1].pk, 'grade': 'A'},
+        ]
+
+        response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(1, len(response.data['created']))
+        self.assertEqual([0, 2], [error['index']
+                                  for error in response.data['errors']])
+        self.assertEqual(2, Enrollment.objects.count())
+
+    def test_create_enrollments_enrolled_concurrently(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(2)
+        get_existing_enrollments = bulk.get_existing_enrollments
+
+        def enroll_concurrently(pairs):
+            # Another request enrolls the first student after the check.
+            enrolled = get_existing_enrollments(pairs)
+            if not Enrollment.objects.exists():
+                Enrollment.objects.create(course=course, student=students[0])
+
+            return enrolled
+
+        with mock.patch.object(bulk, 'get_existing_enrollments',
+                               enroll_concurrently):
+            response = self._do_post([{'course': course.pk,
+                                       'student': student.pk}
+                                      for student in students])
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([students[1].pk],
+                         [enrollment['student']
+                          for enrollment in response.data['created']])
+        self.assertEqual([0], [error['index']
+                               for error in response.data['errors']])
+        self.assertIn('non_field_errors', response.data['errors'][0]['errors'])
+        course.refresh_from_db()
+        self.assertEqual(2, course.enrollment_count)
+
+    @override_settings(COURSES_BULK_BATCH_SIZE=2)
+    def test_create_enrollments_in_batches(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(5)
+        payload = [{'course': course.pk, 'student': student.pk}
+                   for student in students]
+
+        # Three existence checks, a savepoint, three INSERTs, the update of
+        # the enrollment count and a release.
+        with self.assertNumQueries(9):
+            response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(5, Enrollment.objects.count())
+        course.refresh_from_db()
+        self.assertEqual(5, course.enrollment_count)
+
+    @mock.patch.object(bulk, 'ENROLLMENT_PAIRS_PER_QUERY', 2)
+    def test_look_up_submitted_pairs_only(self):
+        client.force_authenticate(user=self._admin_user)
+        course, students = _create_course_and_students(3)
+        other_course = Course.objects.create(title='Other title',
+                                             teacher=course.teacher,
+                                             start_date=date(2018, 9, 1))
+        # Enrollments of the submitted courses and students, in other
+        # pairs than the submitted ones.
+        for student in students:
+            Enrollment.objects.create(course=other_course, student=student)
+        Enrollment.objects.create(course=course, student=students[0])
+        payload = [{'course': course.pk, 'student': students[1].pk},
+                   {'course': other_course.pk, 'student': students[0].pk},
+                   {'course': course.pk, 'student': students[2].pk}]
+        self.assertEqual({(other_course.pk, students[0].pk)},
+                         bulk.get_existing_enrollments([
+                             (item['course'], item['student'])
+                             for item in payload
+                         ]))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._do_post(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([1], [error['index']
+                               for error in response.data['errors']])
+        lookups = [query['sql'] for query in queries
+                   if query['sql'].startswith('SELECT') and
+                   '"courses_enrollment"' in query['sql']]
+        # Three pairs, two per query.
+        self.assertEqual(2, len(lookups))
+
+    def test_create_enrollments_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        def send_request(data):
+            course, students = data
+
+            return self._do_post([{'course': course.pk, 'student': student.pk}
+                                  for student in students])
+
+        assert_query_budget(self,
+                            'post_bulk_enrollments',
+                            'POST',
+                            _create_course_and_students,
+                            send_request)
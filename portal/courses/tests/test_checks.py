@@ -0,0 +1,34 @@
+from django.test import SimpleTestCase, override_settings
+from ..checks import check_shared_caches
+
+
+LOCMEM = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+
+FILE_BASED = {
+    'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+    'LOCATION': '/tmp/courses-test-cache',
+}
+
+
+@override_settings(DEBUG=False,
+                   CACHES={'default': LOCMEM, 'shared': FILE_BASED},
+                   COURSES_THROTTLE_CACHE_ALIAS='default',
+                   COURSES_TOKEN_CACHE_ALIAS='default')
+class SharedCacheCheckTest(SimpleTestCase):
+
+    def test_warn_about_process_local_caches(self):
+        warnings = check_shared_caches(None)
+
+        self.assertEqual(['courses.W001', 'courses.W001'],
+                         [warning.id for warning in warnings])
+        self.assertIn('COURSES_THROTTLE_CACHE_ALIAS', warnings[0].msg)
+        self.assertIn('COURSES_TOKEN_CACHE_ALIAS', warnings[1].msg)
+
+    @override_settings(COURSES_THROTTLE_CACHE_ALIAS='shared',
+                       COURSES_TOKEN_CACHE_ALIAS='shared')
+    def test_accept_shared_caches(self):
+        self.assertEqual([], check_shared_caches(None))
+
+    @override_settings(DEBUG=True)
+    def test_accept_process_local_caches_in_debug(self):
+        self.assertEqual([], check_shared_caches(None))
@@ -0,0 +1,176 @@
+from django.test import TestCase
+from django.urls import reverse
+from django.core.serializers.json import json
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import set_up_admin, clean_up_admin
+from ..models import Student
+
+
+client = APIClient()
+
+def _clean_up_db():
+    Student.objects.all().delete()
+
+def _create_two_students():
+    student1 = Student.objects.create(first_name='First1',
+                                      last_name='Last1',
+                                      email_address='email-address1')
+    student2 = Student.objects.create(first_name='First2',
+                                      last_name='Last2',
+                                      email_address='email-address2')
+
+    return (student1, student2)
+
+
+class ConditionalGetSingleStudentTest(TestCase):
+
+    def setUp(self):
+        self._student1, self._student2 = _create_two_students()
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def _do_get(self, **headers):
+        response = client.get(reverse('get_delete_update_student',
+                                      kwargs={'pk': self._student1.pk}),
+                              **headers)
+
+        return response
+
+    def test_get_student_sets_validators(self):
+        response = self._do_get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(response['Last-Modified'],
+                         http_date(self._student1.updated_at.timestamp()))
+
+    def test_get_unchanged_student_with_etag(self):
+        etag = self._do_get()['ETag']
+
+        with self.assertNumQueries(1):
+            response = self._do_get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_unchanged_student_with_last_modified(self):
+        last_modified = self._do_get()['Last-Modified']
+
+        response = self._do_get(HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_changed_student_with_etag(self):
+        etag = self._do_get()['ETag']
+        self._student1.first_name = 'NewFirst1'
+        self._student1.save()
+
+        response = self._do_get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['first_name'], 'NewFirst1')
+
+    def test_get_missing_student_with_etag(self):
+        response = client.get(reverse('get_delete_update_student',
+                                      kwargs={'pk': 1234567890}),
+                              HTTP_IF_NONE_MATCH='"something"')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalUpdateSingleStudentTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+        self._student1, self._student2 = _create_two_students()
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        _clean_up_db()
+
+    def test_update_student_with_stale_etag(self):
+        client.force_authenticate(user=self._admin_user)
+        payload = {
+            'first_name': 'NewFirst1',
+            'last_name': 'NewLast1',
+            'email_address': 'new-email-address1',
+        }
+
+        response = client.put(reverse('get_delete_update_student',
+                                      kwargs={'pk': self._student1.pk}),
+                              data=json.dumps(payload),
+                              content_type='application/json',
+                              HTTP_IF_MATCH='"stale"')
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_update_student_with_current_etag(self):
+        client.force_authenticate(user=self._admin_user)
+        url = reverse('get_delete_update_student',
+                      kwargs={'pk': self._student1.pk})
+        etag = client.get(url)['ETag']
+        payload = {
+            'first_name': 'NewFirst1',
+            'last_name': 'NewLast1',
+            'email_address': 'new-email-address1',
+        }
+
+        response = client.put(url,
+                              data=json.dumps(payload),
+                              content_type='application/json',
+                              HTTP_IF_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+
+class ConditionalGetAllStudentsTest(TestCase):
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def _do_get(self, **headers):
+        response = client.get(reverse('get_post_students'), **headers)
+
+        return response
+
+    def test_get_unchanged_students_with_etag(self):
+        _create_two_students()
+        response = self._do_get()
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self._do_get(HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_students_after_update_with_etag(self):
+        student1, student2 = _create_two_students()
+        etag = self._do_get()['ETag']
+        student1.save()
+
+        response = self._do_get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_students_after_delete_with_etag(self):
+        student1, student2 = _create_two_students()
+        etag = self._do_get()['ETag']
+        student1.delete()
+
+        response = self._do_get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(1, len(response.data['results']))
+
+    def test_get_other_page_with_etag(self):
+        _create_two_students()
+        etag = self._do_get()['ETag']
+
+        response = client.get(reverse('get_post_students'),
+                              {'page_size': 1},
+                              HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
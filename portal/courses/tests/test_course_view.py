@@ -4,8 +4,8 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .common import set_up_admin, clean_up_admin
-from ..models import Course, Teacher
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from ..models import Course, Enrollment, Student, Teacher
 from ..serializers import CourseSerializer
 
 
@@ -14,6 +14,7 @@ client = APIClient()
 def _clean_up_db():
     Course.objects.all().delete()
     Teacher.objects.all().delete()
+    Student.objects.all().delete()
 
 def _create_two_courses():
     teacher1 = Teacher.objects.create(first_name='First1',
@@ -31,6 +32,30 @@ def _create_two_courses():
 
     return (course1, course2)
 
+def _create_courses(count):
+    teacher = Teacher.objects.create(first_name='First',
+                                     last_name='Last',
+                                     email_address='email-address')
+    for i in range(count):
+        Course.objects.create(title='Title%d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 9, 1))
+
+def _create_course_with_students(count):
+    teacher = Teacher.objects.create(first_name='First',
+                                     last_name='Last',
+                                     email_address='email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    for i in range(count):
+        student = Student.objects.create(first_name='StudentFirst%d' % i,
+                                         last_name='StudentLast%d' % i,
+                                         email_address='student-email-address')
+        Enrollment.objects.create(course=course, student=student)
+
+    return course
+
 
 class GetAllCoursesTest(TestCase):
 
@@ -50,7 +75,7 @@ class GetAllCoursesTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_get_all_courses_from_populated_db(self):
         _create_two_courses()
@@ -61,7 +86,14 @@ class GetAllCoursesTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
+
+    def test_get_all_courses_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_post_courses',
+                            'GET',
+                            _create_courses,
+                            lambda data: self._do_get())
 
 
 class GetSingleCourseTest(TestCase):
@@ -92,6 +124,13 @@ class GetSingleCourseTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_course_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_delete_update_course',
+                            'GET',
+                            _create_course_with_students,
+                            lambda course: self._do_get(course.pk))
+
 
 class CreateNewCourseTest(TestCase):
 
@@ -244,3 +283,12 @@ class DeleteSingleCourseTest(TestCase):
         response = self._do_delete(1234567890)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_course_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        assert_query_budget(self,
+                            'get_delete_update_course',
+                            'DELETE',
+                            _create_course_with_students,
+                            lambda course: self._do_delete(course.pk))
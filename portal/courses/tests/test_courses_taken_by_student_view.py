@@ -2,6 +2,7 @@ from datetime import date
 from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
+from .common import assert_query_budget
 from ..models import Course, Enrollment, Student, Teacher
 from ..serializers import CourseSerializer, StudentSerializer
 
@@ -85,6 +86,21 @@ def _create_students():
     return (student1, student2, student3, student4, student5,
             course1, course2, course3, course4, course5)
 
+def _create_student_with_courses(count):
+    student = Student.objects.create(first_name='StudentFirst',
+                                     last_name='StudentLast',
+                                     email_address='student-email-address')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        course = Course.objects.create(title='Title%d' % i,
+                                       teacher=teacher,
+                                       start_date=date(2018, 9, 1))
+        Enrollment.objects.create(course=course, student=student)
+
+    return student
+
 
 class GetCoursesTakeByStudentTest(TestCase):
 
@@ -92,6 +108,9 @@ class GetCoursesTakeByStudentTest(TestCase):
         _clean_up_db()
 
     def _assert_response(self, student_pk, expected_results):
+        # Enrolling students updated the courses' enrollment counts.
+        for course in expected_results:
+            course.refresh_from_db()
         serializer = CourseSerializer(expected_results, many=True)
 
         response = client.get(reverse('get_courses_taken_by_student',
@@ -120,3 +139,15 @@ class GetCoursesTakeByStudentTest(TestCase):
         self._assert_response(student3.pk, student3_courses)
         self._assert_response(student4.pk, student4_courses)
         self._assert_response(student5.pk, student5_courses)
+
+    def test_get_courses_in_constant_number_of_queries(self):
+        assert_query_budget(
+            self,
+            'get_courses_taken_by_student',
+            'GET',
+            _create_student_with_courses,
+            lambda student: client.get(
+                reverse('get_courses_taken_by_student',
+                        kwargs={'pk': student.pk})
+            )
+        )
@@ -0,0 +1,233 @@
+import threading
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from ..db import pool
+from ..db.pool import ConnectionPool, PoolTimeout
+from ..db.postgresql.base import Database, DatabaseWrapper
+
+
+client = APIClient()
+
+
+class _Cursor:
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def execute(self, sql):
+        if self._connection.broken:
+            raise Database.OperationalError('server closed the connection')
+        self._connection.queries.append(sql)
+
+
+class _Connection:
+
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.queries = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return _Cursor(self)
+
+    def rollback(self):
+        if self.broken:
+            raise Database.OperationalError('server closed the connection')
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+def _create_wrapper(**settings):
+    settings_dict = dict(connection.settings_dict,
+                         ENGINE='courses.db.postgresql',
+                         NAME='course_portal_db',
+                         **settings)
+
+    return DatabaseWrapper(settings_dict, alias='pool-test')
+
+
+class ConnectionPoolTest(SimpleTestCase):
+
+    def test_reuse_released_connection(self):
+        connections = ConnectionPool(_Connection, max_size=2)
+
+        first, reused = connections.acquire()
+        self.assertFalse(reused)
+        connections.release(first)
+        second, reused = connections.acquire()
+
+        self.assertTrue(reused)
+        self.assertIs(first, second)
+        self.assertEqual(1, first.rollbacks)
+        self.assertEqual(1, connections.get_stats()['connections_created'])
+
+    def test_discard_broken_connection(self):
+        connections = ConnectionPool(_Connection, max_size=1)
+
+        first, _ = connections.acquire()
+        first.broken = True
+        connections.release(first)
+        second, reused = connections.acquire()
+
+        self.assertFalse(reused)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+        stats = connections.get_stats()
+        self.assertEqual(1, stats['size'])
+        self.assertEqual(1, stats['connections_discarded'])
+
+    def test_time_out_when_exhausted(self):
+        connections = ConnectionPool(_Connection, max_size=1, timeout=0.01)
+
+        connections.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            connections.acquire()
+        stats = connections.get_stats()
+        self.assertEqual(1, stats['timeouts'])
+        self.assertEqual(1, stats['waits'])
+        self.assertGreater(stats['wait_time'], 0)
+
+    def test_wait_for_release(self):
+        connections = ConnectionPool(_Connection, max_size=1, timeout=10)
+        first, _ = connections.acquire()
+        timer = threading.Timer(0.01, connections.release, [first])
+
+        timer.start()
+        second, reused = connections.acquire()
+        timer.join()
+
+        self.assertTrue(reused)
+        self.assertIs(first, second)
+        self.assertEqual({'max_size': 1, 'size': 1, 'in_use': 1, 'idle': 0,
+                          'waiting': 0, 'requests': 2, 'waits': 1,
+                          'timeouts': 0, 'connections_created': 1,
+                          'connections_discarded': 0},
+                         {key: value
+                          for key, value in connections.get_stats().items()
+                          if 'wait_time' not in key})
+
+    def test_close(self):
+        connections = ConnectionPool(_Connection, max_size=2)
+        idle, _ = connections.acquire()
+        in_use, _ = connections.acquire()
+        connections.release(idle)
+
+        connections.close()
+
+        self.assertTrue(idle.closed)
+        self.assertFalse(in_use.closed)
+        connections.release(in_use)
+        self.assertTrue(in_use.closed)
+        self.assertEqual(0, connections.get_stats()['size'])
+
+    def test_get_pool_per_alias_and_parameters(self):
+        first = pool.get_pool('pool-test', 'a', _Connection)
+        self.addCleanup(pool.close_pool, 'pool-test', 'a')
+        second = pool.get_pool('pool-test', 'b', _Connection)
+        self.addCleanup(pool.close_pool, 'pool-test', 'b')
+
+        self.assertIs(first, pool.get_pool('pool-test', 'a', _Connection))
+        self.assertIsNot(first, second)
+
+
+class DatabaseWrapperTest(SimpleTestCase):
+
+    def test_reject_persistent_pooled_connections(self):
+        wrapper = _create_wrapper(CONN_MAX_AGE=60, OPTIONS={'pool': True})
+
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.check_settings()
+
+    def test_leave_pool_out_of_connection_parameters(self):
+        wrapper = _create_wrapper(CONN_MAX_AGE=0,
+                                  OPTIONS={'pool': {'max_size': 2},
+                                           'sslmode': 'require'})
+
+        conn_params = wrapper.get_connection_params()
+
+        self.assertNotIn('pool', conn_params)
+        self.assertEqual('require', conn_params['sslmode'])
+
+    def test_health_check_once_per_request(self):
+        wrapper = _create_wrapper(CONN_HEALTH_CHECKS=True)
+        wrapper.connection = _Connection()
+
+        wrapper.close_if_health_check_failed()
+        wrapper.close_if_health_check_failed()
+
+        self.assertEqual(['SELECT 1'], wrapper.connection.queries)
+
+    def test_close_connection_failing_health_check(self):
+        wrapper = _create_wrapper(CONN_HEALTH_CHECKS=True)
+        broken = _Connection()
+        broken.broken = True
+        wrapper.connection = broken
+
+        wrapper.close_if_health_check_failed()
+
+        self.assertIsNone(wrapper.connection)
+        self.assertTrue(broken.closed)
+
+    def test_skip_health_check_when_disabled(self):
+        wrapper = _create_wrapper()
+        wrapper.connection = _Connection()
+
+        wrapper.close_if_health_check_failed()
+
+        self.assertEqual([], wrapper.connection.queries)
+
+
+class GetDbPoolStatsTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+
+    def test_get_stats_without_authentication(self):
+        response = client.get(reverse('get_db_pool_stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_get_stats(self):
+        client.force_authenticate(user=self._admin_user)
+        pool.get_pool('pool-test', 'a', _Connection, max_size=3)
+        self.addCleanup(pool.close_pool, 'pool-test', 'a')
+
+        response = client.get(reverse('get_db_pool_stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(3, response.data['pool-test']['max_size'])
+        self.assertEqual(0, response.data['pool-test']['in_use'])
+
+    def test_get_stats_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        def create_pools(count):
+            for i in range(count):
+                pool.get_pool('pool-test', i, _Connection)
+                self.addCleanup(pool.close_pool, 'pool-test', i)
+
+        assert_query_budget(self,
+                            'get_db_pool_stats',
+                            'GET',
+                            create_pools,
+                            lambda data: client.get(
+                                reverse('get_db_pool_stats')
+                            ))
@@ -0,0 +1,269 @@
+from datetime import date
+from io import StringIO
+from django.core.management import call_command
+from django.core.serializers.json import json
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import set_up_admin, clean_up_admin
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = APIClient()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_courses_and_students(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    courses = [
+        Course.objects.create(title='Title%d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 9, 1))
+        for i in range(count)
+    ]
+    students = [
+        Student.objects.create(first_name='StudentFirst%d' % i,
+                               last_name='StudentLast%d' % i,
+                               email_address='student-email-address%d' % i)
+        for i in range(count)
+    ]
+
+    return (courses, students)
+
+def _get_counts(courses):
+    return [Course.objects.get(pk=course.pk).enrollment_count
+            for course in courses]
+
+
+class EnrollmentCountTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+        self._courses, self._students = _create_courses_and_students(3)
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        _clean_up_db()
+
+    def test_count_created_moved_and_deleted_enrollments(self):
+        course1, course2, course3 = self._courses
+        enrollment = Enrollment.objects.create(course=course1,
+                                               student=self._students[0])
+        Enrollment.objects.create(course=course1, student=self._students[1])
+
+        self.assertEqual([2, 0, 0], _get_counts(self._courses))
+
+        enrollment.course = course2
+        enrollment.save()
+
+        self.assertEqual([1, 1, 0], _get_counts(self._courses))
+
+        enrollment.delete()
+        self._students[1].delete()
+
+        self.assertEqual([0, 0, 0], _get_counts(self._courses))
+
+    def test_save_loaded_enrollment_without_reading_it_again(self):
+        course1, course2, course3 = self._courses
+        Enrollment.objects.create(course=course1, student=self._students[0])
+        enrollment = Enrollment.objects.get()
+
+        # The UPDATE of the enrollment, then of the two courses' counts.
+        with self.assertNumQueries(2):
+            enrollment.course = course2
+            enrollment.save()
+        with self.assertNumQueries(1):
+            enrollment.grade = 'A'
+            enrollment.save()
+
+        self.assertEqual([0, 1, 0], _get_counts(self._courses))
+
+    def test_count_enrollments_deleted_with_students_and_courses(self):
+        course1, course2, course3 = self._courses
+        for course in self._courses:
+            for student in self._students:
+                Enrollment.objects.create(course=course, student=student)
+
+        Student.objects.filter(pk__in=[self._students[0].pk,
+                                       self._students[1].pk]).delete()
+
+        self.assertEqual([1, 1, 1], _get_counts(self._courses))
+
+        Course.objects.filter(pk=course3.pk).delete()
+        Enrollment.objects.get(course=course1).delete()
+
+        self.assertEqual([0, 1], _get_counts([course1, course2]))
+
+    def test_count_enrollments_deleted_with_teacher(self):
+        for course in self._courses:
+            Enrollment.objects.create(course=course,
+                                      student=self._students[0])
+        teacher = self._courses[0].teacher
+
+        # The courses go with their counts: no UPDATE of enrollment_count.
+        with self.assertNumQueries(5):
+            teacher.delete()
+
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_count_enrollments_deleted_after_failed_deletion(self):
+        course1, course2, course3 = self._courses
+        Enrollment.objects.create(course=course1, student=self._students[0])
+        Enrollment.objects.create(course=course2, student=self._students[1])
+
+        def fail(sender, instance, **kwargs):
+            raise RuntimeError('Deletion failed')
+
+        pre_delete.connect(fail, sender=Student)
+        try:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self._students[0].delete()
+        finally:
+            pre_delete.disconnect(fail, sender=Student)
+        Enrollment.objects.get(course=course2).delete()
+
+        self.assertEqual([1, 0], _get_counts([course1, course2]))
+
+    def test_count_bulk_and_upserted_enrollments(self):
+        course1, course2, _ = self._courses
+        client.force_authenticate(user=self._admin_user)
+        payload = [{'course': course1.pk, 'student': student.pk}
+                   for student in self._students]
+        client.post(reverse('post_bulk_enrollments'),
+                    data=json.dumps(payload),
+                    content_type='application/json')
+        for _ in range(2):
+            client.put(reverse('get_upsert_enrollment',
+                               kwargs={'course': course2.pk,
+                                       'student': self._students[0].pk}),
+                       data=json.dumps({'grade': 'A'}),
+                       content_type='application/json')
+
+        self.assertEqual([3, 1, 0], _get_counts(self._courses))
+
+    def test_get_courses_ordered_by_enrollment_count(self):
+        course1, course2, course3 = self._courses
+        for student in self._students:
+            Enrollment.objects.create(course=course2, student=student)
+        Enrollment.objects.create(course=course3, student=self._students[0])
+
+        response = client.get(reverse('get_post_courses'),
+                              {'ordering': '-enrollment_count',
+                               'fields': 'title,enrollment_count'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([{'title': 'Title1', 'enrollment_count': 3},
+                          {'title': 'Title2', 'enrollment_count': 1},
+                          {'title': 'Title0', 'enrollment_count': 0}],
+                         response.data['results'])
+
+    def test_get_courses_ordered_by_enrollment_count_in_pages(self):
+        course1, course2, course3 = self._courses
+        Enrollment.objects.create(course=course3, student=self._students[0])
+        url = reverse('get_post_courses')
+        params = {'ordering': 'enrollment_count', 'page_size': 1}
+
+        titles = []
+        while url is not None:
+            response = client.get(url, params)
+            titles += [course['title'] for course in response.data['results']]
+            url, params = response.data['next'], None
+
+        self.assertEqual(['Title0', 'Title1', 'Title2'], titles)
+
+    def test_get_courses_ordered_by_enrollment_count_with_fields(self):
+        course1, course2, course3 = self._courses
+        Enrollment.objects.create(course=course1, student=self._students[0])
+        url = reverse('get_post_courses')
+        params = {'ordering': '-enrollment_count',
+                  'fields': 'title',
+                  'page_size': 2}
+
+        results = []
+        while url is not None:
+            response = client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            results += response.data['results']
+            url, params = response.data['next'], None
+
+        self.assertEqual([{'title': 'Title0'},
+                          {'title': 'Title2'},
+                          {'title': 'Title1'}],
+                         results)
+
+    def test_get_courses_with_tied_enrollment_counts_in_pages(self):
+        teacher = self._courses[0].teacher
+        Course.objects.bulk_create(
+            Course(title='Tied%d' % i,
+                   teacher=teacher,
+                   start_date=date(2018, 9, 1))
+            for i in range(1300)
+        )
+        titles = list(Course.objects.order_by('id')
+                                    .values_list('title', flat=True))
+        url = reverse('get_post_courses')
+        params = {'ordering': 'enrollment_count',
+                  'fields': 'title',
+                  'page_size': 200}
+
+        walked = []
+        while url is not None:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, params)
+            self.assertNotIn('OFFSET', queries.captured_queries[-1]['sql'])
+            walked += [course['title']
+                       for course in response.data['results']]
+            previous_url = response.data['previous']
+            url, params = response.data['next'], None
+
+        self.assertEqual(titles, walked)
+
+        walked = []
+        while previous_url is not None:
+            response = client.get(previous_url)
+            walked = ([course['title']
+                       for course in response.data['results']] + walked)
+            previous_url = response.data['previous']
+
+        self.assertEqual(titles[:-103], walked)
+
+    def test_get_courses_with_invalid_cursor(self):
+        response = client.get(reverse('get_post_courses'),
+                              {'ordering': 'enrollment_count',
+                               'cursor': 'cD0lNUIlMjJ4JTIyJTJDKzElNUQ='})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_courses_with_invalid_ordering(self):
+        response = client.get(reverse('get_post_courses'),
+                              {'ordering': 'title'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('ordering', response.data)
+
+    def test_reconcile_enrollment_counts(self):
+        course1, course2, _ = self._courses
+        for student in self._students:
+            Enrollment.objects.create(course=course1, student=student)
+        # QuerySet.update() bypasses the signals maintaining the counts.
+        Enrollment.objects.filter(student=self._students[0]) \
+                          .update(course=course2)
+        Course.objects.filter(pk=self._courses[2].pk) \
+                      .update(enrollment_count=7)
+        out = StringIO()
+
+        call_command('reconcile_enrollment_counts', stdout=out)
+
+        self.assertIn('Fixed the enrollment count of 3 courses',
+                      out.getvalue())
+        self.assertEqual([2, 1, 0], _get_counts(self._courses))
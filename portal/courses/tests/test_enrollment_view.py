@@ -1,10 +1,10 @@
 from datetime import date, datetime
 from django.core.serializers.json import json, DjangoJSONEncoder
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .common import set_up_admin, clean_up_admin
+from .common import assert_query_budget, set_up_admin, clean_up_admin
 from ..models import Course, Enrollment, Student, Teacher
 from ..serializers import EnrollmentSerializer
 
@@ -45,6 +45,23 @@ def _create_two_enrollments():
 
     return (enrollment1, enrollment2)
 
+def _create_enrollments(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    for i in range(count):
+        student = Student.objects.create(first_name='StudentFirst%d' % i,
+                                         last_name='StudentLast%d' % i,
+                                         email_address='student-email-address')
+        enrollment = Enrollment.objects.create(course=course,
+                                               student=student,
+                                               grade='A')
+
+    return enrollment
+
 
 class GetAllEnrollmentsTest(TestCase):
 
@@ -64,7 +81,7 @@ class GetAllEnrollmentsTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_get_all_enrollments_from_populated_db(self):
         _create_two_enrollments()
@@ -75,7 +92,53 @@ class GetAllEnrollmentsTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
+
+    def test_get_all_enrollments_in_pages(self):
+        enrollment1, enrollment2 = _create_two_enrollments()
+
+        response = client.get(reverse('get_post_enrollments'),
+                              {'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'],
+                         [EnrollmentSerializer(enrollment1).data])
+
+        # The ETag aggregate and the page itself.
+        with self.assertNumQueries(2):
+            response = client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'],
+                         [EnrollmentSerializer(enrollment2).data])
+        self.assertIsNone(response.data['next'])
+
+    def test_get_all_enrollments_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_post_enrollments',
+                            'GET',
+                            _create_enrollments,
+                            lambda data: self._do_get())
+
+    @override_settings(COURSES_STREAM_CHUNK_SIZE=1)
+    def test_stream_all_enrollments(self):
+        _create_two_enrollments()
+        enrollments = Enrollment.objects.order_by('id')
+        serializer = EnrollmentSerializer(enrollments, many=True)
+
+        response = client.get(reverse('get_post_enrollments'), {'stream': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(content.decode()), serializer.data)
+
+    def test_stream_all_enrollments_from_empty_db(self):
+        response = client.get(reverse('get_post_enrollments'), {'stream': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        content = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(content.decode()), [])
 
 
 class GetSingleEnrollmentTest(TestCase):
@@ -106,6 +169,13 @@ class GetSingleEnrollmentTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_enrollment_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_delete_update_enrollment',
+                            'GET',
+                            _create_enrollments,
+                            lambda enrollment: self._do_get(enrollment.pk))
+
 
 class CreateNewEnrollmentTest(TestCase):
 
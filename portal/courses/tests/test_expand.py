@@ -0,0 +1,129 @@
+from datetime import date
+from django.core.cache import cache
+from django.core.serializers.json import json
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = Client()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_enrollments(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        course = Course.objects.create(title='Title%d' % i,
+                                       teacher=teacher,
+                                       start_date=date(2018, 9, 1))
+        student = Student.objects.create(first_name='StudentFirst%d' % i,
+                                         last_name='StudentLast%d' % i,
+                                         email_address='student%d' % i)
+        Enrollment.objects.create(course=course, student=student, grade='A')
+
+    return teacher
+
+def _get_teacher_data(teacher):
+    return {
+        'id': teacher.pk,
+        'first_name': teacher.first_name,
+        'last_name': teacher.last_name,
+        'email_address': teacher.email_address,
+        'created_at': teacher.created_at.isoformat().replace('+00:00', 'Z'),
+        'updated_at': teacher.updated_at.isoformat().replace('+00:00', 'Z'),
+    }
+
+
+class ExpandTest(TestCase):
+
+    def setUp(self):
+        self.teacher = _create_enrollments(3)
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_get_courses_with_expanded_teacher(self):
+        with self.assertNumQueries(1):
+            response = client.get(reverse('get_post_courses'),
+                                  {'expand': 'teacher'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(3, len(response.data['results']))
+        for course in response.data['results']:
+            self.assertEqual(_get_teacher_data(self.teacher),
+                             course['teacher'])
+        self.assertNotIn('ETag', response)
+
+    def test_get_enrollments_with_nested_expansion(self):
+        _create_enrollments(10)
+
+        with self.assertNumQueries(1):
+            response = client.get(reverse('get_post_enrollments'),
+                                  {'expand': 'course.teacher,student',
+                                   'fields': 'course,student,grade'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        enrollment = Enrollment.objects.order_by('id').first()
+        data = response.data['results'][0]
+        self.assertEqual(['course', 'student', 'grade'], list(data))
+        self.assertEqual(enrollment.course.pk, data['course']['id'])
+        self.assertEqual(enrollment.course.title, data['course']['title'])
+        self.assertEqual(_get_teacher_data(self.teacher),
+                         data['course']['teacher'])
+        self.assertEqual(enrollment.student.pk, data['student']['id'])
+        self.assertEqual(enrollment.student.email_address,
+                         data['student']['email_address'])
+
+    def test_get_enrollment_with_expanded_course(self):
+        enrollment = Enrollment.objects.order_by('id').first()
+
+        response = client.get(reverse('get_delete_update_enrollment',
+                                      kwargs={'pk': enrollment.pk}),
+                              {'expand': 'course'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(enrollment.course.title,
+                         response.data['course']['title'])
+        self.assertEqual(self.teacher.pk, response.data['course']['teacher'])
+        self.assertEqual(enrollment.student.pk, response.data['student'])
+
+    def test_get_with_invalid_expansion(self):
+        for url, expand in ((reverse('get_post_courses'), 'student'),
+                            (reverse('get_post_enrollments'), 'teacher'),
+                            (reverse('get_post_students'), 'course')):
+            response = client.get(url, {'expand': expand})
+
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(['Cannot expand: %s.' % expand],
+                             response.data['expand'])
+
+
+@override_settings(COURSES_RESPONSE_CACHE_ENABLED=True)
+class ExpandCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = _create_enrollments(1)
+
+    def tearDown(self):
+        _clean_up_db()
+        cache.clear()
+
+    def test_get_expanded_courses_after_teacher_update(self):
+        url = reverse('get_post_courses')
+        client.get(url, {'expand': 'teacher'})
+        self.teacher.first_name = 'Updated'
+        self.teacher.save()
+
+        response = client.get(url, {'expand': 'teacher'})
+
+        course = json.loads(response.content)['results'][0]
+        self.assertEqual('Updated', course['teacher']['first_name'])
@@ -0,0 +1,104 @@
+import csv
+from datetime import date
+from io import StringIO
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase
+from ..models import Course, Enrollment, Student, Teacher
+
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_enrollments():
+    student = Student.objects.create(first_name='StudentFirst',
+                                     last_name='StudentLast',
+                                     email_address='student-email-address')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course1 = Course.objects.create(title='Title1',
+                                    teacher=teacher,
+                                    start_date=date(2018, 9, 1))
+    course2 = Course.objects.create(title='Title2',
+                                    teacher=teacher,
+                                    start_date=date(2018, 10, 1))
+    enrollment1 = Enrollment.objects.create(course=course1,
+                                            student=student,
+                                            grade='A')
+    enrollment2 = Enrollment.objects.create(course=course2,
+                                            student=student)
+
+    return (student, teacher, course1, course2, enrollment1, enrollment2)
+
+def _export(table, *args):
+    out = StringIO()
+    call_command('export_portal', table, *args, stdout=out, stderr=StringIO())
+
+    return out.getvalue()
+
+
+class ExportPortalCommandTest(TestCase):
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_export_courses_to_csv(self):
+        (student, teacher,
+         course1, course2, enrollment1, enrollment2) = _create_enrollments()
+
+        rows = list(csv.reader(StringIO(_export('courses',
+                                                '--chunk-size', '1'))))
+
+        self.assertEqual(['id', 'title', 'teacher', 'start_date',
+                          'created_at', 'updated_at'],
+                         rows[0])
+        self.assertEqual([str(course1.pk), 'Title1', str(teacher.pk),
+                          '2018-09-01'],
+                         rows[1][:4])
+        self.assertEqual(str(course2.pk), rows[2][0])
+        self.assertEqual(3, len(rows))
+
+    def test_export_empty_table_to_csv(self):
+        output = _export('students')
+
+        self.assertEqual('id,first_name,last_name,email_address,'
+                         'created_at,updated_at\n',
+                         output)
+
+    def test_export_enrollment_details_to_ndjson(self):
+        (student, teacher,
+         course1, course2, enrollment1, enrollment2) = _create_enrollments()
+
+        output = _export('enrollment-details', '--format', 'ndjson')
+
+        rows = [json.loads(line) for line in output.splitlines()]
+        self.assertEqual(2, len(rows))
+        self.assertEqual(enrollment1.pk, rows[0]['id'])
+        self.assertEqual('A', rows[0]['grade'])
+        self.assertEqual('Title1', rows[0]['course_title'])
+        self.assertEqual('2018-09-01', rows[0]['course_start_date'])
+        self.assertEqual(teacher.pk, rows[0]['teacher'])
+        self.assertEqual('StudentFirst', rows[0]['student_first_name'])
+        self.assertIsNone(rows[1]['grade'])
+        self.assertEqual(course2.pk, rows[1]['course'])
+
+    def test_export_to_file(self):
+        _create_enrollments()
+        handle, path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(handle)
+        try:
+            _export('teachers', '--format', 'ndjson', '--output', path)
+
+            with open(path) as f:
+                rows = [json.loads(line) for line in f]
+        finally:
+            os.remove(path)
+
+        self.assertEqual(['TeacherFirst'],
+                         [row['first_name'] for row in rows])
@@ -0,0 +1,107 @@
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count, Sum
+from django.test import TestCase
+from ..models import Course, Enrollment, Student, Teacher
+
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _generate(*args):
+    out = StringIO()
+    call_command('generate_portal_data', *args, stdout=out)
+
+    return out.getvalue()
+
+def _get_rows():
+    return (list(Student.objects.order_by('pk')
+                                .values_list('first_name',
+                                             'last_name',
+                                             'email_address')),
+            list(Course.objects.order_by('pk')
+                               .values_list('title', 'start_date')),
+            list(Enrollment.objects.order_by('pk')
+                                   .values_list('course__title',
+                                                'student__email_address',
+                                                'grade')))
+
+
+class GeneratePortalDataCommandTest(TestCase):
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_generate(self):
+        out = _generate('--students', '50', '--teachers', '5',
+                        '--courses', '20', '--enrollments', '333',
+                        '--chunk-size', '7')
+
+        self.assertIn('Generated 50 students, 5 teachers, 20 courses and '
+                      '333 enrollments', out)
+        self.assertEqual(50, Student.objects.count())
+        self.assertEqual(5, Teacher.objects.count())
+        self.assertEqual(20, Course.objects.count())
+        self.assertEqual(333, Enrollment.objects.count())
+        self.assertEqual(
+            50,
+            Student.objects.values('email_address').distinct().count()
+        )
+        per_student = Enrollment.objects.values('student') \
+                                        .annotate(count=Count('course',
+                                                              distinct=True),
+                                                  total=Count('id'))
+        self.assertEqual({6, 7}, {row['count'] for row in per_student})
+        self.assertTrue(all(row['count'] == row['total']
+                            for row in per_student))
+        self.assertEqual(
+            333,
+            Course.objects.aggregate(Sum('enrollment_count'))
+                          ['enrollment_count__sum']
+        )
+
+    def test_same_seed_generates_same_data(self):
+        args = ('--students', '20', '--teachers', '3', '--courses', '10',
+                '--enrollments', '50')
+        _generate('--seed', '7', *args)
+        rows = _get_rows()
+        _clean_up_db()
+
+        _generate('--seed', '7', *args)
+
+        self.assertEqual(rows, _get_rows())
+
+    def test_generate_after_existing_rows(self):
+        args = ('--students', '10', '--teachers', '2', '--courses', '5',
+                '--enrollments', '20')
+        _generate(*args)
+
+        _generate('--seed', '1', *args)
+
+        self.assertEqual(20, Student.objects.count())
+        self.assertEqual(40, Enrollment.objects.count())
+        student = Student.objects.create(first_name='StudentFirst',
+                                         last_name='StudentLast',
+                                         email_address='student-email')
+        self.assertEqual(
+            Student.objects.exclude(pk=student.pk)
+                           .order_by('-pk')
+                           .values_list('pk', flat=True)[0] + 1,
+            student.pk
+        )
+
+    def test_too_many_enrollments(self):
+        with self.assertRaises(CommandError):
+            _generate('--students', '2', '--teachers', '1',
+                      '--courses', '3', '--enrollments', '7')
+
+        self.assertEqual(0, Student.objects.count())
+
+    def test_courses_without_teachers(self):
+        with self.assertRaises(CommandError):
+            _generate('--students', '2', '--teachers', '0',
+                      '--courses', '3', '--enrollments', '0')
@@ -0,0 +1,186 @@
+from datetime import date
+from io import StringIO
+import os
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from ..db.copy import CopyStream
+from ..models import Course, Enrollment, Student, Teacher
+
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _write_temp_file(suffix, content):
+    handle, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(handle, 'w') as f:
+        f.write(content)
+
+    return path
+
+def _import(table, path, *args):
+    out = StringIO()
+    call_command('import_portal', table, path, *args, stdout=out)
+
+    return out.getvalue()
+
+
+class ImportPortalCommandTest(TestCase):
+
+    def setUp(self):
+        self._paths = []
+
+    def tearDown(self):
+        for path in self._paths:
+            os.remove(path)
+        _clean_up_db()
+
+    def _write(self, suffix, content):
+        path = _write_temp_file(suffix, content)
+        self._paths.append(path)
+
+        return path
+
+    def test_import_students_from_csv(self):
+        path = self._write('.csv',
+                           'first_name,last_name,email_address\n'
+                           'First1,Last1,email-address1\n'
+                           'First2,Last2,email-address2\n')
+
+        output = _import('students', path, '--chunk-size', '1')
+
+        self.assertIn('Imported 2 students (0 skipped)', output)
+        self.assertIn('rows/sec', output)
+        self.assertEqual(
+            [('First1', 'Last1'), ('First2', 'Last2')],
+            list(Student.objects.order_by('id')
+                                .values_list('first_name', 'last_name'))
+        )
+
+    def test_import_courses_and_enrollments_from_ndjson(self):
+        teacher = Teacher.objects.create(first_name='First',
+                                         last_name='Last',
+                                         email_address='email-address')
+        student1 = Student.objects.create(first_name='First1',
+                                          last_name='Last1',
+                                          email_address='email-address1')
+        student2 = Student.objects.create(first_name='First2',
+                                          last_name='Last2',
+                                          email_address='email-address2')
+        courses_path = self._write(
+            '.ndjson',
+            '{"title": "Math", "teacher": %d, "start_date": "2018-09-01"}\n'
+            '{"title": "Art", "teacher": 1234567890, '
+            '"start_date": "2018-09-01"}\n' % teacher.pk
+        )
+
+        output = _import('courses', courses_path)
+
+        self.assertIn('Imported 1 courses (1 skipped)', output)
+        course = Course.objects.get()
+        self.assertEqual(date(2018, 9, 1), course.start_date)
+        self.assertEqual(teacher, course.teacher)
+
+        enrollments_path = self._write(
+            '.jsonl',
+            '{"course": %d, "student": %d, "grade": null}\n'
+            '\n'
+            '{"course": %d, "student": %d, "grade": "A"}\n'
+            % (course.pk, student1.pk, course.pk, student2.pk)
+        )
+
+        _import('enrollments', enrollments_path)
+
+        self.assertEqual([None, 'A'],
+                         list(Enrollment.objects.order_by('id')
+                                                .values_list('grade',
+                                                             flat=True)))
+
+    def test_import_duplicate_enrollments(self):
+        teacher = Teacher.objects.create(first_name='First',
+                                         last_name='Last',
+                                         email_address='email-address')
+        student = Student.objects.create(first_name='First',
+                                         last_name='Last',
+                                         email_address='email-address')
+        course = Course.objects.create(title='Math',
+                                       teacher=teacher,
+                                       start_date=date(2018, 9, 1))
+        path = self._write('.csv',
+                           'course,student,grade\n'
+                           '%d,%d,A\n'
+                           '%d,%d,B\n'
+                           % (course.pk, student.pk, course.pk, student.pk))
+
+        output = _import('enrollments', path)
+
+        self.assertIn('Imported 1 enrollments (1 skipped)', output)
+        self.assertEqual('A', Enrollment.objects.get().grade)
+        course.refresh_from_db()
+        self.assertEqual(1, course.enrollment_count)
+
+    def test_import_with_ids(self):
+        path = self._write('.csv',
+                           'id,first_name,last_name,email_address\n'
+                           '42,First1,Last1,email-address1\n')
+
+        _import('teachers', path, '--with-ids')
+        teacher = Teacher.objects.create(first_name='First2',
+                                         last_name='Last2',
+                                         email_address='email-address2')
+
+        self.assertTrue(Teacher.objects.filter(pk=42).exists())
+        self.assertGreater(teacher.pk, 42)
+
+    def test_import_with_missing_csv_columns(self):
+        path = self._write('.csv', 'first_name,last_name\nFirst,Last\n')
+
+        with self.assertRaises(CommandError):
+            _import('students', path)
+        self.assertEqual(0, Student.objects.count())
+
+    def test_import_with_invalid_value(self):
+        teacher = Teacher.objects.create(first_name='First',
+                                         last_name='Last',
+                                         email_address='email-address')
+        path = self._write('.csv',
+                           'title,teacher,start_date\n'
+                           'Math,%d,2018-09-01\n'
+                           'Art,%d,not-a-date\n' % (teacher.pk, teacher.pk))
+
+        with self.assertRaises(CommandError):
+            _import('courses', path)
+        self.assertEqual(0, Course.objects.count())
+
+    def test_import_with_unknown_format(self):
+        with self.assertRaises(CommandError):
+            _import('students', 'students.txt')
+
+
+class CopyStreamTest(TestCase):
+
+    def test_read_encodes_one_chunk_at_a_time(self):
+        seen = []
+        chunks = iter([[['a', None]], [['b,c', '']]])
+        stream = CopyStream(chunks, seen.append)
+
+        self.assertEqual('a,\\N\n', stream.read(8192))
+        self.assertEqual(1, len(seen))
+        self.assertEqual('"b,c",\n', stream.read(8192))
+        self.assertEqual('', stream.read(8192))
+        self.assertEqual(2, len(seen))
+
+    def test_read_in_small_pieces(self):
+        stream = CopyStream(iter([[['abcdef']]]))
+
+        pieces = []
+        piece = stream.read(4)
+        while piece:
+            pieces.append(piece)
+            piece = stream.read(4)
+
+        self.assertEqual(['abcd', 'ef\n'], pieces)
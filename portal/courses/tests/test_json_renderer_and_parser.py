@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal
+import io
+import json
+from unittest import mock, skipIf
+from django.test import TestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from .. import parsers, renderers
+from ..models import Course, Student, Teacher
+from ..parsers import FastJSONParser
+from ..renderers import FastJSONRenderer
+from ..serializers import CourseValuesSerializer, StudentValuesSerializer
+
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+
+def _create_courses():
+    teacher = Teacher.objects.create(first_name='Zoë',
+                                     last_name='Łukasiewicz',
+                                     email_address='teacher-email-address')
+    Course.objects.create(title='Title\u2028', teacher=teacher,
+                          start_date=date(2018, 9, 1))
+    Course.objects.create(title='Other', teacher=teacher,
+                          start_date=date(2018, 10, 1))
+    Student.objects.create(first_name='First',
+                           last_name='Last',
+                           email_address='student-email-address')
+
+
+@skipIf(renderers.orjson is None, 'orjson is not installed')
+class FastJSONRendererTest(TestCase):
+
+    def setUp(self):
+        _create_courses()
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_render_same_as_json_renderer(self):
+        for serializer_class in (CourseValuesSerializer,
+                                 StudentValuesSerializer):
+            model = serializer_class.model_serializer_class.Meta.model
+            data = serializer_class(model.objects.order_by('id'),
+                                    many=True).data
+
+            self.assertEqual(JSONRenderer().render(data),
+                             FastJSONRenderer().render(data))
+
+    def test_render_native_and_fallback_types(self):
+        data = {1: date(2018, 9, 1), 'grade': Decimal('4.5')}
+
+        rendered = FastJSONRenderer().render(data)
+
+        self.assertEqual(b'{"1":"2018-09-01","grade":4.5}', rendered)
+
+    def test_render_indented_falls_back(self):
+        data = {'title': 'Title'}
+
+        rendered = FastJSONRenderer().render(data,
+                                             'application/json; indent=4')
+
+        self.assertEqual(JSONRenderer().render(data,
+                                               'application/json; indent=4'),
+                         rendered)
+
+    def test_render_big_integer_falls_back(self):
+        data = {'id': 2 ** 70}
+
+        rendered = FastJSONRenderer().render(data)
+
+        self.assertEqual(json.loads(rendered), data)
+
+    def test_render_without_orjson(self):
+        data = {'title': 'Title'}
+
+        with mock.patch.object(renderers, 'orjson', None):
+            rendered = FastJSONRenderer().render(data)
+
+        self.assertEqual(JSONRenderer().render(data), rendered)
+
+
+@skipIf(parsers.orjson is None, 'orjson is not installed')
+class FastJSONParserTest(TestCase):
+
+    def test_parse(self):
+        stream = io.BytesIO('{"title": "Zoë", "ids": [1, 2]}'.encode())
+
+        data = FastJSONParser().parse(stream)
+
+        self.assertEqual({'title': 'Zoë', 'ids': [1, 2]}, data)
+
+    def test_parse_invalid(self):
+        for content in (b'{"title": ', b'{"grade": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(content))
+
+    def test_parse_other_encoding_falls_back(self):
+        content = '{"title": "Zoë"}'.encode('latin-1')
+
+        data = FastJSONParser().parse(io.BytesIO(content),
+                                      parser_context={'encoding': 'latin-1'})
+
+        self.assertEqual(JSONParser().parse(io.BytesIO(content),
+                                            parser_context={
+                                                'encoding': 'latin-1'
+                                            }),
+                         data)
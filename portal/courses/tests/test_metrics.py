@@ -0,0 +1,179 @@
+import asyncio
+from types import SimpleNamespace
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from .common import assert_query_budget
+from ..metrics import Metrics, MetricsMiddleware, _record_query
+from ..metrics import install_query_recorder, metrics
+from ..models import Student
+
+
+async_client = AsyncClient()
+client = Client()
+
+def _clean_up_db():
+    Student.objects.all().delete()
+
+def _create_students(count):
+    return [
+        Student.objects.create(first_name='StudentFirst%d' % i,
+                               last_name='StudentLast%d' % i,
+                               email_address='student-email-address%d' % i)
+        for i in range(count)
+    ]
+
+async def _get_async(path):
+    return await async_client.get(path)
+
+def _get_samples(text):
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+
+    return samples
+
+
+class MetricsTest(SimpleTestCase):
+
+    def test_render_histogram_buckets(self):
+        registry = Metrics()
+        for latency in (0.003, 0.007, 0.007, 20):
+            registry.observe('view', 'GET', 200, latency, 2, 0.001, 10)
+
+        samples = _get_samples(registry.render())
+
+        prefix = 'courses_http_request_duration_seconds'
+        labels = 'view="view",method="GET"'
+        self.assertEqual(1, samples['%s_bucket{%s,le="0.005"}'
+                                    % (prefix, labels)])
+        self.assertEqual(3, samples['%s_bucket{%s,le="0.01"}'
+                                    % (prefix, labels)])
+        self.assertEqual(3, samples['%s_bucket{%s,le="10"}'
+                                    % (prefix, labels)])
+        self.assertEqual(4, samples['%s_bucket{%s,le="+Inf"}'
+                                    % (prefix, labels)])
+        self.assertEqual(4, samples['%s_count{%s}' % (prefix, labels)])
+        self.assertAlmostEqual(20.017, samples['%s_sum{%s}'
+                                               % (prefix, labels)])
+        self.assertEqual(40, samples['courses_http_response_bytes_total{%s}'
+                                     % labels])
+
+    def test_escape_label_values(self):
+        registry = Metrics()
+        registry.observe('a"b\\c', 'GET', 200, 0.001, 0, 0, 0)
+
+        self.assertIn(r'view="a\"b\\c"', registry.render())
+
+    def test_install_query_recorder_first(self):
+        def wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+        new_connection = SimpleNamespace(execute_wrappers=[wrapper])
+
+        install_query_recorder(sender=None, connection=new_connection)
+        install_query_recorder(sender=None, connection=new_connection)
+
+        self.assertEqual([_record_query, wrapper],
+                         new_connection.execute_wrappers)
+
+
+class MetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def tearDown(self):
+        _clean_up_db()
+        metrics.reset()
+
+    def test_record_request(self):
+        _create_students(3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('get_post_students'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        samples = _get_samples(metrics.render())
+        labels = 'view="get_post_students",method="GET"'
+        self.assertEqual(1, samples['courses_http_requests_total{%s,'
+                                    'status="200"}' % labels])
+        self.assertEqual(len(queries),
+                         samples['courses_http_request_db_queries_sum{%s}'
+                                 % labels])
+        self.assertGreater(
+            samples['courses_http_request_db_seconds_total{%s}' % labels], 0
+        )
+        self.assertEqual(len(response.content),
+                         samples['courses_http_response_bytes_total{%s}'
+                                 % labels])
+
+    def test_record_async_request(self):
+        _create_students(3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = async_to_sync(_get_async)(
+                reverse('get_post_students')
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        samples = _get_samples(metrics.render())
+        labels = 'view="get_post_students",method="GET"'
+        self.assertEqual(1, samples['courses_http_requests_total{%s,'
+                                    'status="200"}' % labels])
+        self.assertEqual(len(queries),
+                         samples['courses_http_request_db_queries_sum{%s}'
+                                 % labels])
+
+    def test_stay_async_under_asgi(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        self.assertTrue(asyncio.iscoroutinefunction(
+            MetricsMiddleware(get_response)
+        ))
+
+    def test_record_unresolved_request(self):
+        client.get('/api/v1/unknown')
+
+        samples = _get_samples(metrics.render())
+        self.assertEqual(1, samples['courses_http_requests_total{'
+                                    'view="unresolved",method="GET",'
+                                    'status="404"}'])
+
+    def test_get_metrics(self):
+        client.get(reverse('get_post_students'))
+
+        response = client.get(reverse('get_metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn(b'# TYPE courses_http_requests_total counter',
+                      response.content)
+        self.assertIn(b'view="get_post_students"', response.content)
+
+    def test_get_metrics_within_query_budget(self):
+        def create_data(count):
+            _create_students(count)
+            client.get(reverse('get_post_students'))
+
+        assert_query_budget(self,
+                            'get_metrics',
+                            'GET',
+                            create_data,
+                            lambda data: client.get(reverse('get_metrics')))
+
+    @override_settings(COURSES_METRICS_ENABLED=False)
+    def test_disabled(self):
+        client.get(reverse('get_post_students'))
+
+        response = client.get(reverse('get_metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('view="get_post_students"', metrics.render())
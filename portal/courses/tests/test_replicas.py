@@ -0,0 +1,167 @@
+import asyncio
+import time
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import set_up_admin, clean_up_admin
+from ..models import Course, Student
+from ..replicas import PIN_COOKIE, ReplicaMiddleware, ReplicaRouter
+
+
+client = APIClient()
+factory = RequestFactory()
+
+router = ReplicaRouter()
+
+def _make_get_response(view):
+    """
+    Returns a get_response running ``view``, if any, that returns the
+    database its queries would read from.
+    """
+    def get_response(request):
+        if view is not None:
+            view()
+        response = HttpResponse()
+        response.read_from = router.db_for_read(Course)
+
+        return response
+
+    return get_response
+
+def _get_students():
+    """
+    Returns the response to GET /students and the number of queries it
+    ran on the primary and on the replica.
+    """
+    with CaptureQueriesContext(connections['default']) as primary, \
+            CaptureQueriesContext(connections['replica']) as replica:
+        response = client.get(reverse('get_post_students'))
+
+    return response, len(primary), len(replica)
+
+def _serve(request, view=None):
+    return ReplicaMiddleware(_make_get_response(view))(request)
+
+def _serve_async(request, view=None):
+    # As under ASGI, the view runs in a thread behind a coroutine.
+    middleware = ReplicaMiddleware(sync_to_async(_make_get_response(view)))
+    assert asyncio.iscoroutinefunction(middleware)
+
+    return async_to_sync(middleware)(request)
+
+
+@override_settings(COURSES_READ_REPLICAS=['replica'],
+                   COURSES_REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTest(SimpleTestCase):
+
+    def test_read_from_replica(self):
+        response = _serve(factory.get('/'))
+
+        self.assertEqual('replica', response.read_from)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_primary_in_unsafe_request(self):
+        response = _serve(factory.post('/'))
+
+        self.assertEqual('default', response.read_from)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(5, response.cookies[PIN_COOKIE]['max-age'])
+
+    def test_read_from_primary_after_write(self):
+        response = _serve(factory.get('/'),
+                          lambda: router.db_for_write(Course))
+
+        self.assertEqual('default', response.read_from)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_replica_in_async_request(self):
+        response = _serve_async(factory.get('/'))
+
+        self.assertEqual('replica', response.read_from)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_primary_after_write_in_async_request(self):
+        response = _serve_async(factory.get('/'),
+                                lambda: router.db_for_write(Course))
+
+        self.assertEqual('default', response.read_from)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_primary_when_pinned(self):
+        request = factory.get('/')
+        request.COOKIES[PIN_COOKIE] = str(time.time() + 4)
+
+        response = _serve(request)
+
+        self.assertEqual('default', response.read_from)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_ignore_expired_or_forged_pin(self):
+        for pinned_until in (time.time() - 1, time.time() + 60, 'x'):
+            request = factory.get('/')
+            request.COOKIES[PIN_COOKIE] = str(pinned_until)
+
+            response = _serve(request)
+
+            self.assertEqual('replica', response.read_from)
+
+    @override_settings(COURSES_READ_REPLICAS=[])
+    def test_read_from_primary_without_replicas(self):
+        response = _serve(factory.post('/'))
+
+        self.assertEqual('default', response.read_from)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_primary_outside_requests(self):
+        self.assertEqual('default', router.db_for_read(Course))
+        self.assertEqual('default', router.db_for_write(Course))
+
+    def test_migrate_primary_only(self):
+        self.assertIsNone(router.allow_migrate('default', 'courses'))
+        self.assertFalse(router.allow_migrate('replica', 'courses'))
+
+
+# The replica is a test mirror of the primary: another connection to the
+# same database, which only sees committed rows.
+@override_settings(COURSES_READ_REPLICAS=['replica'])
+class ReplicaMiddlewareTest(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+        client.force_authenticate(user=self._admin_user)
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        client.cookies.clear()
+        Student.objects.all().delete()
+
+    def test_read_from_replica(self):
+        response, primary_queries, replica_queries = _get_students()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(0, primary_queries)
+        self.assertGreater(replica_queries, 0)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_read_from_primary_after_write(self):
+        response = client.post(reverse('get_post_students'),
+                               {'first_name': 'First',
+                                'last_name': 'Last',
+                                'email_address': 'email-address'},
+                               format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        response, primary_queries, replica_queries = _get_students()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(primary_queries, 0)
+        self.assertEqual(0, replica_queries)
+        self.assertEqual(1, len(response.data['results']))
@@ -0,0 +1,172 @@
+from datetime import date
+from django.core.cache import cache
+from django.core.serializers.json import json
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import set_up_admin, clean_up_admin
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = APIClient()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_enrollments():
+    student1 = Student.objects.create(first_name='StudentFirst1',
+                                      last_name='StudentLast1',
+                                      email_address='student-email-address1')
+    student2 = Student.objects.create(first_name='StudentFirst2',
+                                      last_name='StudentLast2',
+                                      email_address='student-email-address2')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course1 = Course.objects.create(title='Title1',
+                                    teacher=teacher,
+                                    start_date=date(2018, 9, 1))
+    course2 = Course.objects.create(title='Title2',
+                                    teacher=teacher,
+                                    start_date=date(2018, 10, 1))
+    enrollment = Enrollment.objects.create(course=course1,
+                                           student=student1,
+                                           grade='A')
+
+    return (student1, student2, course1, course2, enrollment)
+
+
+@override_settings(COURSES_RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        (self._student1, self._student2,
+         self._course1, self._course2,
+         self._enrollment) = _create_enrollments()
+
+    def tearDown(self):
+        _clean_up_db()
+        cache.clear()
+
+    def _get_roster(self, course):
+        response = client.get(reverse('get_students_in_course',
+                                      kwargs={'pk': course.pk}))
+
+        students = json.loads(response.content)
+
+        return [student['first_name'] for student in students]
+
+    def _get_transcript(self, student):
+        response = client.get(reverse('get_courses_taken_by_student',
+                                      kwargs={'pk': student.pk}))
+
+        courses = json.loads(response.content)
+
+        return [course['title'] for course in courses]
+
+    def test_get_cached_student(self):
+        url = reverse('get_delete_update_student',
+                      kwargs={'pk': self._student1.pk})
+        first_response = client.get(url)
+
+        with self.assertNumQueries(0):
+            response = client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, first_response.content)
+        self.assertEqual(response['ETag'], first_response['ETag'])
+
+    def test_get_cached_students_with_etag(self):
+        url = reverse('get_post_students')
+        etag = client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_student_after_update(self):
+        url = reverse('get_delete_update_student',
+                      kwargs={'pk': self._student1.pk})
+        client.get(url)
+        self._student1.first_name = 'NewFirst1'
+        self._student1.save()
+
+        response = client.get(url)
+
+        self.assertEqual(json.loads(response.content)['first_name'],
+                         'NewFirst1')
+
+    def test_get_students_after_create(self):
+        url = reverse('get_post_students')
+        client.get(url)
+        Student.objects.create(first_name='First3',
+                               last_name='Last3',
+                               email_address='email-address3')
+
+        response = client.get(url)
+
+        self.assertEqual(3, len(json.loads(response.content)['results']))
+
+    def test_get_roster_after_student_update(self):
+        self.assertEqual(['StudentFirst1'], self._get_roster(self._course1))
+        self._student1.first_name = 'NewFirst1'
+        self._student1.save()
+
+        self.assertEqual(['NewFirst1'], self._get_roster(self._course1))
+
+    def test_get_rosters_after_enrollment_changes(self):
+        self.assertEqual(['StudentFirst1'], self._get_roster(self._course1))
+        self.assertEqual([], self._get_roster(self._course2))
+
+        self._enrollment.course = self._course2
+        self._enrollment.save()
+
+        self.assertEqual([], self._get_roster(self._course1))
+        self.assertEqual(['StudentFirst1'], self._get_roster(self._course2))
+
+        self._enrollment.delete()
+
+        self.assertEqual([], self._get_roster(self._course2))
+
+    def test_get_transcript_after_course_update(self):
+        self.assertEqual(['Title1'], self._get_transcript(self._student1))
+        self._course1.title = 'NewTitle1'
+        self._course1.save()
+
+        self.assertEqual(['NewTitle1'], self._get_transcript(self._student1))
+
+    def test_search_students_after_update(self):
+        url = reverse('get_students_by_name', kwargs={'name': 'Renamed'})
+        self.assertEqual([], client.get(url).data)
+        self._student2.first_name = 'Renamed'
+        self._student2.save()
+
+        response = client.get(url)
+
+        self.assertEqual(1, len(json.loads(response.content)))
+
+    def test_get_roster_after_bulk_enrollment(self):
+        admin_user = set_up_admin()
+        self.assertEqual([], self._get_roster(self._course2))
+        client.force_authenticate(user=admin_user)
+        payload = [{'course': self._course2.pk, 'student': self._student2.pk}]
+        client.post(reverse('post_bulk_enrollments'),
+                    data=json.dumps(payload),
+                    content_type='application/json')
+        clean_up_admin(admin_user, client)
+
+        self.assertEqual(['StudentFirst2'], self._get_roster(self._course2))
+
+    def test_get_browsable_api_is_not_cached(self):
+        url = reverse('get_delete_update_student',
+                      kwargs={'pk': self._student1.pk})
+        client.get(url, HTTP_ACCEPT='text/html')
+
+        with self.assertNumQueries(1):
+            client.get(url, HTTP_ACCEPT='text/html')
@@ -0,0 +1,134 @@
+from datetime import date
+from django.conf import settings
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from .common import assert_query_budget
+from ..models import Course, Teacher
+from ..serializers import CourseSerializer
+
+
+client = Client()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+
+def _create_courses():
+    teacher1 = Teacher.objects.create(first_name='TeacherFirst1',
+                                      last_name='TeacherLast1',
+                                      email_address='teacher-email-address1')
+    teacher2 = Teacher.objects.create(first_name='TeacherFirst2',
+                                      last_name='TeacherLast2',
+                                      email_address='teacher-email-address2')
+    course1 = Course.objects.create(title='Math',
+                                    teacher=teacher2,
+                                    start_date=date(2018, 9, 1))
+    course2 = Course.objects.create(title='Physics',
+                                    teacher=teacher1,
+                                    start_date=date(2018, 9, 1))
+    course3 = Course.objects.create(title='Physical Patterns',
+                                    teacher=teacher2,
+                                    start_date=date(2018, 11, 1))
+    course4 = Course.objects.create(title='Design Patterns I',
+                                    teacher=teacher1,
+                                    start_date=date(2018, 10, 1))
+    course5 = Course.objects.create(title='Design Patterns II',
+                                    teacher=teacher1,
+                                    start_date=date(2019, 1, 1))
+
+    return (teacher1, teacher2, course1, course2, course3, course4, course5)
+
+def _create_many_courses(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        Course.objects.create(title='Design Patterns %d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 11, 1))
+
+
+class SearchCoursesByStartDateRangeTest(TestCase):
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def _do_get(self, params):
+        response = client.get(reverse('get_courses_by_start_date_range'),
+                              params)
+
+        return response
+
+    def _assert_response(self, params, expected_results):
+        serializer = CourseSerializer(expected_results, many=True)
+
+        response = self._do_get(params)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, serializer.data)
+
+    def test_get_courses_from_empty_db(self):
+        courses = Course.objects.all()
+        self.assertEqual(0, len(courses))
+
+        self._assert_response({'from': '2018-09-01', 'to': '2018-12-31'}, [])
+
+    def test_get_courses_from_populated_db(self):
+        (teacher1, teacher2,
+         course1, course2, course3, course4, course5) = _create_courses()
+
+        self._assert_response({'from': '2018-09-01', 'to': '2018-10-31'},
+                              [course2, course1, course4])
+        self._assert_response({'from': '2018-10-01'},
+                              [course4, course3, course5])
+        self._assert_response({'to': '2018-09-30'}, [course2, course1])
+        self._assert_response({},
+                              [course2, course1, course4, course3, course5])
+        self._assert_response({'from': '2019-02-01'}, [])
+
+    def test_get_courses_of_teacher(self):
+        (teacher1, teacher2,
+         course1, course2, course3, course4, course5) = _create_courses()
+
+        self._assert_response({'from': '2018-09-01',
+                               'to': '2018-12-31',
+                               'teacher': teacher1.pk},
+                              [course2, course4])
+        self._assert_response({'teacher': teacher2.pk}, [course1, course3])
+
+    def test_get_courses_with_limit(self):
+        (teacher1, teacher2,
+         course1, course2, course3, course4, course5) = _create_courses()
+
+        self._assert_response({'from': '2018-10-01', 'limit': 2},
+                              [course4, course3])
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK,
+                                       'PAGE_SIZE': 3})
+    def test_get_courses_with_default_limit(self):
+        _create_many_courses(5)
+
+        response = self._do_get({'from': '2018-10-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(['Design Patterns %d' % i for i in range(3)],
+                         [course['title'] for course in response.data])
+
+    def test_get_courses_with_invalid_dates(self):
+        response = self._do_get({'from': '2018-13-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('from', response.data)
+
+    def test_get_courses_with_reversed_range(self):
+        response = self._do_get({'from': '2018-12-01', 'to': '2018-09-01'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_courses_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_courses_by_start_date_range',
+                            'GET',
+                            _create_many_courses,
+                            lambda data: self._do_get({'from': '2018-09-01'}))
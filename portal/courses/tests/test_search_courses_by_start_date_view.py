@@ -2,6 +2,7 @@ from datetime import date, datetime
 from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
+from .common import assert_query_budget
 from ..models import Course, Teacher
 from ..serializers import CourseSerializer
 
@@ -37,6 +38,15 @@ def _create_courses():
 
     return (course1, course2, course3, course4, course5)
 
+def _create_many_courses(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        Course.objects.create(title='Design Patterns %d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 11, 1))
+
 
 class SearchCoursesByStartDateTest(TestCase):
 
@@ -64,3 +74,13 @@ class SearchCoursesByStartDateTest(TestCase):
         self._assert_response('2018-09-01', [course1, course2])
         self._assert_response('2018-11-01', [course3, course4, course5])
         self._assert_response('2019-01-01', [])
+
+    def test_get_courses_within_query_budget(self):
+        assert_query_budget(
+            self,
+            'get_courses_by_start_date',
+            'GET',
+            _create_many_courses,
+            lambda data: client.get(reverse('get_courses_by_start_date',
+                                            kwargs={'date': '2018-11-01'}))
+        )
@@ -2,6 +2,7 @@ from datetime import date
 from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
+from .common import assert_query_budget
 from ..models import Course, Teacher
 from ..serializers import CourseSerializer
 
@@ -37,6 +38,15 @@ def _create_courses():
 
     return (course1, course2, course3, course4, course5)
 
+def _create_many_courses(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        Course.objects.create(title='Design Patterns %d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 11, 1))
+
 
 class SearchCoursesByTitleTest(TestCase):
 
@@ -69,3 +79,41 @@ class SearchCoursesByTitleTest(TestCase):
         self._assert_response('pattern', pattern_courses)
         self._assert_response('physic', physic_courses)
         self._assert_response('python', python_courses)
+
+    def test_get_courses_with_limit(self):
+        course1, course2, course3, course4, course5 = _create_courses()
+        serializer = CourseSerializer([course3, course4], many=True)
+
+        response = client.get(reverse('get_courses_by_title',
+                                      kwargs={'title': 'pattern'}),
+                              {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, serializer.data)
+
+    def test_get_courses_ordered_by_similarity(self):
+        _create_courses()
+
+        response = client.get(reverse('get_courses_by_title',
+                                      kwargs={'title': 'pattern'}),
+                              {'order': 'similarity'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(3, len(response.data))
+
+    def test_get_courses_with_invalid_limit(self):
+        response = client.get(reverse('get_courses_by_title',
+                                      kwargs={'title': 'pattern'}),
+                              {'limit': 'many'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_courses_within_query_budget(self):
+        assert_query_budget(
+            self,
+            'get_courses_by_title',
+            'GET',
+            _create_many_courses,
+            lambda data: client.get(reverse('get_courses_by_title',
+                                            kwargs={'title': 'pattern'}))
+        )
@@ -2,6 +2,7 @@ from datetime import date
 from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
+from .common import assert_query_budget
 from ..models import Student
 from ..serializers import StudentSerializer
 
@@ -30,6 +31,12 @@ def _create_students():
 
     return (student1, student2, student3, student4, student5)
 
+def _create_many_students(count):
+    for i in range(count):
+        Student.objects.create(first_name='John',
+                               last_name='Johnson%d' % i,
+                               email_address='student-email-address%d' % i)
+
 
 class SearchStudentsByNameTest(TestCase):
 
@@ -57,3 +64,43 @@ class SearchStudentsByNameTest(TestCase):
         self._assert_response('john', [student1, student2])
         self._assert_response('son', [student2, student3, student4, student5])
         self._assert_response('python', [])
+
+    def test_get_students_with_limit(self):
+        (student1, student2, student3, student4, student5) = _create_students()
+        serializer = StudentSerializer([student2, student3], many=True)
+
+        response = client.get(reverse('get_students_by_name',
+                                      kwargs={'name': 'son'}),
+                              {'limit': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, serializer.data)
+
+    def test_get_students_ordered_by_similarity(self):
+        _create_students()
+
+        response = client.get(reverse('get_students_by_name',
+                                      kwargs={'name': 'son'}),
+                              {'order': 'similarity'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(4, len(response.data))
+
+    def test_get_students_with_invalid_search_options(self):
+        response = client.get(reverse('get_students_by_name',
+                                      kwargs={'name': 'son'}),
+                              {'limit': 0, 'order': 'unknown'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('limit', response.data)
+        self.assertIn('order', response.data)
+
+    def test_get_students_within_query_budget(self):
+        assert_query_budget(
+            self,
+            'get_students_by_name',
+            'GET',
+            _create_many_students,
+            lambda data: client.get(reverse('get_students_by_name',
+                                            kwargs={'name': 'john'}))
+        )
@@ -0,0 +1,123 @@
+from datetime import date
+import json
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = Client()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_enrollment():
+    student = Student.objects.create(first_name='StudentFirst',
+                                     last_name='StudentLast',
+                                     email_address='student-email-address')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    Enrollment.objects.create(course=course, student=student, grade='A')
+
+    return (course, student)
+
+
+class SparseFieldsetsTest(TestCase):
+
+    def setUp(self):
+        self.course, self.student = _create_enrollment()
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def _get(self, url, fields):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'fields': fields})
+
+        return response, queries[-1]['sql']
+
+    def test_get_students_with_fields(self):
+        response, sql = self._get(reverse('get_post_students'),
+                                  'last_name,first_name')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([{'first_name': 'StudentFirst',
+                           'last_name': 'StudentLast'}],
+                         response.data['results'])
+        self.assertNotIn('email_address', sql)
+        self.assertNotIn('created_at', sql)
+
+    def test_stream_students_with_fields(self):
+        response = client.get(reverse('get_post_students'),
+                              {'fields': 'email_address', 'stream': '1'})
+        content = b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([{'email_address': 'student-email-address'}],
+                         json.loads(content))
+
+    def test_get_course_with_fields(self):
+        response, sql = self._get(reverse('get_delete_update_course',
+                                          kwargs={'pk': self.course.pk}),
+                                  'title,start_date')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({'title': 'Title', 'start_date': '2018-09-01'},
+                         response.data)
+        self.assertNotIn('teacher_id', sql)
+
+    def test_get_missing_course_with_fields(self):
+        response = client.get(reverse('get_delete_update_course',
+                                      kwargs={'pk': self.course.pk + 1}),
+                              {'fields': 'title'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_students_in_course_with_fields(self):
+        response, sql = self._get(reverse('get_students_in_course',
+                                          kwargs={'pk': self.course.pk}),
+                                  'email_address')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([{'email_address': 'student-email-address'}],
+                         response.data)
+        self.assertNotIn('first_name', sql)
+
+    def test_search_courses_by_title_with_fields(self):
+        response = client.get(reverse('get_courses_by_title',
+                                      kwargs={'title': 'Tit'}),
+                              {'fields': 'title', 'limit': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([{'title': 'Title'}], response.data)
+
+    def test_get_with_unknown_fields(self):
+        urls = (
+            reverse('get_post_enrollments'),
+            reverse('get_delete_update_student',
+                    kwargs={'pk': self.student.pk}),
+            reverse('get_courses_taken_by_student',
+                    kwargs={'pk': self.student.pk}),
+            reverse('get_courses_by_start_date_range'),
+        )
+        for url in urls:
+            response = client.get(url, {'fields': 'created_at,password'})
+
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(['Unknown fields: password.'],
+                             response.data['fields'])
+
+    def test_get_with_empty_fields(self):
+        response = client.get(reverse('get_post_teachers'), {'fields': ','})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
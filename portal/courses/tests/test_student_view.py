@@ -1,17 +1,20 @@
+from datetime import date
 from django.contrib.auth.models import User
 from django.test import TestCase
 from django.urls import reverse
 import json
 from rest_framework import status
 from rest_framework.test import APIClient
-from .common import set_up_admin, clean_up_admin
-from ..models import Student
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from ..models import Course, Enrollment, Student, Teacher
 from ..serializers import StudentSerializer
 
 
 client = APIClient()
 
 def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
     Student.objects.all().delete()
 
 def _create_two_students():
@@ -24,6 +27,27 @@ def _create_two_students():
 
     return (student1, student2)
 
+def _create_students(count):
+    for i in range(count):
+        Student.objects.create(first_name='First%d' % i,
+                               last_name='Last%d' % i,
+                               email_address='email-address%d' % i)
+
+def _create_student_with_courses(count):
+    student = Student.objects.create(first_name='First',
+                                     last_name='Last',
+                                     email_address='email-address')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    for i in range(count):
+        course = Course.objects.create(title='Title%d' % i,
+                                       teacher=teacher,
+                                       start_date=date(2018, 9, 1))
+        Enrollment.objects.create(course=course, student=student)
+
+    return student
+
 
 class GetAllStudentsTest(TestCase):
 
@@ -43,7 +67,7 @@ class GetAllStudentsTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_get_all_students_from_populated_db(self):
         _create_two_students()
@@ -54,7 +78,37 @@ class GetAllStudentsTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
+
+    def test_get_all_students_in_pages(self):
+        student1, student2 = _create_two_students()
+
+        response = client.get(reverse('get_post_students'), {'page_size': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'],
+                         [StudentSerializer(student1).data])
+        self.assertIsNone(response.data['previous'])
+
+        response = client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'],
+                         [StudentSerializer(student2).data])
+        self.assertIsNone(response.data['next'])
+
+    def test_get_all_students_with_invalid_cursor(self):
+        response = client.get(reverse('get_post_students'),
+                              {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_all_students_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_post_students',
+                            'GET',
+                            _create_students,
+                            lambda data: self._do_get())
 
 
 class GetSingleStudentTest(TestCase):
@@ -85,6 +139,13 @@ class GetSingleStudentTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_student_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_delete_update_student',
+                            'GET',
+                            _create_student_with_courses,
+                            lambda student: self._do_get(student.pk))
+
 
 class CreateNewStudentTest(TestCase):
 
@@ -229,3 +290,12 @@ class DeleteSingleStudentTest(TestCase):
         response = self._do_delete(1234567890)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_student_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        assert_query_budget(self,
+                            'get_delete_update_student',
+                            'DELETE',
+                            _create_student_with_courses,
+                            lambda student: self._do_delete(student.pk))
@@ -2,6 +2,7 @@ from datetime import date
 from django.test import Client, TestCase
 from django.urls import reverse
 from rest_framework import status
+from .common import assert_query_budget
 from ..models import Course, Enrollment, Student, Teacher
 from ..serializers import StudentSerializer
 
@@ -77,6 +78,21 @@ def _create_courses_with_no_enrollments():
 
     return (course1, course2)
 
+def _create_course_with_students(count):
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    for i in range(count):
+        student = Student.objects.create(first_name='StudentFirst%d' % i,
+                                         last_name='StudentLast%d' % i,
+                                         email_address='student-email-address')
+        Enrollment.objects.create(course=course, student=student)
+
+    return course
+
 
 class GetStudentsInCourseTest(TestCase):
 
@@ -112,3 +128,13 @@ class GetStudentsInCourseTest(TestCase):
         self._assert_response(course2.pk, course2_students)
         self._assert_response(course3.pk, course3_students)
         self._assert_response(course4.pk, course4_students)
+
+    def test_get_enrolled_students_in_constant_number_of_queries(self):
+        assert_query_budget(
+            self,
+            'get_students_in_course',
+            'GET',
+            _create_course_with_students,
+            lambda course: client.get(reverse('get_students_in_course',
+                                              kwargs={'pk': course.pk}))
+        )
@@ -1,16 +1,18 @@
+from datetime import date
 from django.test import TestCase
 from django.urls import reverse
 import json
 from rest_framework import status
 from rest_framework.test import APIClient
-from .common import set_up_admin, clean_up_admin
-from ..models import Teacher
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from ..models import Course, Teacher
 from ..serializers import TeacherSerializer
 
 
 client = APIClient()
 
 def _clean_up_db():
+    Course.objects.all().delete()
     Teacher.objects.all().delete()
 
 def _create_two_teachers():
@@ -23,6 +25,23 @@ def _create_two_teachers():
 
     return (teacher1, teacher2)
 
+def _create_teachers(count):
+    for i in range(count):
+        Teacher.objects.create(first_name='First%d' % i,
+                               last_name='Last%d' % i,
+                               email_address='email-address%d' % i)
+
+def _create_teacher_with_courses(count):
+    teacher = Teacher.objects.create(first_name='First',
+                                     last_name='Last',
+                                     email_address='email-address')
+    for i in range(count):
+        Course.objects.create(title='Title%d' % i,
+                              teacher=teacher,
+                              start_date=date(2018, 9, 1))
+
+    return teacher
+
 
 class GetAllTeachersTest(TestCase):
 
@@ -42,7 +61,7 @@ class GetAllTeachersTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
     def test_get_all_teachers_from_populated_db(self):
         _create_two_teachers()
@@ -53,7 +72,14 @@ class GetAllTeachersTest(TestCase):
         response = self._do_get()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
+
+    def test_get_all_teachers_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_post_teachers',
+                            'GET',
+                            _create_teachers,
+                            lambda data: self._do_get())
 
 
 class GetSingleTeacherTest(TestCase):
@@ -84,6 +110,13 @@ class GetSingleTeacherTest(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_get_teacher_within_query_budget(self):
+        assert_query_budget(self,
+                            'get_delete_update_teacher',
+                            'GET',
+                            _create_teacher_with_courses,
+                            lambda teacher: self._do_get(teacher.pk))
+
 
 class CreateNewTeacherTest(TestCase):
 
@@ -0,0 +1,107 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from ..throttling import AnonRateThrottle
+
+
+client = APIClient()
+factory = APIRequestFactory()
+
+# The start of a window of 60 seconds.
+START = 60 * 1000
+
+def _make_request(url_name, **kwargs):
+    path = reverse(url_name, kwargs=kwargs)
+    request = factory.get(path)
+    request.resolver_match = resolve(path)
+    request.user = AnonymousUser()
+
+    return request
+
+def _make_throttle(now):
+    throttle = ThreeAMinuteThrottle()
+    throttle.timer = lambda: now
+
+    return throttle
+
+def _allow(request, now):
+    throttle = _make_throttle(now)
+    allowed = throttle.allow_request(request, None)
+    wait = None if allowed else throttle.wait()
+
+    return (allowed, wait if wait is None else round(wait, 6))
+
+
+class ThreeAMinuteThrottle(AnonRateThrottle):
+    scope = 'test'
+    rate = '3/min'
+
+
+@override_settings(COURSES_THROTTLE_COSTS={'get_courses_by_title': 2})
+class SlidingWindowThrottleTest(SimpleTestCase):
+
+    def setUp(self):
+        self._request = _make_request('get_post_courses')
+
+    def test_allow_requests_up_to_rate(self):
+        for _ in range(3):
+            self.assertTrue(_make_throttle(START).allow_request(self._request,
+                                                                None))
+
+        self.assertEqual((False, 79), _allow(self._request, START + 1))
+        self.assertEqual((False, 1), _allow(self._request, START + 79))
+        self.assertEqual((True, None), _allow(self._request, START + 80))
+
+    def test_slide_previous_window_out(self):
+        for now in (START + 50, START + 55, START + 58):
+            self.assertTrue(_make_throttle(now).allow_request(self._request,
+                                                              None))
+
+        self.assertEqual((False, 20), _allow(self._request, START + 60))
+        self.assertEqual((True, None), _allow(self._request, START + 80))
+        self.assertEqual((False, 15), _allow(self._request, START + 85))
+
+    def test_count_costs(self):
+        search_request = _make_request('get_courses_by_title', title='x')
+
+        self.assertTrue(_make_throttle(START).allow_request(search_request,
+                                                            None))
+        self.assertEqual((False, 90), _allow(search_request, START))
+        self.assertEqual((True, None), _allow(self._request, START))
+
+    @override_settings(COURSES_THROTTLE_COSTS={'get_post_courses': 4})
+    def test_refuse_requests_costing_more_than_rate(self):
+        self.assertEqual((False, None), _allow(self._request, START))
+
+    def test_count_requests_per_client(self):
+        other_request = _make_request('get_post_courses')
+        other_request.META['REMOTE_ADDR'] = '10.0.0.1'
+        for request in (self._request, self._request, other_request):
+            self.assertTrue(_make_throttle(START).allow_request(request,
+                                                                None))
+
+        self.assertTrue(_make_throttle(START).allow_request(self._request,
+                                                            None))
+        self.assertFalse(_make_throttle(START).allow_request(self._request,
+                                                             None))
+
+
+class ThrottledViewTest(TestCase):
+
+    @override_settings(COURSES_THROTTLE_COSTS={'get_courses_by_title': 5})
+    def test_throttle_searches_by_cost(self):
+        url = reverse('get_courses_by_title', kwargs={'title': 'x'})
+        for _ in range(20):
+            response = client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = client.get(url)
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        response = client.get(reverse('get_post_courses'))
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
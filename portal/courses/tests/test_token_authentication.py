@@ -0,0 +1,186 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from ..authentication import CachedTokenAuthentication, _get_key, get_cache
+from ..models import Student
+
+
+client = APIClient()
+
+def _post_student(**kwargs):
+    return client.post(reverse('get_post_students'),
+                       {'first_name': 'First',
+                        'last_name': 'Last',
+                        'email_address': 'email-address'},
+                       format='json',
+                       **kwargs)
+
+def _create_users_with_tokens(count):
+    for i in range(count):
+        Token.objects.create(
+            user=User.objects.create_user(username='user%d-%d' % (count, i))
+        )
+
+
+class TokenAuthenticationTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        Student.objects.all().delete()
+
+    def test_post_token(self):
+        credentials = {'username': 'test-admin',
+                       'password': 'test-admin-password'}
+
+        response = client.post(reverse('post_delete_token'), credentials,
+                               format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        token = Token.objects.get(user=self._admin_user)
+        self.assertEqual({'token': token.key}, response.data)
+
+        response = client.post(reverse('post_delete_token'), credentials,
+                               format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({'token': token.key}, response.data)
+
+    def test_post_token_with_invalid_password(self):
+        response = client.post(reverse('post_delete_token'),
+                               {'username': 'test-admin',
+                                'password': 'wrong-password'},
+                               format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Token.objects.exists())
+
+    def test_write_with_token(self):
+        token = Token.objects.create(user=self._admin_user)
+
+        response = _post_student(HTTP_AUTHORIZATION='Token %s' % token.key)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(1, Student.objects.count())
+
+    def test_authenticate_from_cache(self):
+        token = Token.objects.create(user=self._admin_user)
+        authentication = CachedTokenAuthentication()
+
+        with self.assertNumQueries(1):
+            authentication.authenticate_credentials(token.key)
+        with self.assertNumQueries(0):
+            user, cached_token = authentication.authenticate_credentials(
+                token.key
+            )
+
+        self.assertEqual(self._admin_user, user)
+        self.assertEqual(token, cached_token)
+
+    def test_cache_user_without_password(self):
+        token = Token.objects.create(user=self._admin_user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        self.assertNotIn(self._admin_user.password,
+                         repr(get_cache().get(_get_key(token.key))))
+        user, cached_token = authentication.authenticate_credentials(
+            token.key
+        )
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password('test-admin-password'))
+
+    def test_save_cached_user_keeping_password(self):
+        token = Token.objects.create(user=self._admin_user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+        user, cached_token = authentication.authenticate_credentials(
+            token.key
+        )
+
+        user.first_name = 'First'
+        user.save()
+
+        self._admin_user.refresh_from_db()
+        self.assertEqual('First', self._admin_user.first_name)
+        self.assertTrue(
+            self._admin_user.check_password('test-admin-password')
+        )
+
+    def test_delete_token(self):
+        token = Token.objects.create(user=self._admin_user)
+        authorization = 'Token %s' % token.key
+        self.assertEqual(_post_student(HTTP_AUTHORIZATION=authorization)
+                         .status_code,
+                         status.HTTP_201_CREATED)
+
+        response = client.delete(reverse('post_delete_token'),
+                                 HTTP_AUTHORIZATION=authorization)
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.exists())
+        response = _post_student(HTTP_AUTHORIZATION=authorization)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(1, Student.objects.count())
+
+    def test_delete_token_unauthenticated(self):
+        response = client.delete(reverse('post_delete_token'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_revoke_tokens_of_deactivated_user(self):
+        token = Token.objects.create(user=self._admin_user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        self._admin_user.is_active = False
+        self._admin_user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            authentication.authenticate_credentials(token.key)
+
+    def test_revoke_tokens_again_on_commit(self):
+        token = Token.objects.create(user=self._admin_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._admin_user.is_active = False
+            self._admin_user.save()
+            # A concurrent request caches the token from the rows
+            # committed before.
+            get_cache().set(_get_key(token.key), 'stale')
+
+        self.assertIsNone(get_cache().get(_get_key(token.key)))
+
+    def test_keep_tokens_on_login(self):
+        token = Token.objects.create(user=self._admin_user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(token.key)
+
+        self.assertTrue(client.login(username='test-admin',
+                                     password='test-admin-password'))
+        client.logout()
+
+        with self.assertNumQueries(0):
+            authentication.authenticate_credentials(token.key)
+
+    def test_delete_token_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        def create_tokens(count):
+            Token.objects.get_or_create(user=self._admin_user)
+            _create_users_with_tokens(count)
+
+        assert_query_budget(self,
+                            'post_delete_token',
+                            'DELETE',
+                            create_tokens,
+                            lambda data: client.delete(
+                                reverse('post_delete_token')
+                            ))
@@ -0,0 +1,218 @@
+from datetime import date
+from django.core.serializers.json import json
+from django.test import TestCase
+from django.urls import reverse
+from unittest import mock
+from rest_framework import status
+from rest_framework.test import APIClient
+from .common import assert_query_budget, set_up_admin, clean_up_admin
+from .. import upsert
+from ..models import Course, Enrollment, Student, Teacher
+
+
+client = APIClient()
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_course_and_student():
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    student = Student.objects.create(first_name='StudentFirst',
+                                     last_name='StudentLast',
+                                     email_address='student-email-address')
+
+    return (course, student)
+
+def _create_course_with_students(count):
+    course, student = _create_course_and_student()
+    for i in range(count):
+        Enrollment.objects.create(
+            course=course,
+            student=Student.objects.create(first_name='StudentFirst%d' % i,
+                                           last_name='StudentLast%d' % i,
+                                           email_address='student-email')
+        )
+
+    return (course, student)
+
+def _get_url(course_pk, student_pk):
+    return reverse('get_upsert_enrollment',
+                   kwargs={'course': course_pk, 'student': student_pk})
+
+
+class GetEnrollmentByCourseAndStudentTest(TestCase):
+
+    def setUp(self):
+        self._course, self._student = _create_course_and_student()
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def test_get_enrollment(self):
+        Enrollment.objects.create(course=self._course,
+                                  student=self._student,
+                                  grade='B')
+
+        response = client.get(_get_url(self._course.pk, self._student.pk),
+                              {'fields': 'grade'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({'grade': 'B'}, response.data)
+
+    def test_get_missing_enrollment(self):
+        response = client.get(_get_url(self._course.pk, self._student.pk))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+    def test_get_enrollment_within_query_budget(self):
+        def create_data(count):
+            course, student = _create_course_with_students(count)
+            Enrollment.objects.create(course=course, student=student)
+
+            return (course, student)
+
+        assert_query_budget(
+            self,
+            'get_upsert_enrollment',
+            'GET',
+            create_data,
+            lambda data: client.get(_get_url(data[0].pk, data[1].pk))
+        )
+
+class UpsertEnrollmentTest(TestCase):
+
+    def setUp(self):
+        self._admin_user = set_up_admin()
+        self._course, self._student = _create_course_and_student()
+
+    def tearDown(self):
+        clean_up_admin(self._admin_user, client)
+        _clean_up_db()
+
+    def _do_put(self, course_pk, student_pk, payload):
+        response = client.put(_get_url(course_pk, student_pk),
+                              data=json.dumps(payload),
+                              content_type='application/json')
+
+        return response
+
+    def test_upsert_enrollment_without_authentication(self):
+        response = self._do_put(self._course.pk,
+                                self._student.pk,
+                                {'grade': 'A'})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_upsert_enrollment(self):
+        client.force_authenticate(user=self._admin_user)
+
+        response = self._do_put(self._course.pk,
+                                self._student.pk,
+                                {'grade': 'A'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._course.pk, response.data['course'])
+        self.assertEqual('A', response.data['grade'])
+
+        response = self._do_put(self._course.pk,
+                                self._student.pk,
+                                {'grade': 'B'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual('B', response.data['grade'])
+        enrollment = Enrollment.objects.get()
+        self.assertEqual('B', enrollment.grade)
+
+    def test_upsert_enrollment_of_missing_student(self):
+        client.force_authenticate(user=self._admin_user)
+
+        response = self._do_put(self._course.pk, 1234567890, {'grade': 'A'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('student', response.data)
+        self.assertNotIn('course', response.data)
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_upsert_invalid_enrollment(self):
+        client.force_authenticate(user=self._admin_user)
+
+        response = self._do_put(self._course.pk,
+                                self._student.pk,
+                                {'grade': 'ABC'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_create_duplicate_enrollment(self):
+        client.force_authenticate(user=self._admin_user)
+        Enrollment.objects.create(course=self._course, student=self._student)
+
+        response = client.post(reverse('get_post_enrollments'),
+                               data=json.dumps({
+                                   'course': self._course.pk,
+                                   'student': self._student.pk,
+                               }),
+                               content_type='application/json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(1, Enrollment.objects.count())
+
+    @mock.patch.object(upsert, 'connection', mock.Mock(vendor='postgresql'))
+    def test_upsert_enrollment_of_concurrently_created_student(self):
+        client.force_authenticate(user=self._admin_user)
+        attempts = []
+
+        def execute_upsert(course_pk, student_pk, grade, now):
+            # The first statement ran before the student was committed.
+            attempts.append(course_pk)
+            if len(attempts) == 1:
+                return None
+            enrollment = Enrollment.objects.create(course_id=course_pk,
+                                                   student_id=student_pk,
+                                                   grade=grade)
+
+            return (enrollment.pk, enrollment.created_at, True)
+
+        with mock.patch.object(upsert, '_execute_upsert', execute_upsert):
+            response = self._do_put(self._course.pk,
+                                    self._student.pk,
+                                    {'grade': 'A'})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(2, len(attempts))
+        self.assertEqual('A', response.data['grade'])
+
+    @mock.patch.object(upsert, 'connection', mock.Mock(vendor='postgresql'))
+    def test_upsert_enrollment_with_repeated_conflicts(self):
+        client.force_authenticate(user=self._admin_user)
+
+        with mock.patch.object(upsert, '_execute_upsert',
+                               return_value=None) as execute_upsert:
+            response = self._do_put(self._course.pk,
+                                    self._student.pk,
+                                    {'grade': 'A'})
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(upsert.UPSERT_ATTEMPTS, execute_upsert.call_count)
+        self.assertEqual(0, Enrollment.objects.count())
+
+    def test_upsert_enrollment_within_query_budget(self):
+        client.force_authenticate(user=self._admin_user)
+
+        assert_query_budget(self,
+                            'get_upsert_enrollment',
+                            'PUT',
+                            _create_course_with_students,
+                            lambda data: self._do_put(data[0].pk,
+                                                      data[1].pk,
+                                                      {'grade': 'A'}))
@@ -0,0 +1,80 @@
+from datetime import date
+from django.test import TestCase
+from ..models import Course, Enrollment, Student, Teacher
+from ..serializers import CourseSerializer, EnrollmentSerializer
+from ..serializers import StudentSerializer, TeacherSerializer
+from ..serializers import CourseValuesSerializer, EnrollmentValuesSerializer
+from ..serializers import StudentValuesSerializer, TeacherValuesSerializer
+
+
+def _clean_up_db():
+    Course.objects.all().delete()
+    Teacher.objects.all().delete()
+    Student.objects.all().delete()
+    Enrollment.objects.all().delete()
+
+def _create_enrollments():
+    student1 = Student.objects.create(first_name='StudentFirst1',
+                                      last_name='StudentLast1',
+                                      email_address='student-email-address1')
+    student2 = Student.objects.create(first_name='StudentFirst2',
+                                      last_name='StudentLast2',
+                                      email_address='student-email-address2')
+    teacher = Teacher.objects.create(first_name='TeacherFirst',
+                                     last_name='TeacherLast',
+                                     email_address='teacher-email-address')
+    course = Course.objects.create(title='Title',
+                                   teacher=teacher,
+                                   start_date=date(2018, 9, 1))
+    Enrollment.objects.create(course=course, student=student1, grade='A')
+    Enrollment.objects.create(course=course, student=student2, grade=None)
+
+
+class ValuesSerializerTest(TestCase):
+
+    def setUp(self):
+        _create_enrollments()
+
+    def tearDown(self):
+        _clean_up_db()
+
+    def _assert_same_representation(self, model, serializer_class,
+                                    values_serializer_class):
+        queryset = model.objects.order_by('id')
+        expected = serializer_class(queryset, many=True).data
+
+        data = values_serializer_class(queryset, many=True).data
+
+        self.assertEqual(expected, data)
+        self.assertEqual([list(item) for item in expected],
+                         [list(item) for item in data])
+
+    def test_student_representation(self):
+        self._assert_same_representation(Student,
+                                         StudentSerializer,
+                                         StudentValuesSerializer)
+
+    def test_teacher_representation(self):
+        self._assert_same_representation(Teacher,
+                                         TeacherSerializer,
+                                         TeacherValuesSerializer)
+
+    def test_course_representation(self):
+        self._assert_same_representation(Course,
+                                         CourseSerializer,
+                                         CourseValuesSerializer)
+
+    def test_enrollment_representation(self):
+        self._assert_same_representation(Enrollment,
+                                         EnrollmentSerializer,
+                                         EnrollmentValuesSerializer)
+
+    def test_single_row_representation(self):
+        course = Course.objects.get()
+        row = CourseValuesSerializer.prepare_queryset(
+            Course.objects.filter(pk=course.pk)
+        ).get()
+
+        data = CourseValuesSerializer(row).data
+
+        self.assertEqual(CourseSerializer(course).data, data)
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import throttling
+
+
+DEFAULT_THROTTLE_COST = 1
+
+
+def get_cache():
+    alias = getattr(settings, 'COURSES_THROTTLE_CACHE_ALIAS', 'default')
+
+    return caches[alias]
+
+def get_cost(request):
+    """
+    Returns the number of requests that the request counts for, from
+    COURSES_THROTTLE_COSTS by URL name.
+    """
+    if request.resolver_match is None:
+        return DEFAULT_THROTTLE_COST
+    costs = getattr(settings, 'COURSES_THROTTLE_COSTS', {})
+
+    return costs.get(request.resolver_match.url_name, DEFAULT_THROTTLE_COST)
+
+
+class SlidingWindowThrottleMixin:
+    """
+    Replaces the timestamp history that SimpleRateThrottle rewrites on every
+    request with a sliding window counter: two integers per client, the
+    cost of the requests allowed in the current fixed window of the rate's
+    duration and in the previous one. The previous window is weighted by
+    the part of it that still falls within a duration of now, as if its
+    requests had been spread evenly.
+
+    The counters are changed with the cache's atomic incr() and decr(), so
+    a cache shared by all workers (COURSES_THROTTLE_CACHE_ALIAS) enforces
+    the rate across them.
+    """
+
+    def _incr(self, cache, key):
+        try:
+            return cache.incr(key, self.cost)
+        except ValueError:
+            # The second window expires after the rate's duration.
+            cache.add(key, 0, timeout=2 * self.duration)
+            return cache.incr(key, self.cost)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.cost = get_cost(request)
+        self.now = self.timer()
+        window, self.offset = divmod(self.now, self.duration)
+        current_key = '%s:%d' % (self.key, window)
+        cache = get_cache()
+        self.previous = cache.get('%s:%d' % (self.key, window - 1), 0)
+        self.current = self._incr(cache, current_key)
+
+        weight = 1 - self.offset / self.duration
+        if self.previous * weight + self.current <= self.num_requests:
+            return True
+
+        # Refused requests are not counted, as in SimpleRateThrottle.
+        cache.decr(current_key, self.cost)
+        self.current -= self.cost
+
+        return False
+
+    def wait(self):
+        """
+        Returns the seconds until the request would be allowed, if no other
+        request is made in the meantime.
+        """
+        if self.cost > self.num_requests:
+            return None
+
+        available = self.num_requests - self.cost - self.current
+        if available >= 0:
+            # Until enough of the previous window has slid out.
+            elapsed = (1 - available / self.previous) * self.duration
+            return max(0, elapsed - self.offset)
+
+        # Until the current window becomes the previous one, and enough of
+        # it has slid out.
+        available = self.num_requests - self.cost
+        elapsed = (1 - available / self.current) * self.duration
+
+        return self.duration - self.offset + elapsed
+
+
+class AnonRateThrottle(SlidingWindowThrottleMixin,
+                       throttling.AnonRateThrottle):
+    pass
+
+
+class UserRateThrottle(SlidingWindowThrottleMixin,
+                       throttling.UserRateThrottle):
+    pass
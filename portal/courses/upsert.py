@@ -0,0 +1,127 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import exceptions, serializers
+from rest_framework import status
+from . import cache
+from .bulk import get_existing_pks, get_relation_errors
+from .counters import change_enrollment_counts
+from .models import Course, Enrollment, Student
+from .signals import get_enrollment_tags
+
+
+# Attempts of the upsert statement before giving up with a conflict.
+UPSERT_ATTEMPTS = 2
+
+
+class UpsertConflict(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = ('The course or the student changed during the '
+                      'request, try again.')
+    default_code = 'conflict'
+
+
+def _build_upsert_sql():
+    """
+    Builds the statement that inserts or updates an enrollment.
+
+    The values are selected from the joined course and student, so a
+    missing one inserts nothing instead of failing the (deferred) foreign
+    key check at commit. ``xmax = 0`` tells inserted rows from updated
+    ones.
+    """
+    quote = connection.ops.quote_name
+    meta = Enrollment._meta
+    names = {
+        name: quote(meta.get_field(name).column)
+        for name in ('course', 'student', 'grade', 'created_at', 'updated_at')
+    }
+    course = meta.get_field('course').related_model._meta
+    student = meta.get_field('student').related_model._meta
+
+    return (
+        'INSERT INTO %(table)s (%(course)s, %(student)s, %(grade)s, '
+        '%(created_at)s, %(updated_at)s) '
+        'SELECT c.%(course_pk)s, s.%(student_pk)s, %%s, %%s, %%s '
+        'FROM %(course_table)s AS c, %(student_table)s AS s '
+        'WHERE c.%(course_pk)s = %%s AND s.%(student_pk)s = %%s '
+        'ON CONFLICT (%(course)s, %(student)s) DO UPDATE '
+        'SET %(grade)s = EXCLUDED.%(grade)s, '
+        '%(updated_at)s = EXCLUDED.%(updated_at)s '
+        'RETURNING %(pk)s, %(created_at)s, (xmax = 0)'
+    ) % dict(
+        names,
+        table=quote(meta.db_table),
+        pk=quote(meta.pk.column),
+        course_table=quote(course.db_table),
+        course_pk=quote(course.pk.column),
+        student_table=quote(student.db_table),
+        student_pk=quote(student.pk.column),
+    )
+
+def _raise_missing_relations(course_pk, student_pk):
+    errors = get_relation_errors(course_pk,
+                                 student_pk,
+                                 get_existing_pks(Course, {course_pk}),
+                                 get_existing_pks(Student, {student_pk}))
+    if errors:
+        raise serializers.ValidationError(errors)
+
+def _execute_upsert(course_pk, student_pk, grade, now):
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_build_upsert_sql(),
+                       [grade, now, now, course_pk, student_pk])
+        row = cursor.fetchone()
+        if row is not None and row[2]:
+            change_enrollment_counts({course_pk: 1})
+
+    return row
+
+def _upsert_on_conflict(course_pk, student_pk, grade):
+    now = timezone.now()
+    for _ in range(UPSERT_ATTEMPTS):
+        row = _execute_upsert(course_pk, student_pk, grade, now)
+        if row is not None:
+            break
+        # The statement inserted nothing: either the course or the student
+        # is missing, or both were committed after it started, in which
+        # case the next attempt sees them.
+        _raise_missing_relations(course_pk, student_pk)
+    else:
+        raise UpsertConflict()
+
+    pk, created_at, created = row
+    enrollment = Enrollment(pk=pk,
+                            course_id=course_pk,
+                            student_id=student_pk,
+                            grade=grade,
+                            created_at=created_at,
+                            updated_at=now)
+    # The statement sends no model signals.
+    cache.invalidate([cache.get_instance_tag(Enrollment, pk),
+                      cache.get_collection_tag(Enrollment)] +
+                     get_enrollment_tags(course_pk, student_pk))
+
+    return enrollment, created
+
+def _update_or_create(course_pk, student_pk, grade):
+    _raise_missing_relations(course_pk, student_pk)
+
+    return Enrollment.objects.update_or_create(course_id=course_pk,
+                                               student_id=student_pk,
+                                               defaults={'grade': grade})
+
+def upsert_enrollment(course, student, grade=None):
+    """
+    Sets the grade of a student in a course, enrolling the student first
+    if needed, and returns an ``(enrollment, created)`` pair.
+
+    On PostgreSQL this is a single ``INSERT ... ON CONFLICT DO UPDATE``,
+    so retrying a request costs one statement; other databases use
+    ``update_or_create()``. Raises ``ValidationError`` when the course or
+    the student does not exist, and ``UpsertConflict`` when they keep
+    changing concurrently.
+    """
+    if connection.vendor == 'postgresql':
+        return _upsert_on_conflict(course, student, grade)
+
+    return _update_or_create(course, student, grade)
@@ -58,6 +58,11 @@ urlpatterns = [
         views.get_courses_by_start_date,
         name='get_courses_by_start_date'
     ),
+    url(
+        r'^api/v1/courses/:start-date/$',
+        views.get_courses_by_start_date_range,
+        name='get_courses_by_start_date_range'
+    ),
     url(
         r'^api/v1/enrollments/(?P<pk>[0-9]+)$',
         views.get_delete_update_enrollment,
@@ -68,4 +73,30 @@ urlpatterns = [
         views.get_post_enrollments,
         name='get_post_enrollments'
     ),
+    url(
+        r'^api/v1/enrollments/:course_id/(?P<course>[0-9]+)'
+        r'/:student_id/(?P<student>[0-9]+)$',
+        views.get_upsert_enrollment,
+        name='get_upsert_enrollment'
+    ),
+    url(
+        r'^api/v1/enrollments/:bulk$',
+        views.post_bulk_enrollments,
+        name='post_bulk_enrollments'
+    ),
+    url(
+        r'^api/v1/:db-pool$',
+        views.get_db_pool_stats,
+        name='get_db_pool_stats'
+    ),
+    url(
+        r'^api/v1/:token$',
+        views.post_delete_token,
+        name='post_delete_token'
+    ),
+    url(
+        r'^metrics$',
+        views.get_metrics,
+        name='get_metrics'
+    ),
 ]
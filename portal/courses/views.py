@@ -1,15 +1,48 @@
 from datetime import date, datetime
+from functools import partial
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, transaction
 from django.db.models import Q
+from django.db.models.functions import Greatest
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework.authentication import SessionAuthentication
 from rest_framework.authentication import BasicAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.serializers import AuthTokenSerializer
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.decorators import authentication_classes
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.permissions import AllowAny
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework import status
+from .async_views import async_reads
+from .authentication import CachedTokenAuthentication
+from .bulk import create_enrollments
+from .cache import cached_response, get_collection_tag
+from .conditional import detail_condition, list_condition
+from .db.pool import get_pool_stats
+from . import metrics
 from .models import Course, Enrollment, Student, Teacher
+from .pagination import PortalCursorPagination
 from .serializers import CourseSerializer, StudentSerializer, TeacherSerializer
-from .serializers import EnrollmentSerializer
+from .serializers import BulkEnrollmentEntrySerializer
+from .serializers import EnrollmentSerializer, FieldsQuerySerializer
+from .serializers import ListQuerySerializer
+from .serializers import SearchQuerySerializer
+from .serializers import StartDateRangeQuerySerializer
+from .serializers import CourseValuesSerializer, StudentValuesSerializer
+from .serializers import EnrollmentValuesSerializer, TeacherValuesSerializer
+from .streaming import stream_json_array
+from .upsert import upsert_enrollment
+
+
+AUTHENTICATION_CLASSES = (SessionAuthentication,
+                          BasicAuthentication,
+                          CachedTokenAuthentication)
 
 
 def _get_course_data(request):
@@ -23,20 +56,105 @@ def _get_course_data(request):
 
     return data
 
+def _is_stream_requested(request):
+    return request.query_params.get('stream') in ('1', 'true')
+
+def _get_query(request, serializer_class,
+               query_serializer_class=FieldsQuerySerializer):
+    return query_serializer_class(
+        data=request.query_params,
+        context={'serializer_class': serializer_class}
+    )
+
+def _get_expanded_tags(serializer_class):
+    """
+    Returns a ``cached_response()`` tag template that makes expanded
+    responses depend on the models nested into them.
+    """
+    def get_tags(request, **kwargs):
+        query = _get_query(request, serializer_class)
+        if not query.is_valid():
+            return []
+
+        expand = query.validated_data.get('expand', {})
+
+        return [get_collection_tag(model)
+                for model in serializer_class.get_expanded_models(expand)]
+
+    return get_tags
+
+def _get_detail_response(request, queryset, serializer_class):
+    query = _get_query(request, serializer_class)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    fields = query.validated_data.get('fields')
+    expand = query.validated_data.get('expand')
+    row = serializer_class.prepare_queryset(queryset, fields, expand).first()
+    if row is None:
+        return Response(status=status.HTTP_404_NOT_FOUND)
+    serializer = serializer_class(row, fields=fields, expand=expand)
+
+    return Response(serializer.data)
+
+def _get_list_response(request, queryset, serializer_class):
+    query = _get_query(request, serializer_class, ListQuerySerializer)
+    if not query.is_valid():
+        return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    fields = query.validated_data.get('fields')
+    expand = query.validated_data.get('expand')
+    ordering = query.validated_data.get('ordering', ('id', ))
+    queryset = serializer_class.prepare_queryset(queryset, fields, expand,
+                                                 ordering)
+    if _is_stream_requested(request):
+        return stream_json_array(
+            queryset.order_by(*ordering),
+            partial(serializer_class, fields=fields, expand=expand)
+        )
+
+    paginator = PortalCursorPagination()
+    paginator.ordering = ordering
+    page = paginator.paginate_queryset(queryset, request)
+    serializer = serializer_class(page,
+                                  many=True,
+                                  fields=fields,
+                                  expand=expand)
+
+    return paginator.get_paginated_response(serializer.data)
+
+def _apply_search_query(query, queryset, similarity):
+    if (query.get('order') == 'similarity' and
+            connection.vendor == 'postgresql'):
+        queryset = queryset.annotate(similarity=similarity) \
+                           .order_by('-similarity', 'id')
+    else:
+        queryset = queryset.order_by('id')
+
+    limit = query.get('limit')
+    if limit is not None:
+        queryset = queryset[:limit]
+
+    return queryset
+
+@async_reads
+@detail_condition(Student)
 @api_view(['GET', 'DELETE', 'PUT'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('student:{pk}')
 def get_delete_update_student(request, pk):
+    if request.method == 'GET':
+        return _get_detail_response(request,
+                                    Student.objects.filter(pk=pk),
+                                    StudentValuesSerializer)
+
     try:
         student = Student.objects.get(pk=pk)
     except Student.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if request.method == 'GET':
-        serializer = StudentSerializer(student)
-
-        return Response(serializer.data)
-    elif request.method == 'DELETE':
+    if request.method == 'DELETE':
         student.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -49,15 +167,17 @@ def get_delete_update_student(request, pk):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@list_condition(Student)
 @api_view(['GET', 'POST'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('student:*')
 def get_post_students(request):
     if request.method == 'GET':
         students = Student.objects.all()
-        serializer = StudentSerializer(students, many=True)
 
-        return Response(serializer.data)
+        return _get_list_response(request, students, StudentValuesSerializer)
     elif request.method == 'POST':
         data = {
             'first_name': request.data.get('first_name'),
@@ -72,20 +192,24 @@ def get_post_students(request):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@detail_condition(Teacher)
 @api_view(['GET', 'DELETE', 'PUT'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('teacher:{pk}')
 def get_delete_update_teacher(request, pk):
+    if request.method == 'GET':
+        return _get_detail_response(request,
+                                    Teacher.objects.filter(pk=pk),
+                                    TeacherValuesSerializer)
+
     try:
         teacher = Teacher.objects.get(pk=pk)
     except Teacher.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if request.method == 'GET':
-        serializer = TeacherSerializer(teacher)
-
-        return Response(serializer.data)
-    elif request.method == 'DELETE':
+    if request.method == 'DELETE':
         teacher.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -98,15 +222,17 @@ def get_delete_update_teacher(request, pk):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@list_condition(Teacher)
 @api_view(['GET', 'POST'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('teacher:*')
 def get_post_teachers(request):
     if request.method == 'GET':
         teachers = Teacher.objects.all()
-        serializer = TeacherSerializer(teachers, many=True)
 
-        return Response(serializer.data)
+        return _get_list_response(request, teachers, TeacherValuesSerializer)
     elif request.method == 'POST':
         data = {
             'first_name': request.data.get('first_name'),
@@ -121,20 +247,25 @@ def get_post_teachers(request):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@detail_condition(Course)
 @api_view(['GET', 'DELETE', 'PUT'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('course:{pk}',
+                 _get_expanded_tags(CourseValuesSerializer))
 def get_delete_update_course(request, pk):
+    if request.method == 'GET':
+        return _get_detail_response(request,
+                                    Course.objects.filter(pk=pk),
+                                    CourseValuesSerializer)
+
     try:
         course = Course.objects.get(pk=pk)
     except Course.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if request.method == 'GET':
-        serializer = CourseSerializer(course)
-
-        return Response(serializer.data)
-    elif request.method == 'DELETE':
+    if request.method == 'DELETE':
         course.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -148,15 +279,18 @@ def get_delete_update_course(request, pk):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@list_condition(Course)
 @api_view(['GET', 'POST'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('course:*',
+                 _get_expanded_tags(CourseValuesSerializer))
 def get_post_courses(request):
     if request.method == 'GET':
         courses = Course.objects.all()
-        serializer = CourseSerializer(courses, many=True)
 
-        return Response(serializer.data)
+        return _get_list_response(request, courses, CourseValuesSerializer)
     elif request.method == 'POST':
         data = _get_course_data(request)
         serializer = CourseSerializer(data=data)
@@ -167,41 +301,53 @@ def get_post_courses(request):
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@detail_condition(Enrollment)
 @api_view(['GET', 'DELETE', 'PUT'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('enrollment:{pk}',
+                 _get_expanded_tags(EnrollmentValuesSerializer))
 def get_delete_update_enrollment(request, pk):
+    if request.method == 'GET':
+        return _get_detail_response(request,
+                                    Enrollment.objects.filter(pk=pk),
+                                    EnrollmentValuesSerializer)
+
     try:
         enrollment = Enrollment.objects.get(pk=pk)
     except Enrollment.DoesNotExist:
         return Response(status=status.HTTP_404_NOT_FOUND)
 
-    if request.method == 'GET':
-        serializer = EnrollmentSerializer(enrollment)
-
-        return Response(serializer.data)
-    elif request.method == 'DELETE':
+    if request.method == 'DELETE':
         enrollment.delete()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
     elif request.method == 'PUT':
         serializer = EnrollmentSerializer(enrollment, data=request.data)
         if serializer.is_valid():
-            serializer.save()
+            # Commit the enrollment and its course's count together.
+            with transaction.atomic():
+                serializer.save()
 
             return Response(serializer.data, status=status.HTTP_204_NO_CONTENT)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@async_reads
+@list_condition(Enrollment)
 @api_view(['GET', 'POST'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('enrollment:*',
+                 _get_expanded_tags(EnrollmentValuesSerializer))
 def get_post_enrollments(request):
     if request.method == 'GET':
         enrollments = Enrollment.objects.all()
-        serializer = EnrollmentSerializer(enrollments, many=True)
 
-        return Response(serializer.data)
+        return _get_list_response(request,
+                                  enrollments,
+                                  EnrollmentValuesSerializer)
     elif request.method == 'POST':
         data = {
             'course': request.data.get('course'),
@@ -210,64 +356,269 @@ def get_post_enrollments(request):
         }
         serializer = EnrollmentSerializer(data=data)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['POST'])
+@authentication_classes(AUTHENTICATION_CLASSES)
+@permission_classes((IsAuthenticatedOrReadOnly, ))
+def post_bulk_enrollments(request):
+    if request.method == 'POST':
+        if not isinstance(request.data, list):
+            errors = {'non_field_errors': ['Expected a list of enrollments.']}
+
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        created, errors = create_enrollments(request.data)
+        data = {
+            'created': EnrollmentSerializer(created, many=True).data,
+            'errors': errors,
+        }
+        if not errors:
+            return Response(data, status=status.HTTP_201_CREATED)
+        elif created:
+            return Response(data, status=status.HTTP_207_MULTI_STATUS)
+
+        return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+@async_reads
+@api_view(['GET', 'PUT'])
+@authentication_classes(AUTHENTICATION_CLASSES)
+@permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('enrollment:*',
+                 _get_expanded_tags(EnrollmentValuesSerializer))
+def get_upsert_enrollment(request, course, student):
+    if request.method == 'GET':
+        enrollments = Enrollment.objects.filter(course=course,
+                                                student=student)
+
+        return _get_detail_response(request,
+                                    enrollments,
+                                    EnrollmentValuesSerializer)
+    elif request.method == 'PUT':
+        data = {
+            'course': course,
+            'student': student,
+            'grade': request.data.get('grade'),
+        }
+        serializer = BulkEnrollmentEntrySerializer(data=data)
+        if not serializer.is_valid():
+            return Response(serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        enrollment, created = upsert_enrollment(**serializer.validated_data)
+        data = EnrollmentSerializer(enrollment).data
+        if created:
+            return Response(data, status=status.HTTP_201_CREATED)
+
+        return Response(data, status=status.HTTP_200_OK)
+
+@async_reads
 @api_view(['GET'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('roster:{pk}')
 def get_students_in_course(request, pk):
     if request.method == 'GET':
-        course_enrollments = Enrollment.objects.filter(course=pk)
-        students = [Student.objects.get(pk=x.student.pk)
-                    for x in course_enrollments]
-        serializer = StudentSerializer(students, many=True)
+        query = _get_query(request, StudentValuesSerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        students = Student.objects.filter(enrollment__course=pk) \
+                                  .order_by('enrollment__id')
+        serializer = StudentValuesSerializer(
+            students,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
 
         return Response(serializer.data)
 
+@async_reads
 @api_view(['GET'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('transcript:{pk}',
+                 _get_expanded_tags(CourseValuesSerializer))
 def get_courses_taken_by_student(request, pk):
     if request.method == 'GET':
-        student_enrollments = Enrollment.objects.filter(student=pk)
-        courses = [Course.objects.get(pk=x.course.pk)
-                   for x in student_enrollments]
-        serializer = CourseSerializer(courses, many=True)
+        query = _get_query(request, CourseValuesSerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        courses = Course.objects.filter(enrollment__student=pk) \
+                                .order_by('enrollment__id')
+        serializer = CourseValuesSerializer(
+            courses,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
 
         return Response(serializer.data)
 
+@async_reads
 @api_view(['GET'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('course:*',
+                 _get_expanded_tags(CourseValuesSerializer))
 def get_courses_by_title(request, title):
     if request.method == 'GET':
-        courses = Course.objects.filter(title__icontains=title)
-        serializer = CourseSerializer(courses, many=True)
+        query = _get_query(request,
+                           CourseValuesSerializer,
+                           SearchQuerySerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        courses = Course.objects.filter(title__trigram_contains=title)
+        courses = _apply_search_query(query.validated_data,
+                                      courses,
+                                      TrigramSimilarity('title', title))
+        serializer = CourseValuesSerializer(
+            courses,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
 
         return Response(serializer.data)
 
+@async_reads
 @api_view(['GET'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('course:*',
+                 _get_expanded_tags(CourseValuesSerializer))
 def get_courses_by_start_date(request, date):
     if request.method == 'GET':
+        query = _get_query(request, CourseValuesSerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
         start_datetime = datetime.strptime(date, '%Y-%m-%d')
-        courses = Course.objects.filter(start_date=start_datetime.date())
-        serializer = CourseSerializer(courses, many=True)
+        courses = Course.objects.filter(start_date=start_datetime.date()) \
+                                .order_by('id')
+        serializer = CourseValuesSerializer(
+            courses,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
+
+        return Response(serializer.data)
+
+@async_reads
+@api_view(['GET'])
+@authentication_classes(AUTHENTICATION_CLASSES)
+@permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('course:*',
+                 _get_expanded_tags(CourseValuesSerializer))
+def get_courses_by_start_date_range(request):
+    if request.method == 'GET':
+        query = _get_query(request,
+                           CourseValuesSerializer,
+                           StartDateRangeQuerySerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        query_data = query.validated_data
+        courses = Course.objects.all()
+        if 'from' in query_data:
+            courses = courses.filter(start_date__gte=query_data['from'])
+        if 'to' in query_data:
+            courses = courses.filter(start_date__lte=query_data['to'])
+        if 'teacher' in query_data:
+            courses = courses.filter(teacher=query_data['teacher'])
+        # Matches course_start_date_teacher_idx, so no sort step is needed.
+        courses = courses.order_by('start_date', 'teacher', 'id')
+        # Unpaginated, so bounded by the page size unless ?limit= is given.
+        courses = courses[:query_data.get('limit', api_settings.PAGE_SIZE)]
+        serializer = CourseValuesSerializer(
+            courses,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
 
         return Response(serializer.data)
 
+@async_reads
 @api_view(['GET'])
-@authentication_classes((SessionAuthentication, BasicAuthentication))
+@authentication_classes(AUTHENTICATION_CLASSES)
 @permission_classes((IsAuthenticatedOrReadOnly, ))
+@cached_response('student:*')
 def get_students_by_name(request, name):
     if request.method == 'GET':
-        students = Student.objects.filter(Q(first_name__icontains=name) |
-                                          Q(last_name__icontains=name))
-        serializer = StudentSerializer(students, many=True)
+        query = _get_query(request,
+                           StudentValuesSerializer,
+                           SearchQuerySerializer)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        students = Student.objects.filter(
+            Q(first_name__trigram_contains=name) |
+            Q(last_name__trigram_contains=name)
+        )
+        similarity = Greatest(TrigramSimilarity('first_name', name),
+                              TrigramSimilarity('last_name', name))
+        students = _apply_search_query(query.validated_data,
+                                       students,
+                                       similarity)
+        serializer = StudentValuesSerializer(
+            students,
+            many=True,
+            fields=query.validated_data.get('fields'),
+            expand=query.validated_data.get('expand')
+        )
 
         return Response(serializer.data)
+
+@api_view(['GET'])
+@authentication_classes(AUTHENTICATION_CLASSES)
+@permission_classes((IsAuthenticated, ))
+def get_db_pool_stats(request):
+    if request.method == 'GET':
+        return Response(get_pool_stats())
+
+@api_view(['POST', 'DELETE'])
+@authentication_classes(AUTHENTICATION_CLASSES)
+@permission_classes((AllowAny, ))
+def post_delete_token(request):
+    if request.method == 'POST':
+        serializer = AuthTokenSerializer(data=request.data,
+                                         context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors,
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        user = serializer.validated_data['user']
+        token, created = Token.objects.get_or_create(user=user)
+        if created:
+            return Response({'token': token.key},
+                            status=status.HTTP_201_CREATED)
+
+        return Response({'token': token.key})
+
+    elif request.method == 'DELETE':
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+
+        Token.objects.filter(user=request.user).delete()
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+@require_GET
+def get_metrics(request):
+    # Plain Django view: scrapers need neither content negotiation nor
+    # throttling.
+    if not metrics.is_enabled():
+        raise Http404
+
+    return HttpResponse(metrics.metrics.render(),
+                        content_type=metrics.CONTENT_TYPE)